@@ -0,0 +1,25 @@
+"""add client_uuid to checkins
+
+Revision ID: add_checkin_client_uuid
+Revises: add_rollup_tables
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_checkin_client_uuid'
+down_revision = 'add_rollup_tables'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('checkins', sa.Column('client_uuid', sa.String(length=36), nullable=True))
+    op.create_index(op.f('ix_checkins_client_uuid'), 'checkins', ['client_uuid'], unique=True)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_checkins_client_uuid'), table_name='checkins')
+    op.drop_column('checkins', 'client_uuid')
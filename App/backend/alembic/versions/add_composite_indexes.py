@@ -0,0 +1,75 @@
+"""composite indexes for hot query shapes
+
+Revision ID: add_composite_indexes
+Revises: add_rollup_desempenho
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_composite_indexes'
+down_revision = 'add_rollup_desempenho'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    # Duplicate check-ins cannot be resolved automatically
+    duplicates = bind.execute(sa.text("""
+        SELECT COUNT(*) FROM (
+            SELECT escala_id, usuario_id FROM checkins
+            GROUP BY escala_id, usuario_id HAVING COUNT(*) > 1
+        ) d
+    """)).scalar()
+    if duplicates:
+        raise RuntimeError(
+            f"{duplicates} (escala_id, usuario_id) pairs have more than one check-in; "
+            "resolve them before applying uq_checkins_escala_usuario"
+        )
+
+    # Keep the oldest link when a user was assigned twice to the same escala
+    op.execute("""
+        DELETE eu FROM escala_usuarios eu
+        JOIN escala_usuarios older
+          ON older.usuario_id = eu.usuario_id
+         AND older.escala_id = eu.escala_id
+         AND older.id < eu.id
+    """)
+
+    # New composite indexes first, so foreign keys always have an index
+    op.create_index('ix_escalas_estabelecimento_data', 'escalas', ['estabelecimento_id', 'data_inicio'], unique=False)
+    op.create_index('ix_escalas_data_status', 'escalas', ['data_inicio', 'status'], unique=False)
+    op.create_unique_constraint('uq_escala_usuarios_usuario_escala', 'escala_usuarios', ['usuario_id', 'escala_id'])
+    op.create_index('ix_checkins_usuario_data', 'checkins', ['usuario_id', 'data_hora'], unique=False)
+    op.create_unique_constraint('uq_checkins_escala_usuario', 'checkins', ['escala_id', 'usuario_id'])
+    op.create_index('ix_logs_usuario_created', 'logs', ['usuario_id', 'created_at'], unique=False)
+    op.create_index('ix_rollup_desempenho_dia', 'rollup_desempenho_diario', ['dia'], unique=False)
+
+    # Single-column indexes now covered by a composite prefix
+    op.drop_index(op.f('ix_escalas_estabelecimento_id'), table_name='escalas')
+    op.drop_index(op.f('ix_escalas_data_inicio'), table_name='escalas')
+    op.drop_index(op.f('ix_escala_usuarios_usuario_id'), table_name='escala_usuarios')
+    op.drop_index(op.f('ix_checkins_usuario_id'), table_name='checkins')
+    op.drop_index(op.f('ix_checkins_escala_id'), table_name='checkins')
+    op.drop_index(op.f('ix_logs_usuario_id'), table_name='logs')
+
+
+def downgrade():
+    op.create_index(op.f('ix_logs_usuario_id'), 'logs', ['usuario_id'], unique=False)
+    op.create_index(op.f('ix_checkins_escala_id'), 'checkins', ['escala_id'], unique=False)
+    op.create_index(op.f('ix_checkins_usuario_id'), 'checkins', ['usuario_id'], unique=False)
+    op.create_index(op.f('ix_escala_usuarios_usuario_id'), 'escala_usuarios', ['usuario_id'], unique=False)
+    op.create_index(op.f('ix_escalas_data_inicio'), 'escalas', ['data_inicio'], unique=False)
+    op.create_index(op.f('ix_escalas_estabelecimento_id'), 'escalas', ['estabelecimento_id'], unique=False)
+
+    op.drop_index('ix_rollup_desempenho_dia', table_name='rollup_desempenho_diario')
+    op.drop_index('ix_logs_usuario_created', table_name='logs')
+    op.drop_constraint('uq_checkins_escala_usuario', 'checkins', type_='unique')
+    op.drop_index('ix_checkins_usuario_data', table_name='checkins')
+    op.drop_constraint('uq_escala_usuarios_usuario_escala', 'escala_usuarios', type_='unique')
+    op.drop_index('ix_escalas_data_status', table_name='escalas')
+    op.drop_index('ix_escalas_estabelecimento_data', table_name='escalas')
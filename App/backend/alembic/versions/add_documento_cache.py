@@ -0,0 +1,38 @@
+"""content hash on documentos and OCR/NLP result cache
+
+Revision ID: add_documento_cache
+Revises: add_composite_indexes
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_documento_cache'
+down_revision = 'add_composite_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows stay NULL; process_document_task hashes them on first run
+    op.add_column('documentos', sa.Column('conteudo_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_documentos_conteudo_hash'), 'documentos', ['conteudo_hash'], unique=False)
+
+    op.create_table('documento_cache',
+        sa.Column('conteudo_hash', sa.String(length=64), nullable=False),
+        sa.Column('tipo_documento', sa.String(length=100), nullable=False),
+        sa.Column('dados_extraidos', sa.JSON(), nullable=False),
+        sa.Column('texto_ocr', sa.Text(length=16777215), nullable=True),
+        sa.Column('hits', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('last_hit_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('conteudo_hash', 'tipo_documento')
+    )
+
+
+def downgrade():
+    op.drop_table('documento_cache')
+    op.drop_index(op.f('ix_documentos_conteudo_hash'), table_name='documentos')
+    op.drop_column('documentos', 'conteudo_hash')
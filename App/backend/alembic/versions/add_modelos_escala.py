@@ -0,0 +1,56 @@
+"""add modelos_escala and modelo_escala_usuarios
+
+Revision ID: add_modelos_escala
+Revises: add_checkin_client_uuid
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_modelos_escala'
+down_revision = 'add_checkin_client_uuid'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('modelos_escala',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('nome', sa.String(length=100), nullable=False),
+        sa.Column('estabelecimento_id', sa.Integer(), nullable=False),
+        sa.Column('setor_id', sa.Integer(), nullable=False),
+        sa.Column('padrao', sa.Enum('DOZE_POR_TRINTA_E_SEIS', 'SEIS_POR_UM', 'NOTURNO_ROTATIVO', 'PERSONALIZADO', name='padraoescalaenum'), nullable=False),
+        sa.Column('dias_trabalho', sa.Integer(), nullable=False),
+        sa.Column('dias_folga', sa.Integer(), nullable=False),
+        sa.Column('hora_inicio', sa.Time(), nullable=False),
+        sa.Column('hora_fim', sa.Time(), nullable=False),
+        sa.Column('data_referencia', sa.Date(), nullable=False),
+        sa.Column('observacoes', sa.Text(), nullable=True),
+        sa.Column('ativo', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['estabelecimento_id'], ['estabelecimentos.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['setor_id'], ['setores.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_modelos_escala_estabelecimento_id'), 'modelos_escala', ['estabelecimento_id'], unique=False)
+    op.create_index(op.f('ix_modelos_escala_setor_id'), 'modelos_escala', ['setor_id'], unique=False)
+
+    op.create_table('modelo_escala_usuarios',
+        sa.Column('modelo_id', sa.Integer(), nullable=False),
+        sa.Column('usuario_id', sa.Integer(), nullable=False),
+        sa.Column('posicao', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['modelo_id'], ['modelos_escala.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['usuario_id'], ['usuarios.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('modelo_id', 'usuario_id')
+    )
+
+
+def downgrade():
+    op.drop_table('modelo_escala_usuarios')
+    op.drop_index(op.f('ix_modelos_escala_setor_id'), table_name='modelos_escala')
+    op.drop_index(op.f('ix_modelos_escala_estabelecimento_id'), table_name='modelos_escala')
+    op.drop_table('modelos_escala')
@@ -0,0 +1,61 @@
+"""add per-user daily performance facts
+
+Revision ID: add_rollup_desempenho
+Revises: add_modelos_escala
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_rollup_desempenho'
+down_revision = 'add_modelos_escala'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('rollup_desempenho_diario',
+        sa.Column('usuario_id', sa.Integer(), nullable=False),
+        sa.Column('dia', sa.Date(), nullable=False),
+        sa.Column('estabelecimento_id', sa.Integer(), nullable=False),
+        sa.Column('escalas', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('faltas', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('checkins', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('checkins_realizados', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('checkins_fora_local', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['usuario_id'], ['usuarios.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['estabelecimento_id'], ['estabelecimentos.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('usuario_id', 'dia', 'estabelecimento_id')
+    )
+
+    # Backfill from the fact tables
+    op.execute("""
+        INSERT INTO rollup_desempenho_diario
+            (usuario_id, dia, estabelecimento_id, escalas, faltas,
+             checkins, checkins_realizados, checkins_fora_local, updated_at)
+        SELECT eu.usuario_id, e.data_inicio, e.estabelecimento_id,
+               COUNT(eu.id),
+               SUM(CASE WHEN e.status = 'AUSENTE' THEN 1 ELSE 0 END),
+               COALESCE(SUM(c.checkins), 0),
+               COALESCE(SUM(c.realizados), 0),
+               COALESCE(SUM(c.fora_local), 0),
+               NOW()
+        FROM escala_usuarios eu
+        JOIN escalas e ON e.id = eu.escala_id
+        LEFT JOIN (
+            SELECT escala_id, usuario_id,
+                   COUNT(id) AS checkins,
+                   SUM(CASE WHEN status = 'REALIZADO' THEN 1 ELSE 0 END) AS realizados,
+                   SUM(CASE WHEN status = 'FORA_DE_LOCAL' THEN 1 ELSE 0 END) AS fora_local
+            FROM checkins
+            GROUP BY escala_id, usuario_id
+        ) c ON c.escala_id = e.id AND c.usuario_id = eu.usuario_id
+        GROUP BY eu.usuario_id, e.data_inicio, e.estabelecimento_id
+    """)
+
+
+def downgrade():
+    op.drop_table('rollup_desempenho_diario')
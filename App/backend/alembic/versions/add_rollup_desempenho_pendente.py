@@ -0,0 +1,39 @@
+"""stale slices of the per-user daily performance facts
+
+Revision ID: add_rollup_desempenho_pendente
+Revises: add_documento_cache
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_rollup_desempenho_pendente'
+down_revision = 'add_documento_cache'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('rollup_desempenho_pendente',
+        sa.Column('dia', sa.Date(), nullable=False),
+        sa.Column('estabelecimento_id', sa.Integer(), nullable=False),
+        sa.Column('marked_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['estabelecimento_id'], ['estabelecimentos.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('dia', 'estabelecimento_id')
+    )
+
+    # Facts written since the last reconciliation may be missing from the
+    # rollup; treat yesterday's slices as stale until the next run (today is
+    # always aggregated live)
+    op.execute("""
+        INSERT INTO rollup_desempenho_pendente (dia, estabelecimento_id, marked_at)
+        SELECT DISTINCT data_inicio, estabelecimento_id, NOW()
+        FROM escalas
+        WHERE data_inicio >= CURRENT_DATE - INTERVAL 1 DAY AND data_inicio < CURRENT_DATE
+    """)
+
+
+def downgrade():
+    op.drop_table('rollup_desempenho_pendente')
@@ -0,0 +1,56 @@
+"""add daily rollup tables
+
+Revision ID: add_rollup_tables
+Revises: add_setores_table, refactor_setores_structure
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_rollup_tables'
+down_revision = ('add_setores_table', 'refactor_setores_structure')
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('rollup_escalas_diarias',
+        sa.Column('dia', sa.Date(), nullable=False),
+        sa.Column('estabelecimento_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.Enum('PENDENTE', 'CONFIRMADO', 'AUSENTE', name='statusescalaenum'), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['estabelecimento_id'], ['estabelecimentos.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('dia', 'estabelecimento_id', 'status')
+    )
+    op.create_table('rollup_checkins_diarios',
+        sa.Column('dia', sa.Date(), nullable=False),
+        sa.Column('estabelecimento_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.Enum('REALIZADO', 'AUSENTE', 'FORA_DE_LOCAL', name='statuscheckinenum'), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['estabelecimento_id'], ['estabelecimentos.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('dia', 'estabelecimento_id', 'status')
+    )
+
+    # Backfill from the fact tables
+    op.execute("""
+        INSERT INTO rollup_escalas_diarias (dia, estabelecimento_id, status, total, updated_at)
+        SELECT data_inicio, estabelecimento_id, status, COUNT(*), NOW()
+        FROM escalas
+        GROUP BY data_inicio, estabelecimento_id, status
+    """)
+    op.execute("""
+        INSERT INTO rollup_checkins_diarios (dia, estabelecimento_id, status, total, updated_at)
+        SELECT DATE(c.data_hora), e.estabelecimento_id, c.status, COUNT(*), NOW()
+        FROM checkins c
+        JOIN escalas e ON e.id = c.escala_id
+        GROUP BY DATE(c.data_hora), e.estabelecimento_id, c.status
+    """)
+
+
+def downgrade():
+    op.drop_table('rollup_checkins_diarios')
+    op.drop_table('rollup_escalas_diarias')
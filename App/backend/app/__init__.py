@@ -1 +1,5 @@
- 
\ No newline at end of file
+import time
+
+# Worker boot and time-to-first-request are measured from here: the package
+# is imported before any framework or application module main.py pulls in
+BOOT_STARTED = time.perf_counter()
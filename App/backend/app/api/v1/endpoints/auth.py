@@ -12,6 +12,7 @@ from app.core.database import get_db
 from app.core.models import Usuario, PerfilEnum, StatusUsuarioEnum
 from app.core.security import SecurityUtils, verify_password, get_password_hash
 from app.core.config import settings
+from app.core.cache import principal_cache
 from app.core.deps import get_current_user, verify_registration_token, log_action
 from app.schemas.usuario import (
     LoginRequest, Token, UsuarioResponse, TokenValidationResponse,
@@ -218,6 +219,7 @@ async def complete_registration(
     
     await db.commit()
     await db.refresh(user)
+    await principal_cache.invalidate(user.id)
     
     # Log registration completion
     await log_action(
@@ -1,52 +1,83 @@
 """
 Check-in management endpoints
 """
-from typing import List, Optional
+from typing import Iterable, List, Optional
 from datetime import datetime, timedelta
-from decimal import Decimal
-import math
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_, func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.models import (
     Checkin, Escala, Usuario, StatusCheckinEnum, 
-    StatusEscalaEnum, PerfilEnum
+    StatusEscalaEnum, PerfilEnum, escala_usuarios
 )
 from app.core.deps import get_current_user, require_supervisor, PermissionChecker, log_action
 from app.core.config import settings
+from app.core.geofence import geofences
+from app.core.monitoring import record_checkin_attempt
 from app.schemas.checkin import (
     CheckinResponse, CheckinCreate, CheckinUpdate, CheckinListResponse,
-    CheckinFilter, CheckinStats, CheckinValidation, LocationValidation
+    CheckinFilter, CheckinStats, CheckinValidation, LocationValidation,
+    CheckinBatchRequest, CheckinBatchResponse, CheckinBatchResult
 )
 
 router = APIRouter()
 
+# Tolerated drift between a mobile client's clock and the server's
+CLIENT_CLOCK_SKEW = timedelta(minutes=5)
 
-def calculate_distance(lat1: Decimal, lon1: Decimal, lat2: Decimal, lon2: Decimal) -> float:
-    """
-    Calculate distance between two GPS coordinates using Haversine formula
-    Returns distance in meters
-    """
-    # Convert to float for calculation
-    lat1, lon1, lat2, lon2 = float(lat1), float(lon1), float(lat2), float(lon2)
-    
-    # Convert to radians
-    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-    
-    # Haversine formula
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-    c = 2 * math.asin(math.sqrt(a))
-    
-    # Earth radius in meters
-    r = 6371000
-    
-    return c * r
+
+def _checkin_list_conditions(
+    usuario_id: Optional[int] = None,
+    escala_id: Optional[int] = None,
+    data_inicio: Optional[datetime] = None,
+    data_fim: Optional[datetime] = None,
+    status: Optional[StatusCheckinEnum] = None
+) -> list:
+    """Filters of the check-in listing"""
+    conditions = []
+    if usuario_id:
+        conditions.append(Checkin.usuario_id == usuario_id)
+    if escala_id:
+        conditions.append(Checkin.escala_id == escala_id)
+    if data_inicio:
+        conditions.append(Checkin.data_hora >= data_inicio)
+    if data_fim:
+        conditions.append(Checkin.data_hora <= data_fim)
+    if status:
+        conditions.append(Checkin.status == status)
+    return conditions
+
+
+def _checkin_list_query(conditions: list):
+    """Check-ins with user and schedule, newest first"""
+    query = select(Checkin).options(
+        selectinload(Checkin.usuario),
+        selectinload(Checkin.escala)
+    )
+    if conditions:
+        query = query.where(and_(*conditions))
+    return query.order_by(Checkin.data_hora.desc())
+
+
+def _synced_checkins_query(client_uuids: List[str], escala_ids: Iterable[int], usuario_id: int):
+    """Check-ins already synced, by client UUID or by schedule for this user"""
+    return select(
+        Checkin.id, Checkin.usuario_id, Checkin.escala_id,
+        Checkin.status, Checkin.client_uuid
+    ).where(
+        or_(
+            Checkin.client_uuid.in_(client_uuids),
+            and_(
+                Checkin.escala_id.in_(escala_ids),
+                Checkin.usuario_id == usuario_id
+            )
+        )
+    )
 
 
 @router.get("/", response_model=CheckinListResponse)
@@ -54,40 +85,25 @@ async def list_checkins(
     request: Request,
     filter_params: CheckinFilter = Depends(),
     current_user: Usuario = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     List check-ins with pagination and filters
     Sócios can only see their own check-ins
     """
-    # Build base query
-    query = select(Checkin).options(
-        selectinload(Checkin.usuario),
-        selectinload(Checkin.escala)
-    )
-    
     # Apply user restrictions
-    conditions = []
     if current_user.perfil == PerfilEnum.SOCIO:
-        conditions.append(Checkin.usuario_id == current_user.id)
-    elif filter_params.usuario_id:
-        conditions.append(Checkin.usuario_id == filter_params.usuario_id)
-    
-    # Apply filters
-    if filter_params.escala_id:
-        conditions.append(Checkin.escala_id == filter_params.escala_id)
-    
-    if filter_params.data_inicio:
-        conditions.append(Checkin.data_hora >= filter_params.data_inicio)
-    
-    if filter_params.data_fim:
-        conditions.append(Checkin.data_hora <= filter_params.data_fim)
-    
-    if filter_params.status:
-        conditions.append(Checkin.status == filter_params.status)
-    
-    if conditions:
-        query = query.where(and_(*conditions))
+        usuario_id = current_user.id
+    else:
+        usuario_id = filter_params.usuario_id
+    
+    conditions = _checkin_list_conditions(
+        usuario_id=usuario_id,
+        escala_id=filter_params.escala_id,
+        data_inicio=filter_params.data_inicio,
+        data_fim=filter_params.data_fim,
+        status=filter_params.status
+    )
     
     # Count total
     count_query = select(func.count(Checkin.id))
@@ -99,8 +115,7 @@ async def list_checkins(
     
     # Apply pagination
     offset = (filter_params.page - 1) * filter_params.per_page
-    query = query.offset(offset).limit(filter_params.per_page)
-    query = query.order_by(Checkin.data_hora.desc())
+    query = _checkin_list_query(conditions).offset(offset).limit(filter_params.per_page)
     
     # Execute query
     result = await db.execute(query)
@@ -182,32 +197,18 @@ async def validate_checkin_location(
     """
     Validate if check-in can be performed at given location
     """
-    # For this example, we'll use a simple validation
-    # In production, you would have predefined work locations in the database
-    
-    # Example work locations (in production, these would be in the database)
-    WORK_LOCATIONS = [
-        {"name": "Hospital Principal", "lat": Decimal("-23.550520"), "lon": Decimal("-46.633308")},
-        {"name": "Clínica Norte", "lat": Decimal("-23.545678"), "lon": Decimal("-46.628901")},
-        {"name": "UBS Centro", "lat": Decimal("-23.552341"), "lon": Decimal("-46.635789")},
-    ]
+    lat = float(validation_data.latitude)
+    lon = float(validation_data.longitude)
     
-    # Find closest work location
-    min_distance = float('inf')
-    closest_location = None
-    
-    for location in WORK_LOCATIONS:
-        distance = calculate_distance(
-            validation_data.latitude, validation_data.longitude,
-            location["lat"], location["lon"]
-        )
-        
-        if distance < min_distance:
-            min_distance = distance
-            closest_location = location
+    # Match against the establishment geofences
+    index = await geofences.get(db)
+    if validation_data.estabelecimento_id:
+        match = index.check(validation_data.estabelecimento_id, lat, lon)
+    else:
+        match = index.nearest(lat, lon)
     
-    # Check if within tolerance
-    is_valid = min_distance <= settings.GPS_TOLERANCE_METERS
+    min_distance = match.distance if match else None
+    is_valid = match is not None and match.inside
     
     # Log validation attempt
     await log_action(
@@ -223,10 +224,12 @@ async def validate_checkin_location(
         db=db
     )
     
-    if is_valid:
-        message = f"Location validated. You are {min_distance:.0f}m from {closest_location['name']}"
+    if match is None:
+        message = "Location not valid. No active work location found"
+    elif is_valid:
+        message = f"Location validated. You are {min_distance:.0f}m from {match.nome}"
     else:
-        message = f"Location not valid. You are {min_distance:.0f}m from the nearest work location. Maximum allowed distance is {settings.GPS_TOLERANCE_METERS}m"
+        message = f"Location not valid. You are {min_distance:.0f}m from {match.nome}. Maximum allowed distance is {match.raio:.0f}m"
     
     return CheckinValidation(
         escala_id=0,  # This would be provided in the actual check-in request
@@ -302,7 +305,8 @@ async def create_checkin(
     validation = await validate_checkin_location(
         LocationValidation(
             latitude=checkin_data.gps_lat,
-            longitude=checkin_data.gps_long
+            longitude=checkin_data.gps_long,
+            estabelecimento_id=escala.estabelecimento_id
         ),
         request,
         current_user,
@@ -351,6 +355,201 @@ async def create_checkin(
     return CheckinResponse.from_orm(novo_checkin)
 
 
+@router.post("/batch", response_model=CheckinBatchResponse)
+async def sync_checkins_batch(
+    batch: CheckinBatchRequest,
+    request: Request,
+    current_user: Usuario = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Sync check-ins recorded offline by a mobile client
+    Items are validated together and inserted in a single transaction.
+    Re-sending an item with the same client_uuid reports it as a duplicate.
+    """
+    if len(batch.checkins) > settings.CHECKIN_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch cannot exceed {settings.CHECKIN_BATCH_MAX_ITEMS} check-ins"
+        )
+    
+    client_uuids = [str(item.client_uuid) for item in batch.checkins]
+    escala_ids = {item.escala_id for item in batch.checkins}
+    
+    # Check-ins already synced, by client UUID or by schedule for this user
+    existing_result = await db.execute(
+        _synced_checkins_query(client_uuids, escala_ids, current_user.id)
+    )
+    existing_by_uuid = {}
+    existing_escalas = set()
+    for row in existing_result:
+        if row.client_uuid:
+            existing_by_uuid[row.client_uuid] = row
+        if row.usuario_id == current_user.id:
+            existing_escalas.add(row.escala_id)
+    
+    # Schedules and the current user's assignments
+    escalas_result = await db.execute(select(Escala).where(Escala.id.in_(escala_ids)))
+    escalas = {escala.id: escala for escala in escalas_result.scalars()}
+    
+    assigned_result = await db.execute(
+        select(escala_usuarios.c.escala_id).where(
+            and_(
+                escala_usuarios.c.usuario_id == current_user.id,
+                escala_usuarios.c.escala_id.in_(escala_ids)
+            )
+        )
+    )
+    assigned = set(assigned_result.scalars())
+    can_manage = PermissionChecker.can_manage_escalas(current_user)
+    
+    index = await geofences.get(db)
+    now = datetime.now()
+    
+    results = []
+    pending = []
+    repeats = []
+    seen = {}  # client_uuid -> (result position, escala_id) of its first item in the batch
+    for item in batch.checkins:
+        client_uuid = str(item.client_uuid)
+        
+        # The same UUID twice in one batch would fail the unique index on commit
+        first = seen.get(client_uuid)
+        if first is not None:
+            position, escala_id = first
+            original = results[position]
+            if original.status == "created" and escala_id == item.escala_id:
+                repeats.append((len(results), position))
+                results.append(CheckinBatchResult(
+                    client_uuid=item.client_uuid,
+                    status="duplicate",
+                    checkin_status=original.checkin_status
+                ))
+            else:
+                results.append(CheckinBatchResult(
+                    client_uuid=item.client_uuid,
+                    status="rejected",
+                    detail="client_uuid repeated in this batch"
+                ))
+            continue
+        seen[client_uuid] = (len(results), item.escala_id)
+        
+        existing = existing_by_uuid.get(client_uuid)
+        if existing:
+            if existing.usuario_id == current_user.id:
+                results.append(CheckinBatchResult(
+                    client_uuid=item.client_uuid,
+                    status="duplicate",
+                    checkin_id=existing.id,
+                    checkin_status=existing.status
+                ))
+            else:
+                results.append(CheckinBatchResult(
+                    client_uuid=item.client_uuid,
+                    status="rejected",
+                    detail="client_uuid already used"
+                ))
+            continue
+        
+        data_hora = item.data_hora
+        if data_hora.tzinfo:
+            data_hora = data_hora.astimezone().replace(tzinfo=None)
+        
+        escala = escalas.get(item.escala_id)
+        detail = None
+        if not escala:
+            detail = "Schedule not found"
+        elif not can_manage and escala.id not in assigned:
+            detail = "Not enough permissions to perform this check-in"
+        elif escala.id in existing_escalas:
+            detail = "Check-in already exists for this schedule"
+        else:
+            schedule_datetime = datetime.combine(escala.data_inicio, escala.hora_inicio)
+            if data_hora > now + CLIENT_CLOCK_SKEW:
+                detail = "Check-in timestamp is in the future"
+            elif data_hora < schedule_datetime - timedelta(minutes=settings.CHECKIN_WINDOW_MINUTES):
+                detail = f"Check-in only allowed starting {settings.CHECKIN_WINDOW_MINUTES} minutes before the shift"
+            elif data_hora > schedule_datetime + timedelta(hours=1):
+                detail = "Check-in period has expired. Contact your supervisor"
+        
+        if detail:
+            results.append(CheckinBatchResult(
+                client_uuid=item.client_uuid,
+                status="rejected",
+                detail=detail
+            ))
+            continue
+        
+        # Allow check-in even if location is not perfect, but mark status accordingly
+        match = index.check(escala.estabelecimento_id, float(item.gps_lat), float(item.gps_long))
+        location_valid = match is not None and match.inside
+        checkin_status = StatusCheckinEnum.REALIZADO if location_valid else StatusCheckinEnum.FORA_DE_LOCAL
+        
+        checkin = Checkin(
+            usuario_id=current_user.id,
+            escala_id=escala.id,
+            data_hora=data_hora,
+            gps_lat=item.gps_lat,
+            gps_long=item.gps_long,
+            endereco=item.endereco,
+            observacoes=item.observacoes,
+            status=checkin_status,
+            client_uuid=client_uuid
+        )
+        db.add(checkin)
+        escala.status = StatusEscalaEnum.CONFIRMADO
+        existing_escalas.add(escala.id)
+        
+        pending.append((len(results), checkin, location_valid))
+        results.append(CheckinBatchResult(
+            client_uuid=item.client_uuid,
+            status="created",
+            checkin_status=checkin_status
+        ))
+    
+    if pending:
+        try:
+            await db.commit()
+        except IntegrityError:
+            # A concurrent sync inserted one of these client UUIDs first
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="These check-ins are being synced by another request. Retry the batch"
+            )
+        
+        for position, checkin, location_valid in pending:
+            results[position].checkin_id = checkin.id
+            record_checkin_attempt(checkin.status.value, location_valid)
+        for position, first in repeats:
+            results[position].checkin_id = results[first].checkin_id
+    
+    created = sum(1 for r in results if r.status == "created")
+    duplicates = sum(1 for r in results if r.status == "duplicate")
+    rejected = sum(1 for r in results if r.status == "rejected")
+    
+    # Log action
+    await log_action(
+        request=request,
+        current_user=current_user,
+        action="SYNC_CHECKINS_BATCH",
+        details={
+            "total": len(results),
+            "created": created,
+            "duplicates": duplicates,
+            "rejected": rejected
+        },
+        db=db
+    )
+    
+    return CheckinBatchResponse(
+        results=results,
+        created=created,
+        duplicates=duplicates,
+        rejected=rejected
+    )
+
+
 @router.put("/{checkin_id}", response_model=CheckinResponse)
 async def update_checkin(
     checkin_id: int,
@@ -405,7 +604,7 @@ async def get_checkin_stats(
     end_date: datetime = Query(...),
     usuario_id: Optional[int] = Query(None),
     current_user: Usuario = Depends(require_supervisor()),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get check-in statistics for a date range
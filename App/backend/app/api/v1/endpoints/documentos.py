@@ -1,27 +1,47 @@
 """
 Document management endpoints
 """
+import hashlib
 import os
 import uuid
-from typing import List, Optional
+from typing import BinaryIO, List, NamedTuple, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Request, File, UploadFile, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, func
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
+from app.core.cache import response_cache
 from app.core.models import Documento, Usuario, PerfilEnum
 from app.core.deps import (
     get_current_user, require_admin, PermissionChecker, log_action
 )
 from app.core.config import settings
+from app.core.monitoring import record_cache_access
+from app.services.document_store import commit_file, release_file
 from app.schemas.documento import (
     DocumentoResponse, DocumentoListResponse, DocumentoFilter
 )
 
 router = APIRouter()
 
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+# Leading bytes of the accepted formats
+FILE_SIGNATURES = [
+    (b"%PDF-", "application/pdf"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+]
+EXTENSION_MIME_TYPES = {
+    ".pdf": "application/pdf",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+}
+
 
 def validate_file(file: UploadFile) -> None:
     """Validate uploaded file"""
@@ -42,8 +62,44 @@ def validate_file(file: UploadFile) -> None:
             )
 
 
-async def save_uploaded_file(file: UploadFile, user_id: int) -> tuple[str, str]:
-    """Save uploaded file and return file path and URL"""
+class SavedUpload(NamedTuple):
+    """File written by save_uploaded_file"""
+    path: str
+    url: str
+    sha256: str
+    mime_type: str
+    size: int
+
+
+def sniff_mime_type(head: bytes) -> Optional[str]:
+    """MIME type from the file's leading bytes, None when unrecognized"""
+    for signature, mime_type in FILE_SIGNATURES:
+        if head.startswith(signature):
+            return mime_type
+    return None
+
+
+def _write_chunk(f: BinaryIO, sha, chunk: bytes) -> None:
+    sha.update(chunk)
+    f.write(chunk)
+
+
+def _sync_and_close(f: BinaryIO) -> None:
+    f.flush()
+    os.fsync(f.fileno())
+    f.close()
+
+
+async def save_uploaded_file(file: UploadFile, user_id: int) -> SavedUpload:
+    """
+    Stream uploaded file to disk in chunks and return where it was stored
+    Disk writes and hashing run in the thread pool; the content type is
+    sniffed from the first chunk and the upload is aborted with 413 as soon
+    as it passes MAX_FILE_SIZE. The file is written to a temporary name,
+    fsynced and only then linked into place, so a failed upload never
+    leaves a partial document behind. Identical content is stored once
+    and hardlinked (see document_store).
+    """
     # Create user directory
     user_dir = os.path.join(settings.UPLOAD_PATH, str(user_id))
     os.makedirs(user_dir, exist_ok=True)
@@ -52,16 +108,54 @@ async def save_uploaded_file(file: UploadFile, user_id: int) -> tuple[str, str]:
     file_ext = os.path.splitext(file.filename)[1].lower()
     unique_filename = f"{uuid.uuid4()}{file_ext}"
     file_path = os.path.join(user_dir, unique_filename)
-    
-    # Save file
-    with open(file_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
+    temp_path = f"{file_path}.part"
+    
+    sha = hashlib.sha256()
+    size = 0
+    mime_type = None
+    f = await run_in_threadpool(open, temp_path, "wb")
+    try:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            if mime_type is None:
+                sniffed = sniff_mime_type(chunk)
+                expected = EXTENSION_MIME_TYPES.get(file_ext)
+                # Known extensions must carry their signature; the client's
+                # Content-Type header is never trusted for the check
+                if expected and sniffed != expected:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"O conteúdo do arquivo não corresponde à extensão {file_ext}"
+                    )
+                mime_type = sniffed or file.content_type or "application/octet-stream"
+            
+            size += len(chunk)
+            if size > settings.MAX_FILE_SIZE:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"File too large. Maximum size is {settings.MAX_FILE_SIZE // 1024 // 1024}MB"
+                )
+            await run_in_threadpool(_write_chunk, f, sha, chunk)
+        
+        if size == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Arquivo vazio"
+            )
+        
+        await run_in_threadpool(_sync_and_close, f)
+        digest = sha.hexdigest()
+        duplicate = await run_in_threadpool(commit_file, temp_path, digest, file_path)
+    finally:
+        if not f.closed:
+            await run_in_threadpool(f.close)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    record_cache_access("documento_arquivos", hit=duplicate)
     
     # Generate URL (relative to upload path)
     file_url = f"/uploads/{user_id}/{unique_filename}"
     
-    return file_path, file_url
+    return SavedUpload(file_path, file_url, digest, mime_type, size)
 
 
 @router.get("/", response_model=DocumentoListResponse)
@@ -217,17 +311,18 @@ async def upload_documento(
             )
     
     # Save file
-    file_path, file_url = await save_uploaded_file(file, target_user_id)
+    saved = await save_uploaded_file(file, target_user_id)
     
     # Create document record
     documento = Documento(
         usuario_id=target_user_id,
         tipo_documento=tipo_documento,
         nome_arquivo=file.filename or "unknown",
-        arquivo_url=file_url,
-        arquivo_path=file_path,
-        tamanho_bytes=file.size if hasattr(file, 'size') else None,
-        mime_type=file.content_type,
+        arquivo_url=saved.url,
+        arquivo_path=saved.path,
+        tamanho_bytes=saved.size,
+        mime_type=saved.mime_type,
+        conteudo_hash=saved.sha256,
         processado=False
     )
     
@@ -341,12 +436,11 @@ async def delete_documento(
             detail="Not enough permissions to delete this document"
         )
     
-    # Delete physical file
-    if documento.arquivo_path and os.path.exists(documento.arquivo_path):
-        try:
-            os.remove(documento.arquivo_path)
-        except OSError:
-            pass  # File might be already deleted or locked
+    # Delete physical file, and its stored blob once no other document shares it
+    try:
+        release_file(documento.arquivo_path, documento.conteudo_hash)
+    except OSError:
+        pass  # File might be already deleted or locked
     
     # Delete database record
     await db.delete(documento)
@@ -457,10 +551,15 @@ async def get_user_documentos(
 
 
 @router.get("/types/available")
-async def get_available_document_types():
+async def get_available_document_types(request: Request):
     """
     Get list of available document types
+    Served with an ETag so repeat loads are answered with 304
     """
+    cached = await response_cache.get("documento_tipos", request)
+    if cached is not None:
+        return cached
+    
     # In production, this might come from a configuration table
     document_types = [
         {"code": "RG", "name": "RG - Registro Geral", "required": True},
@@ -475,7 +574,7 @@ async def get_available_document_types():
         {"code": "FOTO_3x4", "name": "Foto 3x4", "required": True},
     ]
     
-    return {"document_types": document_types}
+    return await response_cache.store("documento_tipos", request, {"document_types": document_types})
 
 
 @router.get("/stats/summary")
@@ -9,6 +9,7 @@ from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
 from app.core.models import Escala, Usuario, escala_usuarios
+from app.core.rollups import mark_escalas_stale
 from app.core.deps import get_current_user, require_supervisor
 from app.schemas.escala import (
     EscalaUsuarioCreate, EscalaUsuarioUpdate, EscalaUsuarioResponse
@@ -75,6 +76,7 @@ async def adicionar_usuario_escala(
     )
     
     result = await db.execute(stmt)
+    await mark_escalas_stale(db, [escala_id])
     await db.commit()
     
     # Retornar dados do relacionamento criado
@@ -239,6 +241,7 @@ async def remover_usuario_escala(
     )
     
     await db.execute(stmt)
+    await mark_escalas_stale(db, [escala_id])
     await db.commit()
     
     return {"message": "Usuário removido da escala com sucesso"}
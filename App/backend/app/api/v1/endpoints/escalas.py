@@ -1,14 +1,18 @@
 """
 Schedule (Escala) management endpoints
 """
+import base64
 from typing import List, Optional
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func, between
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, and_, or_, func, between, exists
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.cache import response_cache
+from app.core.database import get_db, get_read_db
+from app.core.rollups import mark_escalas_stale
+from app.core.exceptions import ValidationError
 from app.core.models import (
     Escala, Usuario, StatusEscalaEnum, PerfilEnum, StatusUsuarioEnum,
     TransferenciaPlantao, Checkin, escala_usuarios, Estabelecimento
@@ -16,10 +20,16 @@ from app.core.models import (
 from app.core.deps import (
     get_current_user, require_supervisor, PermissionChecker, log_action
 )
+from app.utils.serialization import json_response
 from app.schemas.escala import (
     EscalaResponse, EscalaCreate, EscalaUpdate, EscalaListResponse,
     EscalaFilter, EscalaStats, EscalaCalendarView, EscalaBulkCreate,
-    EscalaBulkUpdate
+    EscalaBulkUpdate, EscalaConflictCheck, EscalaConflictResult, EscalaConflito
+)
+from app.services.escala_loader import load_escala_rows, load_escala_row, build_escala_row
+from app.services.escala_bulk import create_escalas_bulk
+from app.services.escala_conflicts import (
+    ProposedAssignment, find_conflicts, escala_user_ids
 )
 
 router = APIRouter()
@@ -33,7 +43,20 @@ async def list_supervisores_disponiveis(
 ):
     """
     List available supervisors for assignment to schedules
+    Cached until a user is created, updated or deactivated
     """
+    # Log action
+    await log_action(
+        request=request,
+        current_user=current_user,
+        action="LIST_SUPERVISORES_DISPONIVEIS",
+        db=db
+    )
+    
+    cached = await response_cache.get("supervisores", request)
+    if cached is not None:
+        return cached
+    
     # Get all active supervisors and administrators
     result = await db.execute(
         select(Usuario).where(
@@ -43,15 +66,7 @@ async def list_supervisores_disponiveis(
     )
     supervisores = result.scalars().all()
     
-    # Log action
-    await log_action(
-        request=request,
-        current_user=current_user,
-        action="LIST_SUPERVISORES_DISPONIVEIS",
-        db=db
-    )
-    
-    return [
+    return await response_cache.store("supervisores", request, [
         {
             "id": s.id,
             "nome": s.nome,
@@ -59,7 +74,7 @@ async def list_supervisores_disponiveis(
             "perfil": s.perfil.value
         }
         for s in supervisores
-    ]
+    ])
 
 
 @router.get("/setores/disponiveis", response_model=List[dict])
@@ -71,7 +86,20 @@ async def list_setores_disponiveis(
 ):
     """
     List available setores for assignment to users in schedules
+    Cached until a setor is created, updated or deleted
     """
+    # Log action
+    await log_action(
+        request=request,
+        current_user=current_user,
+        action="LIST_SETORES_DISPONIVEIS",
+        db=db
+    )
+    
+    cached = await response_cache.get("setores", request)
+    if cached is not None:
+        return cached
+    
     # Get active setores for specific establishment or all if not specified
     from app.core.models import Setor
     query = select(Setor).where(Setor.ativo == True)
@@ -83,15 +111,7 @@ async def list_setores_disponiveis(
     result = await db.execute(query)
     setores = result.scalars().all()
     
-    # Log action
-    await log_action(
-        request=request,
-        current_user=current_user,
-        action="LIST_SETORES_DISPONIVEIS",
-        db=db
-    )
-    
-    return [
+    return await response_cache.store("setores", request, [
         {
             "id": s.id,
             "nome": s.nome,
@@ -99,7 +119,84 @@ async def list_setores_disponiveis(
             "estabelecimento_id": s.estabelecimento_id
         }
         for s in setores
-    ]
+    ])
+
+
+def _assignment_for(escala: Escala, usuario_id: int) -> ProposedAssignment:
+    """Proposal for adding usuario_id to an existing schedule"""
+    return ProposedAssignment(
+        usuario_id=usuario_id,
+        data_inicio=escala.data_inicio,
+        data_fim=escala.data_fim,
+        hora_inicio=escala.hora_inicio,
+        hora_fim=escala.hora_fim,
+        escala_id=escala.id
+    )
+
+
+@router.post("/conflitos/validar", response_model=EscalaConflictResult)
+async def validar_conflitos(
+    dados: EscalaConflictCheck,
+    current_user: Usuario = Depends(require_supervisor()),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Validate proposed assignments against existing schedules and each other
+    Overnight and multi-day shifts are compared by their full datetime range
+    """
+    conflicts = await find_conflicts(
+        db,
+        [ProposedAssignment(**atribuicao.dict()) for atribuicao in dados.atribuicoes]
+    )
+    
+    return EscalaConflictResult(
+        valido=not conflicts,
+        conflitos=[EscalaConflito(**vars(conflict)) for conflict in conflicts]
+    )
+
+
+def _escala_list_conditions(
+    visible_to: Optional[int] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    status: Optional[StatusEscalaEnum] = None,
+    estabelecimento_id: Optional[int] = None
+) -> list:
+    """Filters of the schedule listing; visible_to keeps only a user's schedules"""
+    conditions = []
+    if visible_to:
+        conditions.append(
+            exists().where(
+                escala_usuarios.c.escala_id == Escala.id,
+                escala_usuarios.c.usuario_id == visible_to
+            )
+        )
+    if data_inicio:
+        conditions.append(Escala.data_inicio >= data_inicio)
+    if data_fim:
+        conditions.append(Escala.data_inicio <= data_fim)
+    if status:
+        conditions.append(Escala.status == status)
+    if estabelecimento_id:
+        conditions.append(Escala.estabelecimento_id == estabelecimento_id)
+    return conditions
+
+
+def _escala_count_query(conditions: list):
+    query = select(func.count(Escala.id))
+    if conditions:
+        query = query.where(and_(*conditions))
+    return query
+
+
+def _escala_list_query(conditions: list):
+    """Schedules in (data_inicio DESC, hora_inicio, id) order, the cursor sort key"""
+    query = select(Escala)
+    if conditions:
+        query = query.where(and_(*conditions))
+    return query.order_by(
+        Escala.data_inicio.desc(), Escala.hora_inicio.asc(), Escala.id.asc()
+    )
 
 
 @router.get("/", response_model=EscalaListResponse)
@@ -107,131 +204,49 @@ async def list_escalas(
     request: Request,
     filter_params: EscalaFilter = Depends(),
     current_user: Usuario = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     List schedules with pagination and filters
     Sócios can only see their own schedules
     """
-    # Build base query
-    query = select(Escala).options(selectinload(Escala.estabelecimento))
-    
     # Apply user restrictions
-    conditions = []
     if current_user.perfil == PerfilEnum.SOCIO:
-        # For SOCIO, we need to check if they are assigned to any scales
-        # This will be handled after getting the scales
-        pass
-    elif filter_params.usuario_id:
-        # For other users, we'll filter by usuario_id in escala_usuarios
-        # This will be handled after getting the scales
-        pass
-    
-    # Apply date filters
-    if filter_params.data_inicio:
-        conditions.append(Escala.data_inicio >= filter_params.data_inicio)
-    
-    if filter_params.data_fim:
-        conditions.append(Escala.data_inicio <= filter_params.data_fim)
-    
-    # Apply status filter
-    if filter_params.status:
-        conditions.append(Escala.status == filter_params.status)
-    
-    # Apply establishment filter
-    if filter_params.estabelecimento_id:
-        conditions.append(Escala.estabelecimento_id == filter_params.estabelecimento_id)
-    
-    if conditions:
-        query = query.where(and_(*conditions))
+        # SOCIO can only see scales they are assigned to
+        visible_to = current_user.id
+    else:
+        # Filter by specific user
+        visible_to = filter_params.usuario_id
+    
+    conditions = _escala_list_conditions(
+        visible_to=visible_to,
+        data_inicio=filter_params.data_inicio,
+        data_fim=filter_params.data_fim,
+        status=filter_params.status,
+        estabelecimento_id=filter_params.estabelecimento_id
+    )
     
     # Count total
-    count_query = select(func.count(Escala.id))
-    if conditions:
-        count_query = count_query.where(and_(*conditions))
-    
-    total_result = await db.execute(count_query)
+    total_result = await db.execute(_escala_count_query(conditions))
     total = total_result.scalar()
     
-    # Apply pagination
-    offset = (filter_params.page - 1) * filter_params.per_page
-    query = query.offset(offset).limit(filter_params.per_page)
-    query = query.order_by(Escala.data_inicio.desc(), Escala.hora_inicio.asc())
+    # Build page query
+    query = _escala_list_query(conditions)
     
-    # Execute query
-    result = await db.execute(query)
-    escalas = result.scalars().all()
+    # Apply pagination: seek past the cursor, or fall back to OFFSET
+    if filter_params.cursor:
+        query = query.where(_after_cursor(_decode_cursor(filter_params.cursor)))
+    else:
+        offset = (filter_params.page - 1) * filter_params.per_page
+        query = query.offset(offset)
+    query = query.limit(filter_params.per_page)
     
-    # Get usuarios_atribuidos for all scales
-    escala_ids = [escala.id for escala in escalas]
-    escala_usuarios_data = {}
+    # Load page with establishment, assigned users and supervisors
+    escalas = await load_escala_rows(db, query)
     
-    if escala_ids:
-        # Get escala_usuarios relationships
-        escala_usuarios_query = select(escala_usuarios).where(escala_usuarios.c.escala_id.in_(escala_ids))
-        escala_usuarios_result = await db.execute(escala_usuarios_query)
-        escala_usuarios_rows = escala_usuarios_result.fetchall()
-        
-        # Get user data for escala_usuarios
-        usuario_ids = [row.usuario_id for row in escala_usuarios_rows]
-        if usuario_ids:
-            usuarios_query = select(Usuario).where(Usuario.id.in_(usuario_ids))
-            usuarios_result = await db.execute(usuarios_query)
-            usuarios_dict = {u.id: u for u in usuarios_result.scalars().all()}
-            
-            # Group escala_usuarios by escala_id
-            for row in escala_usuarios_rows:
-                if row.escala_id not in escala_usuarios_data:
-                    escala_usuarios_data[row.escala_id] = []
-                usuario = usuarios_dict.get(row.usuario_id)
-                escala_usuarios_data[row.escala_id].append({
-                    "id": row.id,
-                    "usuario_id": row.usuario_id,
-                    "setor": row.setor,
-                    "status": row.status,
-                    "usuario": {
-                        "id": usuario.id,
-                        "nome": usuario.nome,
-                        "email": usuario.email,
-                        "perfil": usuario.perfil.value
-                    } if usuario else None
-                })
-    
-    # Filter scales based on user restrictions
-    filtered_escalas = []
-    for escala in escalas:
-        usuarios_atribuidos = escala_usuarios_data.get(escala.id, [])
-        
-        # Apply user restrictions
-        if current_user.perfil == PerfilEnum.SOCIO:
-            # SOCIO can only see scales they are assigned to
-            if not any(u["usuario_id"] == current_user.id for u in usuarios_atribuidos):
-                continue
-        elif filter_params.usuario_id:
-            # Filter by specific user
-            if not any(u["usuario_id"] == filter_params.usuario_id for u in usuarios_atribuidos):
-                continue
-        
-        # Create escala response with usuarios_atribuidos
-        escala_dict = {
-            "id": escala.id,
-            "data_inicio": escala.data_inicio,
-            "data_fim": escala.data_fim,
-            "hora_inicio": escala.hora_inicio,
-            "hora_fim": escala.hora_fim,
-            "estabelecimento_id": escala.estabelecimento_id,
-            "status": escala.status,
-            "observacoes": escala.observacoes,
-            "created_at": escala.created_at,
-            "updated_at": escala.updated_at,
-            "estabelecimento": {
-                "id": escala.estabelecimento.id,
-                "nome": escala.estabelecimento.nome,
-                "endereco": escala.estabelecimento.endereco
-            } if escala.estabelecimento else None,
-            "usuarios_atribuidos": usuarios_atribuidos
-        }
-        filtered_escalas.append(escala_dict)
+    next_cursor = None
+    if len(escalas) == filter_params.per_page:
+        next_cursor = _encode_cursor(escalas[-1])
     
     # Log action
     await log_action(
@@ -245,12 +260,51 @@ async def list_escalas(
     # Calculate pagination
     pages = (total + filter_params.per_page - 1) // filter_params.per_page
     
-    return EscalaListResponse(
-        escalas=filtered_escalas,
-        total=len(filtered_escalas),
+    return json_response(EscalaListResponse, EscalaListResponse(
+        escalas=[EscalaResponse.model_validate(escala) for escala in escalas],
+        total=total,
         page=filter_params.page,
         per_page=filter_params.per_page,
-        pages=pages
+        total_pages=pages,
+        next_cursor=next_cursor
+    ))
+
+
+def _encode_cursor(escala) -> str:
+    """Opaque keyset cursor for the (data_inicio, hora_inicio, id) sort key"""
+    raw = f"{escala.data_inicio.isoformat()}|{escala.hora_inicio.isoformat()}|{escala.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    """Parse a cursor produced by _encode_cursor"""
+    try:
+        data_inicio, hora_inicio, escala_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        )
+        return (
+            date.fromisoformat(data_inicio),
+            time.fromisoformat(hora_inicio),
+            int(escala_id)
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def _after_cursor(key: tuple):
+    """Rows strictly after key in data_inicio DESC, hora_inicio ASC, id ASC order"""
+    data_inicio, hora_inicio, escala_id = key
+    return or_(
+        Escala.data_inicio < data_inicio,
+        and_(Escala.data_inicio == data_inicio, Escala.hora_inicio > hora_inicio),
+        and_(
+            Escala.data_inicio == data_inicio,
+            Escala.hora_inicio == hora_inicio,
+            Escala.id > escala_id
+        )
     )
 
 
@@ -261,7 +315,7 @@ async def get_calendar_view(
     end_date: date = Query(...),
     usuario_id: Optional[int] = Query(None),
     current_user: Usuario = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get calendar view of schedules for a date range
@@ -287,77 +341,26 @@ async def get_calendar_view(
     ]
     
     if current_user.perfil == PerfilEnum.SOCIO:
-        conditions.append(Escala.usuario_id == current_user.id)
-    elif usuario_id:
-        conditions.append(Escala.usuario_id == usuario_id)
+        usuario_id = current_user.id
     
-    # Get schedules
-    query = select(Escala).options(selectinload(Escala.estabelecimento)).where(and_(*conditions))
-    result = await db.execute(query)
-    escalas = result.scalars().all()
+    if usuario_id:
+        conditions.append(
+            exists().where(
+                escala_usuarios.c.escala_id == Escala.id,
+                escala_usuarios.c.usuario_id == usuario_id
+            )
+        )
     
-    # Get users for each scale
-    escala_ids = [escala.id for escala in escalas]
-    escala_usuarios_data = {}
-    
-    if escala_ids:
-        # Get escala_usuarios relationships
-        escala_usuarios_query = select(escala_usuarios).where(escala_usuarios.c.escala_id.in_(escala_ids))
-        escala_usuarios_result = await db.execute(escala_usuarios_query)
-        escala_usuarios_rows = escala_usuarios_result.fetchall()
-        
-        # Get user data for escala_usuarios
-        usuario_ids = [row.usuario_id for row in escala_usuarios_rows]
-        if usuario_ids:
-            usuarios_query = select(Usuario).where(Usuario.id.in_(usuario_ids))
-            usuarios_result = await db.execute(usuarios_query)
-            usuarios_dict = {u.id: u for u in usuarios_result.scalars().all()}
-            
-            # Group escala_usuarios by escala_id
-            for row in escala_usuarios_rows:
-                if row.escala_id not in escala_usuarios_data:
-                    escala_usuarios_data[row.escala_id] = []
-                usuario = usuarios_dict.get(row.usuario_id)
-                escala_usuarios_data[row.escala_id].append({
-                    "id": row.id,
-                    "usuario_id": row.usuario_id,
-                    "setor": row.setor,
-                    "status": row.status,
-                    "usuario": {
-                        "id": usuario.id,
-                        "nome": usuario.nome,
-                        "email": usuario.email,
-                        "perfil": usuario.perfil.value
-                    } if usuario else None
-                })
+    # Get schedules with establishment, assigned users and supervisors
+    query = select(Escala).where(and_(*conditions)).order_by(Escala.hora_inicio.asc())
+    escalas = await load_escala_rows(db, query)
     
     # Group by date
     calendar_data = {}
     for escala in escalas:
-        date_key = escala.data_inicio
-        if date_key not in calendar_data:
-            calendar_data[date_key] = []
-        
-        # Create escala response with usuarios_atribuidos
-        escala_dict = {
-            "id": escala.id,
-            "data_inicio": escala.data_inicio,
-            "data_fim": escala.data_fim,
-            "hora_inicio": escala.hora_inicio,
-            "hora_fim": escala.hora_fim,
-            "estabelecimento_id": escala.estabelecimento_id,
-            "status": escala.status,
-            "observacoes": escala.observacoes,
-            "created_at": escala.created_at,
-            "updated_at": escala.updated_at,
-            "estabelecimento": {
-                "id": escala.estabelecimento.id,
-                "nome": escala.estabelecimento.nome,
-                "endereco": escala.estabelecimento.endereco
-            } if escala.estabelecimento else None,
-            "usuarios_atribuidos": escala_usuarios_data.get(escala.id, [])
-        }
-        calendar_data[date_key].append(escala_dict)
+        calendar_data.setdefault(escala.data_inicio, []).append(
+            EscalaResponse.model_validate(escala)
+        )
     
     # Create calendar view
     calendar_view = []
@@ -378,7 +381,7 @@ async def get_calendar_view(
         db=db
     )
     
-    return calendar_view
+    return json_response(List[EscalaCalendarView], calendar_view)
 
 
 @router.get("/{escala_id}", response_model=EscalaResponse)
@@ -391,14 +394,8 @@ async def get_escala(
     """
     Get schedule by ID
     """
-    # Get schedule
-    result = await db.execute(
-        select(Escala)
-        .options(selectinload(Escala.estabelecimento))
-        .options(selectinload(Escala.supervisores))
-        .where(Escala.id == escala_id)
-    )
-    escala = result.scalar_one_or_none()
+    # Get schedule with establishment, assigned users and supervisors
+    escala = await load_escala_row(db, escala_id)
     
     if not escala:
         raise HTTPException(
@@ -406,36 +403,9 @@ async def get_escala(
             detail="Schedule not found"
         )
     
-    # Get usuarios_atribuidos for this scale
-    escala_usuarios_query = select(escala_usuarios).where(escala_usuarios.c.escala_id == escala_id)
-    escala_usuarios_result = await db.execute(escala_usuarios_query)
-    escala_usuarios_rows = escala_usuarios_result.fetchall()
-    
-    usuarios_atribuidos = []
-    if escala_usuarios_rows:
-        usuario_ids = [row.usuario_id for row in escala_usuarios_rows]
-        usuarios_query = select(Usuario).where(Usuario.id.in_(usuario_ids))
-        usuarios_result = await db.execute(usuarios_query)
-        usuarios_dict = {u.id: u for u in usuarios_result.scalars().all()}
-        
-        for row in escala_usuarios_rows:
-            usuario = usuarios_dict.get(row.usuario_id)
-            usuarios_atribuidos.append({
-                "id": row.id,
-                "usuario_id": row.usuario_id,
-                "setor": row.setor,
-                "status": row.status,
-                "usuario": {
-                    "id": usuario.id,
-                    "nome": usuario.nome,
-                    "email": usuario.email,
-                    "perfil": usuario.perfil.value
-                } if usuario else None
-            })
-    
     # Check permissions - sócios can only view schedules they are assigned to
     if (current_user.perfil == PerfilEnum.SOCIO and 
-        not any(u["usuario_id"] == current_user.id for u in usuarios_atribuidos)):
+        not any(u["usuario_id"] == current_user.id for u in escala.usuarios_atribuidos)):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions to view this schedule"
@@ -451,27 +421,7 @@ async def get_escala(
         db=db
     )
     
-    # Create response with usuarios_atribuidos
-    escala_dict = {
-        "id": escala.id,
-        "data_inicio": escala.data_inicio,
-        "data_fim": escala.data_fim,
-        "hora_inicio": escala.hora_inicio,
-        "hora_fim": escala.hora_fim,
-        "estabelecimento_id": escala.estabelecimento_id,
-        "status": escala.status,
-        "observacoes": escala.observacoes,
-        "created_at": escala.created_at,
-        "updated_at": escala.updated_at,
-        "estabelecimento": {
-            "id": escala.estabelecimento.id,
-            "nome": escala.estabelecimento.nome,
-            "endereco": escala.estabelecimento.endereco
-        } if escala.estabelecimento else None,
-        "usuarios_atribuidos": usuarios_atribuidos
-    }
-    
-    return escala_dict
+    return escala
 
 
 @router.post("/", response_model=EscalaResponse)
@@ -573,27 +523,10 @@ async def create_escala(
         ]
     
     # Create response with empty usuarios_atribuidos
-    escala_dict = {
-        "id": nova_escala.id,
-        "data_inicio": nova_escala.data_inicio,
-        "data_fim": nova_escala.data_fim,
-        "hora_inicio": nova_escala.hora_inicio,
-        "hora_fim": nova_escala.hora_fim,
-        "estabelecimento_id": nova_escala.estabelecimento_id,
-        "status": nova_escala.status,
-        "observacoes": nova_escala.observacoes,
-        "created_at": nova_escala.created_at,
-        "updated_at": nova_escala.updated_at,
-        "estabelecimento": {
-            "id": nova_escala.estabelecimento.id,
-            "nome": nova_escala.estabelecimento.nome,
-            "endereco": nova_escala.estabelecimento.endereco
-        } if nova_escala.estabelecimento else None,
-        "usuarios_atribuidos": [],
-        "supervisores": supervisores
-    }
+    escala = build_escala_row(nova_escala)
+    escala.supervisores = supervisores
     
-    return escala_dict
+    return json_response(EscalaResponse, EscalaResponse.model_validate(escala))
 
 
 @router.post("/bulk", response_model=List[EscalaResponse])
@@ -604,58 +537,29 @@ async def create_bulk_escalas(
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Create multiple schedules at once
+    Create multiple schedules at once, with their users and supervisors
     Only supervisors and admins can create schedules
     """
-    created_escalas = []
-    errors = []
-    
-    for i, escala_data in enumerate(bulk_data.escalas):
-        try:
-            # Validate establishment exists
-            result = await db.execute(
-                select(Estabelecimento).where(Estabelecimento.id == escala_data.estabelecimento_id)
-            )
-            estabelecimento = result.scalar_one_or_none()
-            
-            if not estabelecimento:
-                errors.append(f"Schedule {i+1}: Establishment not found")
-                continue
-            
-            # Create schedule (only basic data)
-            nova_escala = Escala(
-                data_inicio=escala_data.data_inicio,
-                data_fim=escala_data.data_fim,
-                hora_inicio=escala_data.hora_inicio,
-                hora_fim=escala_data.hora_fim,
-                estabelecimento_id=escala_data.estabelecimento_id,
-                observacoes=escala_data.observacoes,
-                status=StatusEscalaEnum.PENDENTE
-            )
-            
-            db.add(nova_escala)
-            created_escalas.append(nova_escala)
-            
-        except Exception as e:
-            errors.append(f"Schedule {i+1}: {str(e)}")
+    if len(bulk_data.escalas) > settings.ESCALA_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bulk creation cannot exceed {settings.ESCALA_BULK_MAX_ITEMS} schedules"
+        )
     
-    if errors:
-        # Rollback and return errors
+    try:
+        created_escalas = await create_escalas_bulk(db, bulk_data.escalas)
+    except ValidationError as e:
         await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={
-                "message": "Some schedules could not be created",
-                "errors": errors
+                "message": e.message,
+                "errors": e.details["errors"]
             }
         )
     
     await db.commit()
     
-    # Refresh and load relationships
-    for escala in created_escalas:
-        await db.refresh(escala, ['estabelecimento'])
-    
     # Log action
     await log_action(
         request=request,
@@ -665,30 +569,10 @@ async def create_bulk_escalas(
         db=db
     )
     
-    # Create responses with empty usuarios_atribuidos
-    responses = []
-    for escala in created_escalas:
-        escala_dict = {
-            "id": escala.id,
-            "data_inicio": escala.data_inicio,
-            "data_fim": escala.data_fim,
-            "hora_inicio": escala.hora_inicio,
-            "hora_fim": escala.hora_fim,
-            "estabelecimento_id": escala.estabelecimento_id,
-            "status": escala.status,
-            "observacoes": escala.observacoes,
-            "created_at": escala.created_at,
-            "updated_at": escala.updated_at,
-            "estabelecimento": {
-                "id": escala.estabelecimento.id,
-                "nome": escala.estabelecimento.nome,
-                "endereco": escala.estabelecimento.endereco
-            } if escala.estabelecimento else None,
-            "usuarios_atribuidos": []
-        }
-        responses.append(escala_dict)
-    
-    return responses
+    return json_response(
+        List[EscalaResponse],
+        [EscalaResponse.model_validate(escala) for escala in created_escalas]
+    )
 
 
 @router.put("/{escala_id}", response_model=EscalaResponse)
@@ -737,49 +621,34 @@ async def update_escala(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Establishment not found"
             )
-        
-        conflict_result = await db.execute(conflict_query)
-        if conflict_result.scalar_one_or_none():
+    
+    # Update fields
+    update_data = escala_data.dict(exclude_unset=True)
+    
+    # Check the new time range against other schedules of the assigned users
+    if any(field in update_data for field in ("data_inicio", "data_fim", "hora_inicio", "hora_fim")):
+        proposals = [
+            ProposedAssignment(
+                usuario_id=usuario_id,
+                data_inicio=update_data.get("data_inicio") or escala.data_inicio,
+                data_fim=update_data.get("data_fim") or escala.data_fim,
+                hora_inicio=update_data.get("hora_inicio") or escala.hora_inicio,
+                hora_fim=update_data.get("hora_fim") or escala.hora_fim,
+                escala_id=escala_id
+            )
+            for usuario_id in await escala_user_ids(db, escala_id)
+        ]
+        if await find_conflicts(db, proposals):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Schedule conflicts with existing schedule for this user"
             )
     
-    # Update fields
-    update_data = escala_data.dict(exclude_unset=True)
     for field, value in update_data.items():
         if hasattr(escala, field):
             setattr(escala, field, value)
     
     await db.commit()
-    await db.refresh(escala, ['estabelecimento'])
-    
-    # Get usuarios_atribuidos for this scale
-    escala_usuarios_query = select(escala_usuarios).where(escala_usuarios.c.escala_id == escala_id)
-    escala_usuarios_result = await db.execute(escala_usuarios_query)
-    escala_usuarios_rows = escala_usuarios_result.fetchall()
-    
-    usuarios_atribuidos = []
-    if escala_usuarios_rows:
-        usuario_ids = [row.usuario_id for row in escala_usuarios_rows]
-        usuarios_query = select(Usuario).where(Usuario.id.in_(usuario_ids))
-        usuarios_result = await db.execute(usuarios_query)
-        usuarios_dict = {u.id: u for u in usuarios_result.scalars().all()}
-        
-        for row in escala_usuarios_rows:
-            usuario = usuarios_dict.get(row.usuario_id)
-            usuarios_atribuidos.append({
-                "id": row.id,
-                "usuario_id": row.usuario_id,
-                "setor": row.setor,
-                "status": row.status,
-                "usuario": {
-                    "id": usuario.id,
-                    "nome": usuario.nome,
-                    "email": usuario.email,
-                    "perfil": usuario.perfil.value
-                } if usuario else None
-            })
     
     # Log action
     await log_action(
@@ -792,27 +661,8 @@ async def update_escala(
         db=db
     )
     
-    # Create response with usuarios_atribuidos
-    escala_dict = {
-        "id": escala.id,
-        "data_inicio": escala.data_inicio,
-        "data_fim": escala.data_fim,
-        "hora_inicio": escala.hora_inicio,
-        "hora_fim": escala.hora_fim,
-        "estabelecimento_id": escala.estabelecimento_id,
-        "status": escala.status,
-        "observacoes": escala.observacoes,
-        "created_at": escala.created_at,
-        "updated_at": escala.updated_at,
-        "estabelecimento": {
-            "id": escala.estabelecimento.id,
-            "nome": escala.estabelecimento.nome,
-            "endereco": escala.estabelecimento.endereco
-        } if escala.estabelecimento else None,
-        "usuarios_atribuidos": usuarios_atribuidos
-    }
-    
-    return escala_dict
+    # Reload with establishment, assigned users and supervisors
+    return await load_escala_row(db, escala_id)
 
 
 @router.delete("/{escala_id}")
@@ -927,40 +777,45 @@ async def atribuir_usuario_escala(
             detail="Não é possível atribuir escala a usuário inativo"
         )
     
-    # Check if user is already assigned to this schedule
-    if escala.usuario_id == usuario_id:
+    setor_id = atribuicao_data.get('setor_id')
+    if not setor_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Usuário já está atribuído a esta escala"
+            detail="ID do setor é obrigatório"
         )
     
-    # Check for conflicts
-    conflict_query = select(Escala).where(
-        and_(
-            Escala.id != escala_id,
-            Escala.usuario_id == usuario_id,
-            Escala.data_inicio == escala.data_inicio,
-            or_(
-                and_(escala.hora_inicio >= Escala.hora_inicio, escala.hora_inicio < Escala.hora_fim),
-                and_(escala.hora_fim > Escala.hora_inicio, escala.hora_fim <= Escala.hora_fim),
-                and_(escala.hora_inicio <= Escala.hora_inicio, escala.hora_fim >= Escala.hora_fim)
+    # Check if user is already assigned to this schedule
+    result = await db.execute(
+        select(escala_usuarios.c.id).where(
+            and_(
+                escala_usuarios.c.escala_id == escala_id,
+                escala_usuarios.c.usuario_id == usuario_id
             )
         )
     )
+    if result.first():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Usuário já está atribuído a esta escala"
+        )
     
-    conflict_result = await db.execute(conflict_query)
-    if conflict_result.scalar_one_or_none():
+    # Check for conflicts
+    if await find_conflicts(db, [_assignment_for(escala, usuario_id)]):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Usuário já possui escala conflitante neste horário"
         )
     
-    # Update schedule with new user
-    escala.usuario_id = usuario_id
-    escala.setor = atribuicao_data.get('setor', usuario.setor or 'Geral')
-    
+    # Assign user to schedule
+    await db.execute(
+        escala_usuarios.insert().values(
+            escala_id=escala_id,
+            usuario_id=usuario_id,
+            setor_id=setor_id
+        )
+    )
+    await mark_escalas_stale(db, [escala_id])
     await db.commit()
-    await db.refresh(escala, ['usuario'])
     
     # Log action
     await log_action(
@@ -972,14 +827,14 @@ async def atribuir_usuario_escala(
         details={
             "usuario_id": usuario_id,
             "usuario_nome": usuario.nome,
-            "setor": escala.setor
+            "setor_id": setor_id
         },
         db=db
     )
     
     return {
         "message": f"Usuário {usuario.nome} atribuído à escala com sucesso",
-        "escala": EscalaResponse.from_orm(escala)
+        "escala": await load_escala_row(db, escala_id)
     }
 
 
@@ -1160,6 +1015,13 @@ async def adicionar_usuario_escala(
             detail="Usuário já está atribuído a esta escala"
         )
     
+    # Verificar conflitos de horário
+    if await find_conflicts(db, [_assignment_for(escala, usuario_id)]):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Usuário já possui escala conflitante neste horário"
+        )
+    
     # Adicionar usuário à escala
     insert_stmt = escala_usuarios.insert().values(
         escala_id=escala_id,
@@ -1167,6 +1029,7 @@ async def adicionar_usuario_escala(
         setor_id=setor_id
     )
     await db.execute(insert_stmt)
+    await mark_escalas_stale(db, [escala_id])
     await db.commit()
     
     # Log action
@@ -1179,7 +1042,7 @@ async def adicionar_usuario_escala(
         details={
             "usuario_id": usuario_id,
             "usuario_nome": usuario.nome,
-            "setor": setor
+            "setor": setor_obj.nome
         },
         db=db
     )
@@ -1187,7 +1050,7 @@ async def adicionar_usuario_escala(
     return {
         "message": f"Usuário {usuario.nome} adicionado à escala",
         "usuario_id": usuario_id,
-        "setor": setor_upper
+        "setor": setor_obj.nome
     }
 
 
@@ -1239,6 +1102,7 @@ async def remover_usuario_escala(
         )
     )
     await db.execute(delete_stmt)
+    await mark_escalas_stale(db, [escala_id])
     await db.commit()
     
     # Get user name for log
@@ -9,6 +9,8 @@ from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
 from app.core.models import Estabelecimento, Usuario
+from app.core.geofence import geofences
+from app.core.cache import response_cache
 from app.core.deps import (
     get_current_user, require_admin, require_supervisor, 
     PermissionChecker, log_action
@@ -33,7 +35,21 @@ async def list_estabelecimentos(
 ):
     """
     List estabelecimentos with pagination and filters
+    Cached per filter set until an estabelecimento is created, updated or deleted
     """
+    # Log action
+    await log_action(
+        request=request,
+        current_user=current_user,
+        action="LIST_ESTABELECIMENTOS",
+        details={"filters": {"search": search, "ativo": ativo}},
+        db=db
+    )
+    
+    cached = await response_cache.get("estabelecimentos", request)
+    if cached is not None:
+        return cached
+    
     # Build query
     query = select(Estabelecimento)
     
@@ -69,22 +85,13 @@ async def list_estabelecimentos(
     result = await db.execute(query)
     estabelecimentos = result.scalars().all()
     
-    # Log action
-    await log_action(
-        request=request,
-        current_user=current_user,
-        action="LIST_ESTABELECIMENTOS",
-        details={"filters": {"search": search, "ativo": ativo}},
-        db=db
-    )
-    
-    return EstabelecimentoList(
+    return await response_cache.store("estabelecimentos", request, EstabelecimentoList(
         estabelecimentos=estabelecimentos,
         total=total,
         page=page,
         size=size,
         pages=(total + size - 1) // size
-    )
+    ))
 
 
 @router.get("/{estabelecimento_id}", response_model=EstabelecimentoResponse)
@@ -149,6 +156,8 @@ async def create_estabelecimento(
     db.add(estabelecimento)
     await db.commit()
     await db.refresh(estabelecimento)
+    await geofences.refresh(db)
+    await response_cache.invalidate("estabelecimentos")
     
     # Log action
     await log_action(
@@ -211,6 +220,8 @@ async def update_estabelecimento(
     
     await db.commit()
     await db.refresh(estabelecimento)
+    await geofences.refresh(db)
+    await response_cache.invalidate("estabelecimentos")
     
     # Log action
     await log_action(
@@ -268,6 +279,8 @@ async def delete_estabelecimento(
     # Soft delete
     estabelecimento.ativo = False
     await db.commit()
+    await geofences.refresh(db)
+    await response_cache.invalidate("estabelecimentos")
     
     # Log action
     await log_action(
@@ -0,0 +1,353 @@
+"""
+Roster template (ModeloEscala) management endpoints
+"""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.exceptions import ValidationError
+from app.core.models import (
+    ModeloEscala, Estabelecimento, Setor, Usuario, StatusUsuarioEnum,
+    modelo_escala_usuarios
+)
+from app.core.deps import get_current_user, require_supervisor, log_action
+from app.schemas.modelo_escala import (
+    ModeloEscalaCreate, ModeloEscalaUpdate, ModeloEscalaResponse,
+    ModeloEscalaMembro, ModeloEscalaGerar, ModeloEscalaGerarResponse
+)
+from app.services.escala_modelos import (
+    resolve_ciclo, assign_posicoes, load_membros, gerar_escalas
+)
+
+router = APIRouter()
+
+
+def _modelo_response(modelo: ModeloEscala, membros: List[dict]) -> ModeloEscalaResponse:
+    response = ModeloEscalaResponse.from_orm(modelo)
+    response.membros = [ModeloEscalaMembro(**membro) for membro in membros]
+    return response
+
+
+async def _get_modelo(db: AsyncSession, modelo_id: int) -> ModeloEscala:
+    result = await db.execute(select(ModeloEscala).where(ModeloEscala.id == modelo_id))
+    modelo = result.scalar_one_or_none()
+
+    if not modelo:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Modelo de escala não encontrado"
+        )
+    return modelo
+
+
+async def _validate_references(
+    db: AsyncSession,
+    estabelecimento_id: int,
+    setor_id: int,
+    usuario_ids: List[int]
+):
+    """Check the establishment, its setor and the active members exist"""
+    result = await db.execute(
+        select(Estabelecimento.id).where(Estabelecimento.id == estabelecimento_id)
+    )
+    if not result.scalar_one_or_none():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Establishment not found"
+        )
+
+    result = await db.execute(
+        select(Setor.id).where(
+            Setor.id == setor_id,
+            Setor.estabelecimento_id == estabelecimento_id,
+            Setor.ativo == True
+        )
+    )
+    if not result.scalar_one_or_none():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Setor com ID {setor_id} não encontrado ou inativo neste estabelecimento."
+        )
+
+    if len(set(usuario_ids)) != len(usuario_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Usuário repetido no modelo"
+        )
+
+    result = await db.execute(
+        select(Usuario.id).where(
+            Usuario.id.in_(usuario_ids),
+            Usuario.status == StatusUsuarioEnum.ATIVO
+        )
+    )
+    missing = set(usuario_ids) - set(result.scalars())
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Usuários não encontrados ou inativos: {sorted(missing)}"
+        )
+
+
+def _ciclo(padrao, dias_trabalho, dias_folga):
+    try:
+        return resolve_ciclo(padrao, dias_trabalho, dias_folga)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message
+        )
+
+
+@router.get("/", response_model=List[ModeloEscalaResponse])
+async def list_modelos_escala(
+    estabelecimento_id: Optional[int] = Query(None),
+    ativo: Optional[bool] = Query(None),
+    current_user: Usuario = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    List roster templates
+    """
+    query = select(ModeloEscala).order_by(ModeloEscala.nome.asc())
+    if estabelecimento_id:
+        query = query.where(ModeloEscala.estabelecimento_id == estabelecimento_id)
+    if ativo is not None:
+        query = query.where(ModeloEscala.ativo == ativo)
+
+    result = await db.execute(query)
+    modelos = result.scalars().all()
+    if not modelos:
+        return []
+
+    membros = await load_membros(db, [modelo.id for modelo in modelos])
+    return [_modelo_response(modelo, membros[modelo.id]) for modelo in modelos]
+
+
+@router.get("/{modelo_id}", response_model=ModeloEscalaResponse)
+async def get_modelo_escala(
+    modelo_id: int,
+    current_user: Usuario = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get roster template by ID
+    """
+    modelo = await _get_modelo(db, modelo_id)
+    membros = await load_membros(db, [modelo_id])
+    return _modelo_response(modelo, membros[modelo_id])
+
+
+@router.post("/", response_model=ModeloEscalaResponse)
+async def create_modelo_escala(
+    modelo_data: ModeloEscalaCreate,
+    request: Request,
+    current_user: Usuario = Depends(require_supervisor()),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create roster template
+    Only supervisors and admins can create templates
+    """
+    dias_trabalho, dias_folga = _ciclo(
+        modelo_data.padrao, modelo_data.dias_trabalho, modelo_data.dias_folga
+    )
+    await _validate_references(
+        db,
+        modelo_data.estabelecimento_id,
+        modelo_data.setor_id,
+        [membro.usuario_id for membro in modelo_data.membros]
+    )
+
+    novo_modelo = ModeloEscala(
+        **modelo_data.dict(exclude={"membros", "dias_trabalho", "dias_folga"}),
+        dias_trabalho=dias_trabalho,
+        dias_folga=dias_folga
+    )
+    db.add(novo_modelo)
+    await db.flush()
+
+    membros = assign_posicoes(modelo_data.membros, dias_trabalho + dias_folga)
+    await db.execute(
+        modelo_escala_usuarios.insert(),
+        [{"modelo_id": novo_modelo.id, **membro} for membro in membros]
+    )
+    await db.commit()
+    await db.refresh(novo_modelo)
+
+    # Log action
+    await log_action(
+        request=request,
+        current_user=current_user,
+        action="CREATE_MODELO_ESCALA",
+        resource="ModeloEscala",
+        resource_id=novo_modelo.id,
+        details=modelo_data.dict(),
+        db=db
+    )
+
+    return _modelo_response(novo_modelo, membros)
+
+
+@router.put("/{modelo_id}", response_model=ModeloEscalaResponse)
+async def update_modelo_escala(
+    modelo_id: int,
+    modelo_data: ModeloEscalaUpdate,
+    request: Request,
+    current_user: Usuario = Depends(require_supervisor()),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Update roster template
+    Escalas already generated from it are not changed
+    """
+    modelo = await _get_modelo(db, modelo_id)
+    update_data = modelo_data.dict(exclude_unset=True)
+
+    dias_trabalho, dias_folga = _ciclo(
+        update_data.get("padrao", modelo.padrao),
+        update_data.get("dias_trabalho", modelo.dias_trabalho),
+        update_data.get("dias_folga", modelo.dias_folga)
+    )
+
+    membros = (await load_membros(db, [modelo_id]))[modelo_id]
+    if modelo_data.membros is not None:
+        membros = assign_posicoes(modelo_data.membros, dias_trabalho + dias_folga)
+
+    await _validate_references(
+        db,
+        modelo.estabelecimento_id,
+        update_data.get("setor_id", modelo.setor_id),
+        [membro["usuario_id"] for membro in membros]
+    )
+
+    for field, value in update_data.items():
+        if field != "membros" and hasattr(modelo, field):
+            setattr(modelo, field, value)
+    modelo.dias_trabalho = dias_trabalho
+    modelo.dias_folga = dias_folga
+
+    if modelo_data.membros is not None:
+        await db.execute(
+            delete(modelo_escala_usuarios).where(modelo_escala_usuarios.c.modelo_id == modelo_id)
+        )
+        await db.execute(
+            modelo_escala_usuarios.insert(),
+            [{"modelo_id": modelo_id, **membro} for membro in membros]
+        )
+
+    await db.commit()
+    await db.refresh(modelo)
+
+    # Log action
+    await log_action(
+        request=request,
+        current_user=current_user,
+        action="UPDATE_MODELO_ESCALA",
+        resource="ModeloEscala",
+        resource_id=modelo_id,
+        details=update_data,
+        db=db
+    )
+
+    return _modelo_response(modelo, membros)
+
+
+@router.delete("/{modelo_id}")
+async def delete_modelo_escala(
+    modelo_id: int,
+    request: Request,
+    current_user: Usuario = Depends(require_supervisor()),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Delete roster template
+    Escalas already generated from it are kept
+    """
+    modelo = await _get_modelo(db, modelo_id)
+
+    await db.delete(modelo)
+    await db.commit()
+
+    # Log action
+    await log_action(
+        request=request,
+        current_user=current_user,
+        action="DELETE_MODELO_ESCALA",
+        resource="ModeloEscala",
+        resource_id=modelo_id,
+        db=db
+    )
+
+    return {"message": "Modelo de escala excluído com sucesso"}
+
+
+@router.post("/{modelo_id}/gerar", response_model=ModeloEscalaGerarResponse)
+async def gerar_escalas_modelo(
+    modelo_id: int,
+    periodo: ModeloEscalaGerar,
+    request: Request,
+    current_user: Usuario = Depends(require_supervisor()),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Expand a roster template into escalas for a date range
+    All escalas are created in one transaction, or none if any shift conflicts
+    """
+    modelo = await _get_modelo(db, modelo_id)
+
+    if not modelo.ativo:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Modelo de escala inativo"
+        )
+
+    if (periodo.data_fim - periodo.data_inicio).days + 1 > settings.ROSTER_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Período não pode exceder {settings.ROSTER_MAX_DAYS} dias"
+        )
+
+    membros = (await load_membros(db, [modelo_id]))[modelo_id]
+
+    try:
+        escalas_criadas, atribuicoes_criadas = await gerar_escalas(
+            db, modelo, membros, periodo.data_inicio, periodo.data_fim
+        )
+    except ValidationError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "message": e.message,
+                "errors": e.details["errors"]
+            }
+        )
+
+    await db.commit()
+
+    # Log action
+    await log_action(
+        request=request,
+        current_user=current_user,
+        action="GERAR_ESCALAS_MODELO",
+        resource="ModeloEscala",
+        resource_id=modelo_id,
+        details={
+            "data_inicio": periodo.data_inicio.isoformat(),
+            "data_fim": periodo.data_fim.isoformat(),
+            "escalas_criadas": escalas_criadas
+        },
+        db=db
+    )
+
+    return ModeloEscalaGerarResponse(
+        modelo_id=modelo_id,
+        data_inicio=periodo.data_inicio,
+        data_fim=periodo.data_fim,
+        escalas_criadas=escalas_criadas,
+        atribuicoes_criadas=atribuicoes_criadas
+    )
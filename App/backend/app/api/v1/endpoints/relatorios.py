@@ -1,33 +1,61 @@
 """
 Report generation endpoints
 """
+import calendar
 from typing import List, Optional
 from datetime import datetime, date, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Query, Response
+from fastapi.responses import FileResponse, JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func, between, text
+from sqlalchemy import select, and_, func, between
 from sqlalchemy.orm import selectinload
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, get_read_db
 from app.core.models import (
     Usuario, Escala, Checkin, Log, Documento,
     StatusEscalaEnum, StatusCheckinEnum, PerfilEnum, StatusUsuarioEnum, Estabelecimento
 )
 from app.core.deps import require_supervisor, get_current_user, log_action
+from app.core.rollups import (
+    escalas_por_status, escalas_por_dia, checkins_por_status, checkins_por_dia,
+    desempenho_query
+)
 from app.schemas.relatorio import (
     RelatorioCheckinResponse, RelatorioEscalaResponse, RelatorioHorasResponse,
-    RelatorioFilter, DashboardStats, RelatorioAuditoria
+    RelatorioPlantaoHoras, RelatorioFilter, DashboardStats, RelatorioAuditoria
+)
+from app.utils.export import stream_export
+from app.services.report_loader import (
+    checkin_conditions, checkin_export_query, load_checkin_report, load_escala_report, load_horas_report,
+    horas_conditions, plantoes_query, plantao_detalhe
+)
+from app.services.report_service import (
+    submit_report_pdf, report_job_status, report_artifact_path, is_valid_job_id
 )
 
 router = APIRouter()
 
 
+def _pdf_job_response(tipo: str, filters: dict) -> JSONResponse:
+    """Queue (or reuse) a PDF rendering job and point the client at it"""
+    job_id = submit_report_pdf(tipo, filters)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            **report_job_status(job_id),
+            "status_url": f"/api/v1/relatorios/pdf/{job_id}",
+            "download_url": f"/api/v1/relatorios/pdf/{job_id}/download"
+        }
+    )
+
+
 @router.get("/dashboard", response_model=DashboardStats)
 async def get_dashboard_stats(
     request: Request,
     periodo_dias: int = Query(30, ge=1, le=365),
     current_user: Usuario = Depends(require_supervisor()),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get dashboard statistics overview
@@ -46,35 +74,9 @@ async def get_dashboard_stats(
     users_result = await db.execute(users_query)
     users_stats = users_result.first()
     
-    # Get schedule stats for period
-    schedules_query = select(
-        func.count(Escala.id).label('total_escalas'),
-        func.count(func.nullif(Escala.status == StatusEscalaEnum.CONFIRMADO, False)).label('confirmadas'),
-        func.count(func.nullif(Escala.status == StatusEscalaEnum.PENDENTE, False)).label('pendentes'),
-        func.count(func.nullif(Escala.status == StatusEscalaEnum.AUSENTE, False)).label('ausentes')
-    ).where(
-        and_(
-            Escala.data_inicio >= start_date.date(),
-            Escala.data_inicio <= end_date.date()
-        )
-    )
-    schedules_result = await db.execute(schedules_query)
-    schedules_stats = schedules_result.first()
-    
-    # Get check-in stats for period
-    checkins_query = select(
-        func.count(Checkin.id).label('total_checkins'),
-        func.count(func.nullif(Checkin.status == StatusCheckinEnum.REALIZADO, False)).label('realizados'),
-        func.count(func.nullif(Checkin.status == StatusCheckinEnum.FORA_DE_LOCAL, False)).label('fora_local'),
-        func.count(func.nullif(Checkin.status == StatusCheckinEnum.AUSENTE, False)).label('ausentes')
-    ).where(
-        and_(
-            Checkin.data_hora >= start_date,
-            Checkin.data_hora <= end_date
-        )
-    )
-    checkins_result = await db.execute(checkins_query)
-    checkins_stats = checkins_result.first()
+    # Get schedule and check-in stats for period from daily rollups
+    escalas_status = await escalas_por_status(db, start_date.date(), end_date.date())
+    checkins_status = await checkins_por_status(db, start_date.date(), end_date.date())
     
     # Get document stats
     documents_query = select(
@@ -86,8 +88,8 @@ async def get_dashboard_stats(
     documents_stats = documents_result.first()
     
     # Calculate attendance rate
-    total_schedules = schedules_stats.total_escalas or 0
-    confirmed_schedules = schedules_stats.confirmadas or 0
+    total_schedules = sum(escalas_status.values())
+    confirmed_schedules = escalas_status.get(StatusEscalaEnum.CONFIRMADO, 0)
     attendance_rate = (confirmed_schedules / total_schedules * 100) if total_schedules > 0 else 0
     
     # Log action
@@ -108,12 +110,12 @@ async def get_dashboard_stats(
         total_supervisores=users_stats.supervisores or 0,
         total_escalas=total_schedules,
         escalas_confirmadas=confirmed_schedules,
-        escalas_pendentes=schedules_stats.pendentes or 0,
-        escalas_ausentes=schedules_stats.ausentes or 0,
-        total_checkins=checkins_stats.total_checkins or 0,
-        checkins_realizados=checkins_stats.realizados or 0,
-        checkins_fora_local=checkins_stats.fora_local or 0,
-        checkins_ausentes=checkins_stats.ausentes or 0,
+        escalas_pendentes=escalas_status.get(StatusEscalaEnum.PENDENTE, 0),
+        escalas_ausentes=escalas_status.get(StatusEscalaEnum.AUSENTE, 0),
+        total_checkins=sum(checkins_status.values()),
+        checkins_realizados=checkins_status.get(StatusCheckinEnum.REALIZADO, 0),
+        checkins_fora_local=checkins_status.get(StatusCheckinEnum.FORA_DE_LOCAL, 0),
+        checkins_ausentes=checkins_status.get(StatusCheckinEnum.AUSENTE, 0),
         taxa_presenca=round(attendance_rate, 2),
         total_documentos=documents_stats.total_documentos or 0,
         documentos_processados=documents_stats.processados or 0,
@@ -125,19 +127,16 @@ async def get_dashboard_stats(
 async def get_dashboard_stats_simple(
     request: Request,
     current_user: Usuario = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get simplified dashboard statistics for the main dashboard
     """
     today = date.today()
     
-    # Escalas de hoje
-    escalas_hoje_query = select(func.count(Escala.id)).where(
-        Escala.data_inicio == today
-    )
-    escalas_hoje_result = await db.execute(escalas_hoje_query)
-    escalas_hoje = escalas_hoje_result.scalar() or 0
+    # Escalas de hoje, por status
+    escalas_hoje_status = await escalas_por_status(db, today, today)
+    escalas_hoje = sum(escalas_hoje_status.values())
     
     # Check-ins pendentes (escalas de hoje sem check-in)
     checkins_pendentes_query = select(func.count(Escala.id)).where(
@@ -180,14 +179,7 @@ async def get_dashboard_stats_simple(
         })
     
     # Alerta para escalas não confirmadas
-    escalas_nao_confirmadas_query = select(func.count(Escala.id)).where(
-        and_(
-            Escala.data_inicio == today,
-            Escala.status == StatusEscalaEnum.PENDENTE
-        )
-    )
-    escalas_nao_confirmadas_result = await db.execute(escalas_nao_confirmadas_query)
-    escalas_nao_confirmadas = escalas_nao_confirmadas_result.scalar() or 0
+    escalas_nao_confirmadas = escalas_hoje_status.get(StatusEscalaEnum.PENDENTE, 0)
     
     if escalas_nao_confirmadas > 0:
         alertas.append({
@@ -209,7 +201,7 @@ async def get_dashboard_stats_simple(
 async def get_checkins_semana(
     request: Request,
     current_user: Usuario = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get check-ins data for the last 7 days for chart
@@ -217,25 +209,11 @@ async def get_checkins_semana(
     end_date = datetime.now()
     start_date = end_date - timedelta(days=7)
     
-    # Query para obter check-ins por dia da semana
-    checkins_query = select(
-        func.date(Checkin.data_hora).label('data'),
-        func.count(Checkin.id).label('total')
-    ).where(
-        and_(
-            Checkin.data_hora >= start_date,
-            Checkin.data_hora <= end_date,
-            Checkin.status == StatusCheckinEnum.REALIZADO
-        )
-    ).group_by(
-        func.date(Checkin.data_hora)
-    ).order_by(
-        func.date(Checkin.data_hora)
+    # Check-ins realizados por dia
+    checkins_data = await checkins_por_dia(
+        db, start_date.date(), end_date.date(), StatusCheckinEnum.REALIZADO
     )
     
-    checkins_result = await db.execute(checkins_query)
-    checkins_data = checkins_result.fetchall()
-    
     # Preparar dados para o gráfico
     labels = []
     data = []
@@ -244,17 +222,7 @@ async def get_checkins_semana(
         current_date = start_date + timedelta(days=i)
         date_str = current_date.strftime('%a')  # Seg, Ter, Qua, etc.
         labels.append(date_str)
-        
-        # Encontrar dados para esta data
-        found = False
-        for row in checkins_data:
-            if row.data == current_date.date():
-                data.append(row.total)
-                found = True
-                break
-        
-        if not found:
-            data.append(0)
+        data.append(checkins_data.get(current_date.date(), 0))
     
     return {
         "labels": labels,
@@ -266,33 +234,31 @@ async def get_checkins_semana(
 async def get_escalas_mes(
     request: Request,
     current_user: Usuario = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get escalas data for the current month for chart
     """
     today = date.today()
     start_of_month = date(today.year, today.month, 1)
+    end_of_month = date(today.year, today.month, calendar.monthrange(today.year, today.month)[1])
     
-    # Calcular semanas do mês
+    # Escalas confirmadas por dia do mês
+    escalas_data = await escalas_por_dia(
+        db, start_of_month, end_of_month, StatusEscalaEnum.CONFIRMADO
+    )
+    
+    # Agrupar em semanas do mês
     weeks = []
     current_date = start_of_month
     week_num = 1
     
-    while current_date.month == today.month:
-        week_start = current_date
-        week_end = min(current_date + timedelta(days=6), date(today.year, today.month + 1, 1) - timedelta(days=1))
-        
-        # Contar escalas confirmadas nesta semana
-        escalas_query = select(func.count(Escala.id)).where(
-            and_(
-                Escala.data_inicio >= week_start,
-                Escala.data_inicio <= week_end,
-                Escala.status == StatusEscalaEnum.CONFIRMADO
-            )
+    while current_date <= end_of_month:
+        week_end = min(current_date + timedelta(days=6), end_of_month)
+        escalas_count = sum(
+            total for dia, total in escalas_data.items()
+            if current_date <= dia <= week_end
         )
-        escalas_result = await db.execute(escalas_query)
-        escalas_count = escalas_result.scalar() or 0
         
         weeks.append({
             "semana": f"Sem {week_num}",
@@ -312,7 +278,7 @@ async def get_escalas_mes(
 async def get_usuarios_perfil(
     request: Request,
     current_user: Usuario = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get users count by profile for chart
@@ -360,12 +326,14 @@ async def get_checkin_report(
     usuario_id: Optional[int] = Query(None),
     status: Optional[StatusCheckinEnum] = Query(None),
     export_pdf: bool = Query(False),
+    export_format: Optional[str] = Query(None, alias="format", pattern="^(csv|ndjson)$"),
     current_user: Usuario = Depends(require_supervisor()),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Generate check-in report with filters
     Only supervisors and admins can generate reports
+    format=csv|ndjson streams the full range instead of returning a JSON array
     """
     # Validate date range
     if data_fim < data_inicio:
@@ -374,50 +342,57 @@ async def get_checkin_report(
             detail="End date must be after start date"
         )
     
-    # Limit to 90 days
-    if (data_fim - data_inicio).days > 90:
+    # Limit to 90 days (streamed exports up to EXPORT_MAX_RANGE_DAYS)
+    max_days = settings.EXPORT_MAX_RANGE_DAYS if export_format else 90
+    if (data_fim - data_inicio).days > max_days:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Date range cannot exceed 90 days"
+            detail=f"Date range cannot exceed {max_days} days"
         )
     
-    # Build query
-    conditions = [
-        Checkin.data_hora >= datetime.combine(data_inicio, datetime.min.time()),
-        Checkin.data_hora <= datetime.combine(data_fim, datetime.max.time())
-    ]
-    
-    if usuario_id:
-        conditions.append(Checkin.usuario_id == usuario_id)
-    
-    if status:
-        conditions.append(Checkin.status == status)
-    
-    query = select(Checkin).options(
-        selectinload(Checkin.usuario),
-        selectinload(Checkin.escala)
-    ).where(and_(*conditions)).order_by(Checkin.data_hora.desc())
+    if export_format:
+        await log_action(
+            request=request,
+            current_user=current_user,
+            action="EXPORT_CHECKIN_REPORT",
+            details={
+                "data_inicio": str(data_inicio),
+                "data_fim": str(data_fim),
+                "usuario_id": usuario_id,
+                "format": export_format
+            },
+            db=db
+        )
+        
+        return stream_export(
+            checkin_export_query(checkin_conditions(data_inicio, data_fim, usuario_id, status)),
+            columns=list(RelatorioCheckinResponse.model_fields),
+            serialize=lambda row: row._asdict(),
+            export_format=export_format,
+            filename=f"checkins_{data_inicio}_{data_fim}"
+        )
     
-    result = await db.execute(query)
-    checkins = result.scalars().all()
+    if export_pdf:
+        await log_action(
+            request=request,
+            current_user=current_user,
+            action="GENERATE_CHECKIN_REPORT",
+            details={
+                "data_inicio": str(data_inicio),
+                "data_fim": str(data_fim),
+                "usuario_id": usuario_id,
+                "export_pdf": True
+            },
+            db=db
+        )
+        return _pdf_job_response("checkins", {
+            "data_inicio": data_inicio,
+            "data_fim": data_fim,
+            "usuario_id": usuario_id,
+            "status": status
+        })
     
-    # Convert to response format
-    report_data = []
-    for checkin in checkins:
-        report_data.append(RelatorioCheckinResponse(
-            id=checkin.id,
-            usuario_nome=checkin.usuario.nome,
-            usuario_cpf=checkin.usuario.cpf,
-            data_plantao=checkin.escala.data_inicio,
-            hora_inicio_plantao=checkin.escala.hora_inicio,
-            hora_fim_plantao=checkin.escala.hora_fim,
-            data_hora_checkin=checkin.data_hora,
-            gps_latitude=checkin.gps_lat,
-            gps_longitude=checkin.gps_long,
-            endereco=checkin.endereco,
-            status=checkin.status,
-            observacoes=checkin.observacoes
-        ))
+    report_data = await load_checkin_report(db, data_inicio, data_fim, usuario_id, status)
     
     # Log action
     await log_action(
@@ -433,12 +408,6 @@ async def get_checkin_report(
         db=db
     )
     
-    if export_pdf:
-        # TODO: Generate PDF report
-        # pdf_content = generate_checkin_pdf_report(report_data, data_inicio, data_fim)
-        # return Response(content=pdf_content, media_type="application/pdf")
-        pass
-    
     return report_data
 
 
@@ -451,7 +420,7 @@ async def get_escala_report(
     status: Optional[StatusEscalaEnum] = Query(None),
     export_pdf: bool = Query(False),
     current_user: Usuario = Depends(require_supervisor()),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Generate schedule report with filters
@@ -464,45 +433,27 @@ async def get_escala_report(
             detail="End date must be after start date"
         )
     
-    # Build query
-    conditions = [
-        Escala.data_inicio >= data_inicio,
-        Escala.data_inicio <= data_fim
-    ]
-    
-    if usuario_id:
-        conditions.append(Escala.usuario_id == usuario_id)
-    
-    if status:
-        conditions.append(Escala.status == status)
-    
-    query = select(Escala).options(
-        selectinload(Escala.usuario),
-        selectinload(Escala.checkins)
-    ).where(and_(*conditions)).order_by(Escala.data_inicio.desc(), Escala.hora_inicio.asc())
-    
-    result = await db.execute(query)
-    escalas = result.scalars().all()
+    if export_pdf:
+        await log_action(
+            request=request,
+            current_user=current_user,
+            action="GENERATE_ESCALA_REPORT",
+            details={
+                "data_inicio": str(data_inicio),
+                "data_fim": str(data_fim),
+                "usuario_id": usuario_id,
+                "export_pdf": True
+            },
+            db=db
+        )
+        return _pdf_job_response("escalas", {
+            "data_inicio": data_inicio,
+            "data_fim": data_fim,
+            "usuario_id": usuario_id,
+            "status": status
+        })
     
-    # Convert to response format
-    report_data = []
-    for escala in escalas:
-        checkin = escala.checkins[0] if escala.checkins else None
-        
-        report_data.append(RelatorioEscalaResponse(
-            id=escala.id,
-            usuario_nome=escala.usuario.nome,
-            usuario_cpf=escala.usuario.cpf,
-            data=escala.data_inicio,
-            hora_inicio=escala.hora_inicio,
-            hora_fim=escala.hora_fim,
-            status=escala.status,
-            observacoes_escala=escala.observacoes,
-            tem_checkin=checkin is not None,
-            data_hora_checkin=checkin.data_hora if checkin else None,
-            status_checkin=checkin.status if checkin else None,
-            observacoes_checkin=checkin.observacoes if checkin else None
-        ))
+    report_data = await load_escala_report(db, data_inicio, data_fim, usuario_id, status)
     
     # Log action
     await log_action(
@@ -518,10 +469,6 @@ async def get_escala_report(
         db=db
     )
     
-    if export_pdf:
-        # TODO: Generate PDF report
-        pass
-    
     return report_data
 
 
@@ -531,13 +478,16 @@ async def get_horas_report(
     data_inicio: date = Query(...),
     data_fim: date = Query(...),
     usuario_id: Optional[int] = Query(None),
+    detalhes: bool = Query(False),
     export_pdf: bool = Query(False),
     current_user: Usuario = Depends(require_supervisor()),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Generate worked hours report
     Only supervisors and admins can generate reports
+    Totals are aggregated in SQL; detalhes=true also lists every shift
+    (see /horas-trabalhadas/plantoes for a paginated or streamed listing)
     """
     # Validate date range
     if data_fim < data_inicio:
@@ -546,78 +496,26 @@ async def get_horas_report(
             detail="End date must be after start date"
         )
     
-    # Build query to get schedules with check-ins
-    conditions = [
-        Escala.data_inicio >= data_inicio,
-        Escala.data_inicio <= data_fim,
-        Escala.status == StatusEscalaEnum.CONFIRMADO  # Only confirmed schedules
-    ]
-    
-    if usuario_id:
-        conditions.append(Escala.usuario_id == usuario_id)
-    
-    query = select(Escala).options(
-        selectinload(Escala.usuario),
-        selectinload(Escala.checkins)
-    ).where(and_(*conditions)).order_by(Escala.usuario_id, Escala.data_inicio)
-    
-    result = await db.execute(query)
-    escalas = result.scalars().all()
-    
-    # Group by user and calculate hours
-    user_hours = {}
-    for escala in escalas:
-        if not escala.checkins:  # Skip if no check-in
-            continue
-            
-        user_id = escala.usuario_id
-        if user_id not in user_hours:
-            user_hours[user_id] = {
-                'usuario': escala.usuario,
-                'total_horas': 0,
-                'total_plantoes': 0,
-                'detalhes': []
-            }
-        
-        # Calculate hours for this shift
-        hora_inicio_dt = datetime.combine(escala.data_inicio, escala.hora_inicio)
-        hora_fim_dt = datetime.combine(escala.data_inicio, escala.hora_fim)
-        
-        # Handle shifts that cross midnight
-        if escala.hora_fim <= escala.hora_inicio:
-            hora_fim_dt += timedelta(days=1)
-        
-        horas_plantao = (hora_fim_dt - hora_inicio_dt).total_seconds() / 3600
-        
-        user_hours[user_id]['total_horas'] += horas_plantao
-        user_hours[user_id]['total_plantoes'] += 1
-        user_hours[user_id]['detalhes'].append({
-            'data': escala.data_inicio,
-            'hora_inicio': escala.hora_inicio,
-            'hora_fim': escala.hora_fim,
-            'horas': horas_plantao,
-            'checkin_realizado': len(escala.checkins) > 0
+    if export_pdf:
+        await log_action(
+            request=request,
+            current_user=current_user,
+            action="GENERATE_HORAS_REPORT",
+            details={
+                "data_inicio": str(data_inicio),
+                "data_fim": str(data_fim),
+                "usuario_id": usuario_id,
+                "export_pdf": True
+            },
+            db=db
+        )
+        return _pdf_job_response("horas", {
+            "periodo_inicio": data_inicio,
+            "periodo_fim": data_fim,
+            "usuario_id": usuario_id
         })
     
-    # Convert to response format
-    report_data = []
-    for user_data in user_hours.values():
-        report_data.append(RelatorioHorasResponse(
-            usuario_id=user_data['usuario'].id,
-            usuario_nome=user_data['usuario'].nome,
-            usuario_cpf=user_data['usuario'].cpf,
-            periodo_inicio=data_inicio,
-            periodo_fim=data_fim,
-            total_horas=round(user_data['total_horas'], 2),
-            total_plantoes=user_data['total_plantoes'],
-            media_horas_por_plantao=round(
-                user_data['total_horas'] / user_data['total_plantoes'], 2
-            ) if user_data['total_plantoes'] > 0 else 0,
-            detalhes_plantoes=user_data['detalhes']
-        ))
-    
-    # Sort by user name
-    report_data.sort(key=lambda x: x.usuario_nome)
+    report_data = await load_horas_report(db, data_inicio, data_fim, usuario_id, detalhes)
     
     # Log action
     await log_action(
@@ -633,13 +531,94 @@ async def get_horas_report(
         db=db
     )
     
-    if export_pdf:
-        # TODO: Generate PDF report
-        pass
-    
     return report_data
 
 
+@router.get("/horas-trabalhadas/plantoes", response_model=List[RelatorioPlantaoHoras])
+async def get_horas_plantoes(
+    request: Request,
+    data_inicio: date = Query(...),
+    data_fim: date = Query(...),
+    usuario_id: Optional[int] = Query(None),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(100, ge=1, le=500),
+    export_format: Optional[str] = Query(None, alias="format", pattern="^(csv|ndjson)$"),
+    current_user: Usuario = Depends(require_supervisor()),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Per-shift detail of the worked hours report
+    Only supervisors and admins can generate reports
+    format=csv|ndjson streams every shift, ignoring pagination
+    """
+    # Validate date range
+    if data_fim < data_inicio:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End date must be after start date"
+        )
+    
+    query = plantoes_query(horas_conditions(data_inicio, data_fim, usuario_id))
+    
+    if export_format:
+        if (data_fim - data_inicio).days > settings.EXPORT_MAX_RANGE_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Date range cannot exceed {settings.EXPORT_MAX_RANGE_DAYS} days"
+            )
+        
+        await log_action(
+            request=request,
+            current_user=current_user,
+            action="EXPORT_HORAS_PLANTOES",
+            details={
+                "data_inicio": str(data_inicio),
+                "data_fim": str(data_fim),
+                "usuario_id": usuario_id,
+                "format": export_format
+            },
+            db=db
+        )
+        
+        return stream_export(
+            query,
+            columns=list(RelatorioPlantaoHoras.model_fields),
+            serialize=plantao_detalhe,
+            export_format=export_format,
+            filename=f"horas_plantoes_{data_inicio}_{data_fim}"
+        )
+    
+    result = await db.execute(query.offset((page - 1) * per_page).limit(per_page))
+    return [RelatorioPlantaoHoras(**plantao_detalhe(row)) for row in result]
+
+
+def _audit_conditions(
+    data_inicio: datetime,
+    data_fim: datetime,
+    usuario_id: Optional[int] = None,
+    acao: Optional[str] = None,
+    descricao: Optional[str] = None
+) -> list:
+    conditions = [
+        Log.created_at >= data_inicio,
+        Log.created_at <= data_fim
+    ]
+    if usuario_id:
+        conditions.append(Log.usuario_id == usuario_id)
+    if acao:
+        conditions.append(Log.acao.ilike(f"%{acao}%"))
+    if descricao:
+        conditions.append(Log.descricao.ilike(f"%{descricao}%"))
+    return conditions
+
+
+def _audit_query(conditions: list):
+    """Audit entries with their user, newest first"""
+    return select(Log).options(selectinload(Log.usuario)).where(
+        and_(*conditions)
+    ).order_by(Log.created_at.desc())
+
+
 @router.get("/auditoria", response_model=List[RelatorioAuditoria])
 async def get_audit_report(
     request: Request,
@@ -650,12 +629,14 @@ async def get_audit_report(
     descricao: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     per_page: int = Query(50, ge=1, le=200),
+    export_format: Optional[str] = Query(None, alias="format", pattern="^(csv|ndjson)$"),
     current_user: Usuario = Depends(require_supervisor()),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Generate audit log report
     Only supervisors and admins can view audit logs
+    format=csv|ndjson streams every matching entry, ignoring pagination
     """
     # Validate date range
     if data_fim < data_inicio:
@@ -664,27 +645,51 @@ async def get_audit_report(
             detail="End date must be after start date"
         )
     
-    # Limit to 30 days for performance
-    if (data_fim - data_inicio).days > 30:
+    # Limit to 30 days for performance (streamed exports up to EXPORT_MAX_RANGE_DAYS)
+    max_days = settings.EXPORT_MAX_RANGE_DAYS if export_format else 30
+    if (data_fim - data_inicio).days > max_days:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Date range cannot exceed 30 days for audit reports"
+            detail=f"Date range cannot exceed {max_days} days for audit reports"
         )
     
-    # Build query
-    conditions = [
-        Log.created_at >= data_inicio,
-        Log.created_at <= data_fim
-    ]
-    
-    if usuario_id:
-        conditions.append(Log.usuario_id == usuario_id)
-    
-    if acao:
-        conditions.append(Log.acao.ilike(f"%{acao}%"))
-    
-    if descricao:
-        conditions.append(Log.descricao.ilike(f"%{descricao}%"))
+    conditions = _audit_conditions(data_inicio, data_fim, usuario_id, acao, descricao)
+    
+    if export_format:
+        await log_action(
+            request=request,
+            current_user=current_user,
+            action="EXPORT_AUDIT_REPORT",
+            details={
+                "data_inicio": str(data_inicio),
+                "data_fim": str(data_fim),
+                "usuario_id": usuario_id,
+                "format": export_format
+            },
+            db=db
+        )
+        
+        export_query = select(
+            Log.id,
+            func.coalesce(Usuario.nome, "Sistema").label("usuario_nome"),
+            Usuario.email.label("usuario_email"),
+            Log.acao,
+            Log.descricao,
+            Log.created_at.label("data_hora"),
+            Log.ip_address,
+            Log.user_agent,
+            Log.dados_extras
+        ).outerjoin(
+            Usuario, Usuario.id == Log.usuario_id
+        ).where(and_(*conditions)).order_by(Log.created_at.desc())
+        
+        return stream_export(
+            export_query,
+            columns=list(RelatorioAuditoria.model_fields),
+            serialize=lambda row: row._asdict(),
+            export_format=export_format,
+            filename=f"auditoria_{data_inicio.date()}_{data_fim.date()}"
+        )
     
     # Count total
     count_query = select(func.count(Log.id)).where(and_(*conditions))
@@ -693,9 +698,7 @@ async def get_audit_report(
     
     # Apply pagination
     offset = (page - 1) * per_page
-    query = select(Log).options(selectinload(Log.usuario)).where(
-        and_(*conditions)
-    ).offset(offset).limit(per_page).order_by(Log.created_at.desc())
+    query = _audit_query(conditions).offset(offset).limit(per_page)
     
     result = await db.execute(query)
     logs = result.scalars().all()
@@ -732,61 +735,109 @@ async def get_audit_report(
     return report_data
 
 
+def _metricas_desempenho(totals) -> dict:
+    """Performance counters and attendance rate from a mapping of fact totals"""
+    escalas = int(totals["escalas"] or 0)
+    realizados = int(totals["checkins_realizados"] or 0)
+    return {
+        "total_escalas": escalas,
+        "total_checkins": int(totals["checkins"] or 0),
+        "checkins_realizados": realizados,
+        "checkins_fora_local": int(totals["checkins_fora_local"] or 0),
+        "total_faltas": int(totals["faltas"] or 0),
+        "taxa_presenca": round(realizados * 100.0 / escalas, 2) if escalas else 0
+    }
+
+
 @router.get("/performance")
 async def get_performance_report(
     request: Request,
     data_inicio: date = Query(...),
     data_fim: date = Query(...),
+    estabelecimento_id: Optional[int] = Query(None),
+    por_estabelecimento: bool = Query(False),
     current_user: Usuario = Depends(require_supervisor()),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Generate performance metrics report
     Only supervisors and admins can view performance metrics
+    Partners are ranked by attendance rate; por_estabelecimento=true adds
+    the per-establishment breakdown from the same scan
     """
-    # User performance metrics
-    performance_query = text("""
-        SELECT 
-            u.id,
-            u.nome,
-            u.cpf,
-            COUNT(DISTINCT e.id) as total_escalas,
-            COUNT(DISTINCT c.id) as total_checkins,
-            COUNT(DISTINCT CASE WHEN c.status = 'REALIZADO' THEN c.id END) as checkins_ok,
-            COUNT(DISTINCT CASE WHEN c.status = 'FORA_DE_LOCAL' THEN c.id END) as checkins_fora_local,
-            COUNT(DISTINCT CASE WHEN e.status = 'AUSENTE' THEN e.id END) as faltas,
-            ROUND(
-                COUNT(DISTINCT CASE WHEN c.status = 'REALIZADO' THEN c.id END) * 100.0 / 
-                NULLIF(COUNT(DISTINCT e.id), 0), 2
-            ) as taxa_presenca
-        FROM usuarios u
-        LEFT JOIN escalas e ON u.id = e.usuario_id 
-            AND e.data BETWEEN :data_inicio AND :data_fim
-        LEFT JOIN checkins c ON e.id = c.escala_id
-        WHERE u.perfil = 'SOCIO' AND u.status = 'Ativo'
-        GROUP BY u.id, u.nome, u.cpf
-        HAVING COUNT(DISTINCT e.id) > 0
-        ORDER BY taxa_presenca DESC, u.nome
-    """)
-    
-    result = await db.execute(performance_query, {
-        "data_inicio": data_inicio,
-        "data_fim": data_fim
-    })
+    # Validate date range
+    if data_fim < data_inicio:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End date must be after start date"
+        )
     
-    performance_data = []
+    # Per user and establishment totals from the daily performance facts
+    facts = desempenho_query(data_inicio, data_fim).subquery()
+    query = select(
+        facts,
+        Usuario.nome,
+        Usuario.cpf,
+        Estabelecimento.nome.label("estabelecimento_nome")
+    ).join(
+        Usuario, Usuario.id == facts.c.usuario_id
+    ).join(
+        Estabelecimento, Estabelecimento.id == facts.c.estabelecimento_id
+    ).where(
+        Usuario.perfil == PerfilEnum.SOCIO,
+        Usuario.status == StatusUsuarioEnum.ATIVO
+    )
+    
+    if estabelecimento_id:
+        query = query.where(facts.c.estabelecimento_id == estabelecimento_id)
+    
+    result = await db.execute(query)
+    
+    # Fold establishment rows into per-user totals
+    usuarios = {}
     for row in result:
-        performance_data.append({
-            "usuario_id": row.id,
+        totals = usuarios.setdefault(row.usuario_id, {
+            "usuario_id": row.usuario_id,
             "nome": row.nome,
             "cpf": row.cpf,
-            "total_escalas": row.total_escalas,
-            "total_checkins": row.total_checkins,
-            "checkins_realizados": row.checkins_ok,
-            "checkins_fora_local": row.checkins_fora_local,
-            "total_faltas": row.faltas,
-            "taxa_presenca": float(row.taxa_presenca or 0)
+            "escalas": 0,
+            "faltas": 0,
+            "checkins": 0,
+            "checkins_realizados": 0,
+            "checkins_fora_local": 0,
+            "estabelecimentos": []
         })
+        for field in ("escalas", "faltas", "checkins", "checkins_realizados", "checkins_fora_local"):
+            totals[field] += int(getattr(row, field) or 0)
+        
+        if por_estabelecimento:
+            totals["estabelecimentos"].append({
+                "estabelecimento_id": row.estabelecimento_id,
+                "estabelecimento_nome": row.estabelecimento_nome,
+                **_metricas_desempenho(row._mapping)
+            })
+    
+    performance_data = []
+    for totals in usuarios.values():
+        if not totals["escalas"]:
+            continue
+        
+        entry = {
+            "usuario_id": totals["usuario_id"],
+            "nome": totals["nome"],
+            "cpf": totals["cpf"],
+            **_metricas_desempenho(totals)
+        }
+        if por_estabelecimento:
+            entry["estabelecimentos"] = sorted(
+                totals["estabelecimentos"], key=lambda e: -e["taxa_presenca"]
+            )
+        performance_data.append(entry)
+    
+    # Rank by attendance rate
+    performance_data.sort(key=lambda p: (-p["taxa_presenca"], p["nome"]))
+    for posicao, entry in enumerate(performance_data, 1):
+        entry["posicao"] = posicao
     
     # Overall statistics
     overall_stats = {
@@ -815,4 +866,53 @@ async def get_performance_report(
     return {
         "estatisticas_gerais": overall_stats,
         "performance_individual": performance_data
-    } 
\ No newline at end of file
+    }
+
+
+@router.get("/pdf/{job_id}")
+async def get_report_pdf_status(
+    job_id: str,
+    current_user: Usuario = Depends(require_supervisor())
+):
+    """
+    Get the status of a report PDF job
+    """
+    if not is_valid_job_id(job_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report job not found"
+        )
+    
+    return report_job_status(job_id)
+
+
+@router.get("/pdf/{job_id}/download")
+async def download_report_pdf(
+    job_id: str,
+    request: Request,
+    current_user: Usuario = Depends(require_supervisor()),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Download a rendered report PDF
+    """
+    if not is_valid_job_id(job_id) or report_job_status(job_id)["status"] != "ready":
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report not ready"
+        )
+    
+    # Log action
+    await log_action(
+        request=request,
+        current_user=current_user,
+        action="DOWNLOAD_REPORT_PDF",
+        details={"job_id": job_id},
+        db=db
+    )
+    
+    return FileResponse(
+        path=report_artifact_path(job_id),
+        filename=f"relatorio_{job_id[:12]}.pdf",
+        media_type="application/pdf"
+    )
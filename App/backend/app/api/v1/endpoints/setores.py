@@ -8,6 +8,7 @@ from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
+from app.core.cache import response_cache
 from app.core.models import Setor
 from app.core.deps import get_current_user, require_supervisor, log_action
 from app.schemas.setor import (
@@ -82,12 +83,8 @@ async def list_setores_ativos(
 ):
     """
     List only active setores (for dropdowns)
+    Cached until a setor is created, updated or deleted
     """
-    # Get active setores
-    query = select(Setor).where(Setor.ativo == True).order_by(Setor.nome.asc())
-    result = await db.execute(query)
-    setores = result.scalars().all()
-    
     # Log action
     await log_action(
         request=request,
@@ -96,7 +93,18 @@ async def list_setores_ativos(
         db=db
     )
     
-    return [SetorResponse.from_orm(setor) for setor in setores]
+    cached = await response_cache.get("setores", request)
+    if cached is not None:
+        return cached
+    
+    # Get active setores
+    query = select(Setor).where(Setor.ativo == True).order_by(Setor.nome.asc())
+    result = await db.execute(query)
+    setores = result.scalars().all()
+    
+    return await response_cache.store(
+        "setores", request, [SetorResponse.from_orm(setor) for setor in setores]
+    )
 
 
 @router.get("/{setor_id}", response_model=SetorResponse)
@@ -167,6 +175,7 @@ async def create_setor(
     db.add(novo_setor)
     await db.commit()
     await db.refresh(novo_setor)
+    await response_cache.invalidate("setores")
     
     # Log action
     await log_action(
@@ -228,6 +237,7 @@ async def update_setor(
     
     await db.commit()
     await db.refresh(setor)
+    await response_cache.invalidate("setores")
     
     # Log action
     await log_action(
@@ -278,6 +288,7 @@ async def delete_setor(
     # Delete setor
     await db.delete(setor)
     await db.commit()
+    await response_cache.invalidate("setores")
     
     # Log action
     await log_action(
@@ -14,6 +14,7 @@ from app.core.deps import (
     PermissionChecker, log_action
 )
 from app.core.security import SecurityUtils, get_password_hash
+from app.core.cache import principal_cache, response_cache
 from app.schemas.usuario import (
     UsuarioResponse, UsuarioCreate, UsuarioUpdate, UsuarioListResponse,
     UsuarioChangePassword
@@ -189,6 +190,7 @@ async def create_usuario(
     db.add(novo_usuario)
     await db.commit()
     await db.refresh(novo_usuario)
+    await response_cache.invalidate("supervisores")
     
     # Log action
     await log_action(
@@ -259,6 +261,8 @@ async def update_usuario(
     
     await db.commit()
     await db.refresh(usuario)
+    await principal_cache.invalidate(user_id)
+    await response_cache.invalidate("supervisores")
     
     # Log action
     await log_action(
@@ -293,7 +297,8 @@ async def change_password(
             detail="Can only change your own password"
         )
     
-    # Verify current password
+    # Verify current password (not part of the cached principal)
+    await db.refresh(current_user, ["senha_hash"])
     if not current_user.senha_hash:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -310,6 +315,7 @@ async def change_password(
     # Update password
     current_user.senha_hash = get_password_hash(password_data.nova_senha)
     await db.commit()
+    await principal_cache.invalidate(user_id)
     
     # Log action
     await log_action(
@@ -363,6 +369,8 @@ async def toggle_user_status(
     usuario.status = new_status
     
     await db.commit()
+    await principal_cache.invalidate(user_id)
+    await response_cache.invalidate("supervisores")
     
     # Log action
     await log_action(
@@ -414,6 +422,8 @@ async def delete_usuario(
     # Soft delete - just set inactive
     usuario.status = StatusUsuarioEnum.INATIVO
     await db.commit()
+    await principal_cache.invalidate(user_id)
+    await response_cache.invalidate("supervisores")
     
     # Log action
     await log_action(
@@ -464,6 +474,7 @@ async def regenerate_registration_token(
     usuario.token = new_token
     
     await db.commit()
+    await principal_cache.invalidate(user_id)
     
     # Log action
     await log_action(
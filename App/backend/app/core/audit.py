@@ -0,0 +1,154 @@
+"""
+Asynchronous audit log writer
+Batches Log rows in memory and flushes them with multi-row INSERTs
+"""
+import asyncio
+import logging
+import time
+from typing import Optional, Dict, Any, List
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.models import Log
+from app.core.monitoring import (
+    update_audit_queue_depth, record_audit_event, record_audit_flush
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class AuditLogWriter:
+    """
+    In-process audit pipeline
+
+    Requests enqueue log entries without touching the database; a background
+    task drains the queue every AUDIT_FLUSH_INTERVAL_MS or AUDIT_BATCH_SIZE
+    rows, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = settings.AUDIT_QUEUE_MAXSIZE,
+        batch_size: int = settings.AUDIT_BATCH_SIZE,
+        flush_interval_ms: int = settings.AUDIT_FLUSH_INTERVAL_MS,
+        overflow_policy: str = settings.AUDIT_OVERFLOW_POLICY,
+        enqueue_timeout_ms: int = settings.AUDIT_ENQUEUE_TIMEOUT_MS
+    ):
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.overflow_policy = overflow_policy
+        self.enqueue_timeout = enqueue_timeout_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background flusher is active"""
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the background flusher on the running event loop"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._task = asyncio.create_task(self._run(), name="audit-log-writer")
+
+    async def enqueue(self, entry: Dict[str, Any]) -> bool:
+        """
+        Queue a log entry for the next flush
+        Returns False when the entry was dropped because the queue is full
+        """
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            if self.overflow_policy != "block":
+                record_audit_event("dropped")
+                return False
+            try:
+                await asyncio.wait_for(self._queue.put(entry), timeout=self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                record_audit_event("dropped")
+                return False
+
+        record_audit_event("enqueued")
+        update_audit_queue_depth(self._queue.qsize())
+        return True
+
+    async def stop(self):
+        """Stop the flush loop and write everything still queued"""
+        if not self.running:
+            return
+
+        # Sentinel tells the flusher to write its current batch and exit
+        await self._queue.put(None)
+        await self._task
+
+        # Drain entries enqueued behind the sentinel
+        while not self._queue.empty():
+            await self._flush(self._take_batch())
+
+        self._task = None
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        """Pop up to batch_size entries without waiting"""
+        batch = []
+        while len(batch) < self.batch_size and not self._queue.empty():
+            entry = self._queue.get_nowait()
+            if entry is not None:
+                batch.append(entry)
+        return batch
+
+    async def _run(self):
+        """Flush loop: wait for the first entry, then collect until size or deadline"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            entry = await self._queue.get()
+            if entry is None:
+                return
+
+            batch = [entry]
+            deadline = loop.time() + self.flush_interval
+            stopping = False
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, batch: List[Dict[str, Any]]):
+        """Write a batch with a single multi-row INSERT"""
+        if not batch:
+            return
+
+        start_time = time.time()
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(insert(Log.__table__).values(batch))
+            record_audit_event("written", len(batch))
+        except Exception as e:
+            record_audit_event("failed", len(batch))
+            logger.error(f"Failed to write {len(batch)} audit log entries: {e}")
+        finally:
+            record_audit_flush(time.time() - start_time, len(batch))
+            update_audit_queue_depth(self._queue.qsize())
+
+
+# Process-wide writer, started in main.lifespan
+audit_writer = AuditLogWriter()
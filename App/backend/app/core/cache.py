@@ -0,0 +1,326 @@
+"""
+Caching utilities
+In-process LRU/TTL cache with an optional Redis tier
+"""
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Any, Callable, Hashable, Dict, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.config import settings
+from app.core.models import Usuario, PerfilEnum, StatusUsuarioEnum
+from app.core.monitoring import record_cache_access
+
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Least-recently-used cache with per-entry expiration
+    Not thread-safe; meant to be used from a single event loop
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return cached value or None if missing/expired"""
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store value, evicting the least recently used entry when full"""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        """Remove a single entry"""
+        self._data.pop(key, None)
+
+    def delete_matching(self, predicate: Callable[[Hashable], bool]):
+        """Remove every entry whose key matches predicate"""
+        for key in [k for k in self._data if predicate(k)]:
+            del self._data[key]
+
+    def clear(self):
+        """Remove all entries"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_redis_client = None
+
+
+def get_redis():
+    """Lazily create the shared async Redis client from REDIS_URL"""
+    global _redis_client
+    if _redis_client is None:
+        import redis.asyncio as redis
+        _redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _redis_client
+
+
+class PrincipalCache:
+    """
+    Cache of authenticated users for get_current_user
+
+    Entries are keyed by user id and token `iat`, so a re-issued token never
+    reads a snapshot taken for an older one, and never outlive the token's
+    `exp`. Endpoints that mutate a user must call invalidate(). Credential
+    columns are never cached; on a cached principal they load on refresh.
+    """
+
+    REDIS_PREFIX = "wecare:principal"
+    CREDENTIAL_COLUMNS = ("senha_hash", "token")
+
+    def __init__(
+        self,
+        maxsize: int = settings.PRINCIPAL_CACHE_MAXSIZE,
+        ttl: int = settings.PRINCIPAL_CACHE_TTL_SECONDS,
+        use_redis: bool = settings.PRINCIPAL_CACHE_REDIS
+    ):
+        self.ttl = ttl
+        self.use_redis = use_redis
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def _redis_key(self, user_id: int, iat: Any) -> str:
+        return f"{self.REDIS_PREFIX}:{user_id}:{iat}"
+
+    def _token_ttl(self, exp: Optional[int]) -> float:
+        """Never cache beyond the token expiration"""
+        if exp is None:
+            return self.ttl
+        return min(self.ttl, exp - time.time())
+
+    async def get(self, db: AsyncSession, user_id: int, iat: Any) -> Optional[Usuario]:
+        """
+        Return the cached user attached to db, or None on miss
+        The instance is merged without a SELECT, so endpoints may still
+        modify and commit it
+        """
+        snapshot = self._local.get((user_id, iat))
+
+        if snapshot is None and self.use_redis:
+            try:
+                raw = await get_redis().get(self._redis_key(user_id, iat))
+                if raw:
+                    snapshot = _load_snapshot(json.loads(raw))
+                    self._local.set((user_id, iat), snapshot)
+            except Exception as e:
+                logger.warning(f"Principal cache Redis read failed: {e}")
+
+        if snapshot is None:
+            record_cache_access("principal", hit=False)
+            return None
+
+        record_cache_access("principal", hit=True)
+        user = Usuario(**snapshot)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+
+    async def set(self, user: Usuario, iat: Any, exp: Optional[int] = None):
+        """Store a snapshot of user's non-credential columns for this token"""
+        ttl = self._token_ttl(exp)
+        if ttl <= 0:
+            return
+
+        snapshot = {
+            c.key: getattr(user, c.key)
+            for c in Usuario.__table__.columns
+            if c.key not in self.CREDENTIAL_COLUMNS
+        }
+        self._local.set((user.id, iat), snapshot, ttl)
+
+        if self.use_redis:
+            try:
+                await get_redis().set(
+                    self._redis_key(user.id, iat),
+                    json.dumps(_dump_snapshot(snapshot)),
+                    ex=max(1, int(ttl))
+                )
+            except Exception as e:
+                logger.warning(f"Principal cache Redis write failed: {e}")
+
+    async def invalidate(self, user_id: int):
+        """Drop every cached token snapshot for user_id"""
+        self._local.delete_matching(lambda key: key[0] == user_id)
+
+        if self.use_redis:
+            try:
+                client = get_redis()
+                keys = [k async for k in client.scan_iter(match=f"{self.REDIS_PREFIX}:{user_id}:*")]
+                if keys:
+                    await client.delete(*keys)
+            except Exception as e:
+                logger.warning(f"Principal cache Redis invalidation failed: {e}")
+
+
+def _dump_snapshot(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a user snapshot to JSON-compatible values"""
+    data = dict(snapshot)
+    data["perfil"] = snapshot["perfil"].value
+    data["status"] = snapshot["status"].value
+    for field in ("created_at", "updated_at"):
+        if snapshot.get(field):
+            data[field] = snapshot[field].isoformat()
+    return data
+
+
+def _load_snapshot(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild a user snapshot from its JSON form"""
+    snapshot = dict(data)
+    snapshot["perfil"] = PerfilEnum(data["perfil"])
+    snapshot["status"] = StatusUsuarioEnum(data["status"])
+    for field in ("created_at", "updated_at"):
+        if data.get(field):
+            snapshot[field] = datetime.fromisoformat(data[field])
+    return snapshot
+
+
+principal_cache = PrincipalCache()
+
+
+class ResponseCache:
+    """
+    Cache of rendered JSON responses for read-mostly reference data
+
+    Entries are grouped by namespace and keyed by the request path and query;
+    every response carries an ETag, so a client repeating If-None-Match gets a
+    304 without the endpoint touching the database. Endpoints that change the
+    underlying rows must call invalidate() for the namespace. With the Redis
+    tier every worker sees it immediately; otherwise other workers drop their
+    local copy after RESPONSE_CACHE_TTL_SECONDS.
+    """
+
+    REDIS_PREFIX = "wecare:response"
+
+    def __init__(
+        self,
+        maxsize: int = settings.RESPONSE_CACHE_MAXSIZE,
+        ttl: int = settings.RESPONSE_CACHE_TTL_SECONDS,
+        use_redis: bool = settings.RESPONSE_CACHE_REDIS,
+        enabled: bool = settings.RESPONSE_CACHE_ENABLED
+    ):
+        self.ttl = ttl
+        self.use_redis = use_redis
+        self.enabled = enabled
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def _variant(request: Request) -> str:
+        query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+        return f"{request.url.path}?{query}"
+
+    def _redis_key(self, namespace: str, variant: str) -> str:
+        return f"{self.REDIS_PREFIX}:{namespace}:{variant}"
+
+    @staticmethod
+    def _not_modified(request: Request, etag: str) -> bool:
+        header = request.headers.get("if-none-match")
+        if not header:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+        return "*" in tags or etag in tags
+
+    def _respond(self, request: Request, etag: str, body: bytes) -> Response:
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if self._not_modified(request, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def get(self, namespace: str, request: Request) -> Optional[Response]:
+        """Cached response (200 or 304) for this request, or None on miss"""
+        if not self.enabled:
+            return None
+
+        variant = self._variant(request)
+        entry: Optional[Tuple[str, bytes]] = None
+
+        if self.use_redis:
+            # Redis is the shared copy, so invalidations reach every worker at once
+            try:
+                raw = await get_redis().get(self._redis_key(namespace, variant))
+                if raw:
+                    data = json.loads(raw)
+                    entry = (data["etag"], data["body"].encode())
+            except Exception as e:
+                logger.warning(f"Response cache Redis read failed: {e}")
+                entry = self._local.get((namespace, variant))
+        else:
+            entry = self._local.get((namespace, variant))
+
+        record_cache_access(f"response:{namespace}", hit=entry is not None)
+        if entry is None:
+            return None
+        return self._respond(request, *entry)
+
+    async def store(self, namespace: str, request: Request, content: Any) -> Response:
+        """Render content as JSON, cache it and return the response"""
+        body = json.dumps(
+            jsonable_encoder(content),
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":")
+        ).encode()
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+
+        if self.enabled:
+            variant = self._variant(request)
+            self._local.set((namespace, variant), (etag, body))
+
+            if self.use_redis:
+                try:
+                    await get_redis().set(
+                        self._redis_key(namespace, variant),
+                        json.dumps({"etag": etag, "body": body.decode()}),
+                        ex=self.ttl
+                    )
+                except Exception as e:
+                    logger.warning(f"Response cache Redis write failed: {e}")
+
+        return self._respond(request, etag, body)
+
+    async def invalidate(self, *namespaces: str):
+        """Drop every cached variant of the given namespaces"""
+        for namespace in namespaces:
+            self._local.delete_matching(lambda key: key[0] == namespace)
+
+            if self.use_redis:
+                try:
+                    client = get_redis()
+                    keys = [k async for k in client.scan_iter(match=f"{self.REDIS_PREFIX}:{namespace}:*")]
+                    if keys:
+                        await client.delete(*keys)
+                except Exception as e:
+                    logger.warning(f"Response cache Redis invalidation failed: {e}")
+
+
+response_cache = ResponseCache()
@@ -21,6 +21,15 @@ class Settings(BaseSettings):
     DB_NAME: str = "wecare"
     DB_USER: str = "root"
     DB_PASSWORD: str = ""
+    DB_POOL_SIZE: int = 10                   # Connections kept open per worker process
+    DB_MAX_OVERFLOW: int = 10                # Extra connections opened during bursts, closed when returned
+    DB_POOL_TIMEOUT: int = 20                # Max seconds a request waits for a free connection
+    DB_POOL_RECYCLE: int = 300               # Reopen connections older than this (below MySQL wait_timeout)
+    DB_POOL_PRE_PING: bool = True            # Test connections on checkout
+    DB_REPLICA_URL: Optional[str] = None     # mysql+pymysql:// URL of a read replica; reads use the primary when unset
+    DB_REPLICA_MAX_LAG_SECONDS: int = 30     # Reads fall back to the primary beyond this replication lag
+    DB_REPLICA_CHECK_SECONDS: int = 10       # How often each worker re-checks replica health and lag
+    DB_REPLICA_LAG_CHECK: bool = True        # Read lag from SHOW REPLICA STATUS (needs REPLICATION CLIENT)
     
     @property
     def MYSQL_DATABASE_URL(self) -> str:
@@ -47,10 +56,17 @@ class Settings(BaseSettings):
     UPLOAD_PATH: str = "uploads"
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
     ALLOWED_EXTENSIONS: List[str] = [".pdf", ".jpg", ".jpeg", ".png"]
+    REPORTS_PATH: str = "reports"            # Rendered report PDFs, shared by API and workers
     
     # AI/OCR Configuration
     TESSERACT_PATH: Optional[str] = None
     SPACY_MODEL: str = "pt_core_news_sm"
+    OCR_MAX_WORKERS: int = 3                 # Tesseract calls running at once per worker process
+    OCR_CONFIDENCE_THRESHOLD: float = 80     # Mean word confidence that skips the extra OCR variants
+    OCR_PAGE_WORKERS: int = 2                # Scanned PDF pages OCR'd at once per worker process
+    OCR_MAX_PAGES: int = 30                  # Scanned PDF pages OCR'd per document; the rest are skipped
+    DOCUMENT_PRELOAD_MODELS: bool = True     # Load spaCy/OCR in the worker parent before fork (documents queue only)
+    DOCUMENT_RESULT_CACHE_ENABLED: bool = True  # Reuse OCR/NLP results for identical files of the same type
     
     # Email Configuration
     SMTP_HOST: Optional[str] = None
@@ -63,10 +79,49 @@ class Settings(BaseSettings):
     
     # Monitoring Configuration
     SENTRY_DSN: Optional[str] = None
-    
+
+    # Startup Configuration
+    DB_STARTUP_MODE: str = "check"           # "check" the Alembic stamp, "create_all" (dev only) or "skip"
+    DB_STARTUP_STRICT: bool = False          # Refuse to start when the stamp doesn't match the migrations
+    DB_WARMUP_ENABLED: bool = True           # Pre-open pool connections and compile hot statements
+    DB_WARMUP_CONNECTIONS: int = 5           # Connections opened at boot, capped at the pool size
+
+    # Audit Log Configuration
+    AUDIT_LOG_ASYNC: bool = True             # Batch audit logs in background instead of per-request commit
+    AUDIT_QUEUE_MAXSIZE: int = 10000         # Max pending audit entries kept in memory
+    AUDIT_BATCH_SIZE: int = 200              # Max rows per multi-row INSERT
+    AUDIT_FLUSH_INTERVAL_MS: int = 500       # Max time an entry waits before being flushed
+    AUDIT_OVERFLOW_POLICY: str = "drop"      # "drop" or "block" when the queue is full
+    AUDIT_ENQUEUE_TIMEOUT_MS: int = 50       # Max wait for a free slot with the "block" policy
+
+    # Principal Cache Configuration
+    PRINCIPAL_CACHE_ENABLED: bool = True     # Cache authenticated users between requests
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60    # Also bounds staleness across workers
+    PRINCIPAL_CACHE_MAXSIZE: int = 1024      # Max (user, token) entries per worker
+    PRINCIPAL_CACHE_REDIS: bool = False      # Share entries between workers via REDIS_URL
+
+    # Response Cache Configuration
+    RESPONSE_CACHE_ENABLED: bool = True      # Cache reference data responses (setores, estabelecimentos, supervisors)
+    RESPONSE_CACHE_TTL_SECONDS: int = 300    # Bounds staleness in workers that did not see the write
+    RESPONSE_CACHE_MAXSIZE: int = 256        # Max cached responses per worker
+    RESPONSE_CACHE_REDIS: bool = False       # Share entries between workers via REDIS_URL
+
+    # Reporting Rollups Configuration
+    ROLLUP_RECONCILE_DAYS: int = 90          # Days before and after today rebuilt by the nightly task
+
+    # Report Export Configuration
+    EXPORT_MAX_RANGE_DAYS: int = 366         # Max date range for streamed csv/ndjson exports
+    EXPORT_YIELD_PER: int = 1000             # Rows fetched per server-side cursor round trip
+    REPORT_PDF_TTL_MINUTES: int = 60         # How long a rendered PDF is reused for identical filters
+
     # Business Logic Configuration
     CHECKIN_WINDOW_MINUTES: int = 15  # Check-in allowed 15 minutes before shift
+    CHECKIN_BATCH_MAX_ITEMS: int = 200  # Max offline check-ins per sync request
+    ESCALA_BULK_MAX_ITEMS: int = 5000   # Max schedules per bulk creation request
+    ROSTER_MAX_DAYS: int = 93           # Max date range expanded from a roster template
+    ROSTER_CHUNK_SIZE: int = 500        # Escalas validated and inserted per expansion chunk
     GPS_TOLERANCE_METERS: int = 100   # GPS tolerance for location validation
+    GEOFENCE_REFRESH_SECONDS: int = 300  # Max age of the in-memory establishment geofence index
     TOKEN_EXPIRE_HOURS: int = 24      # Registration token expiration
     
 
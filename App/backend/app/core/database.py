@@ -1,20 +1,67 @@
 """
 Database configuration and connection management
 """
+import asyncio
+import logging
+import time
+
+from sqlalchemy import exc, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.monitoring import (
+    record_pool_checkout, record_pool_timeout, track_pool_usage,
+    update_replica_lag, record_read_routing
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool reporting checkout wait, overflow and timeouts to Prometheus"""
+
+    metrics_name = "primary"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        overflow = self._overflow
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            record_pool_timeout(self.metrics_name)
+            raise
+        record_pool_checkout(
+            self.metrics_name,
+            time.perf_counter() - start,
+            overflowed=self._overflow > overflow and self._overflow > 0
+        )
+        return record
+
+
+class ReplicaPool(InstrumentedPool):
+    metrics_name = "replica"
+
+
+def _create_engine(url: str, poolclass):
+    return create_async_engine(
+        url.replace("pymysql", "aiomysql"),
+        echo=settings.DEBUG,
+        poolclass=poolclass,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
 
 
 # Create async engine
-engine = create_async_engine(
-    settings.MYSQL_DATABASE_URL.replace("pymysql", "aiomysql"),
-    echo=settings.DEBUG,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    pool_timeout=20,
-    max_overflow=0,
-)
+engine = _create_engine(settings.MYSQL_DATABASE_URL, InstrumentedPool)
+
+# engine.pool is replaced on dispose(), so gauges read it at scrape time
+track_pool_usage("primary", lambda: engine.pool)
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -23,6 +70,83 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False
 )
 
+# Optional read replica for reports and listings
+replica_engine = None
+ReplicaSessionLocal = None
+if settings.DB_REPLICA_URL:
+    replica_engine = _create_engine(settings.DB_REPLICA_URL, ReplicaPool)
+    track_pool_usage("replica", lambda: replica_engine.pool)
+    ReplicaSessionLocal = async_sessionmaker(
+        replica_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        info={"read_only": True}
+    )
+
+
+class ReplicaHealth:
+    """
+    Process-wide view of whether the replica may serve reads
+    Re-checked at most every DB_REPLICA_CHECK_SECONDS; the replica is skipped
+    while unreachable, not replicating or lagging beyond DB_REPLICA_MAX_LAG_SECONDS
+    """
+
+    def __init__(self, interval: int = settings.DB_REPLICA_CHECK_SECONDS):
+        self.interval = interval
+        self._healthy = False
+        self._checked_at = None
+        self._lock = asyncio.Lock()
+
+    async def healthy(self) -> bool:
+        if self._checked_at is None or time.monotonic() - self._checked_at > self.interval:
+            async with self._lock:
+                if self._checked_at is None or time.monotonic() - self._checked_at > self.interval:
+                    await self.refresh()
+        return self._healthy
+
+    def mark_down(self):
+        """Stop routing to the replica until the next check"""
+        self._healthy = False
+        self._checked_at = time.monotonic()
+        update_replica_lag(-1)
+
+    async def refresh(self):
+        self._checked_at = time.monotonic()
+        try:
+            lag = await self._lag()
+        except Exception as e:
+            logger.warning(f"Read replica unavailable, reading from primary: {e}")
+            self.mark_down()
+            return
+
+        update_replica_lag(-1 if lag is None else lag)
+        healthy = lag is not None and lag <= settings.DB_REPLICA_MAX_LAG_SECONDS
+        if self._healthy and not healthy:
+            logger.warning(f"Read replica lag is {lag}s, reading from primary")
+        self._healthy = healthy
+
+    async def _lag(self):
+        """Seconds behind the primary, None when replication is stopped or not configured"""
+        async with replica_engine.connect() as conn:
+            if not settings.DB_REPLICA_LAG_CHECK:
+                await conn.execute(text("SELECT 1"))
+                return 0.0
+            try:
+                result = await conn.execute(text("SHOW REPLICA STATUS"))
+            except exc.ProgrammingError:
+                # MySQL before 8.0.22 and MariaDB
+                await conn.rollback()
+                result = await conn.execute(text("SHOW SLAVE STATUS"))
+            row = result.mappings().first()
+
+        if row is None:
+            return None
+        lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+        return None if lag is None else float(lag)
+
+
+replica_health = ReplicaHealth()
+
 
 class Base(DeclarativeBase):
     """Base class for all database models"""
@@ -38,4 +162,41 @@ async def get_db() -> AsyncSession:
             await session.rollback()
             raise
         finally:
-            await session.close() 
\ No newline at end of file
+            await session.close()
+
+
+async def use_read_replica() -> bool:
+    """True when reads should go to the replica, recording the routing decision"""
+    use_replica = replica_engine is not None and await replica_health.healthy()
+    record_read_routing("replica" if use_replica else "primary")
+    return use_replica
+
+
+def replica_failed(e: Exception) -> bool:
+    """Mark the replica down when e means its connection is gone"""
+    if isinstance(e, exc.DBAPIError) and (
+        e.connection_invalidated or isinstance(e, exc.OperationalError)
+    ):
+        replica_health.mark_down()
+        return True
+    return False
+
+
+async def get_read_db() -> AsyncSession:
+    """
+    Dependency to get a read-only database session
+    Served by the read replica while it is healthy, by the primary otherwise.
+    Reads may trail the primary by up to DB_REPLICA_MAX_LAG_SECONDS.
+    """
+    use_replica = await use_read_replica()
+
+    async with (ReplicaSessionLocal if use_replica else AsyncSessionLocal)() as session:
+        try:
+            yield session
+        except Exception as e:
+            await session.rollback()
+            if use_replica:
+                replica_failed(e)
+            raise
+        finally:
+            await session.close()
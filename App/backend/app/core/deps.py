@@ -2,14 +2,19 @@
 Dependency functions for FastAPI
 """
 from typing import Optional, Dict, Any
+from datetime import datetime
 import json
+import orjson
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, AsyncSessionLocal
 from app.core.security import SecurityUtils
+from app.core.audit import audit_writer
+from app.core.cache import principal_cache
 from app.core.models import Usuario, PerfilEnum, Log
 from app.schemas.usuario import TokenData
 
@@ -18,24 +23,24 @@ from app.schemas.usuario import TokenData
 security = HTTPBearer()
 
 
+def _json_default(obj):
+    """Fallback for types orjson does not handle natively"""
+    if hasattr(obj, 'value'):  # Enum-like objects
+        return obj.value
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
 def serialize_for_json(obj):
     """
     Convert objects to JSON-serializable format
+    Enums, dates, times, dataclasses and nested containers are converted by
+    orjson in a single pass instead of a recursive Python walk
     """
-    from datetime import date, datetime, time
-    
-    if hasattr(obj, 'value'):  # Enum objects
-        return obj.value
-    elif isinstance(obj, (date, datetime)):  # Date and datetime objects
-        return obj.isoformat()
-    elif isinstance(obj, time):  # Time objects
-        return obj.strftime('%H:%M:%S')
-    elif isinstance(obj, dict):
-        return {k: serialize_for_json(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [serialize_for_json(item) for item in obj]
-    else:
-        return obj
+    return orjson.loads(
+        orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    )
 
 
 async def get_current_user(
@@ -66,14 +71,26 @@ async def get_current_user(
         if user_id is None:
             raise credentials_exception
         
-        # Get user from database
-        result = await db.execute(
-            select(Usuario).where(Usuario.id == int(user_id))
-        )
-        user = result.scalar_one_or_none()
+        user_id = int(user_id)
+        issued_at = payload.get("iat")
+        
+        # Try the principal cache before hitting the database
+        user = None
+        if settings.PRINCIPAL_CACHE_ENABLED:
+            user = await principal_cache.get(db, user_id, issued_at)
         
         if user is None:
-            raise credentials_exception
+            # Get user from database
+            result = await db.execute(
+                select(Usuario).where(Usuario.id == user_id)
+            )
+            user = result.scalar_one_or_none()
+            
+            if user is None:
+                raise credentials_exception
+            
+            if settings.PRINCIPAL_CACHE_ENABLED and user.status.value == "Ativo":
+                await principal_cache.set(user, issued_at, payload.get("exp"))
         
         # Check if user is active
         if user.status.value != "Ativo":
@@ -173,6 +190,7 @@ async def log_action(
 ):
     """
     Log user actions
+    Entries are batched by the audit writer instead of committed per request
     """
     # Extract client info
     client_host = request.client.host if request.client else "unknown"
@@ -196,16 +214,30 @@ async def log_action(
         dados_extras['recurso_id'] = resource_id
     
     # Create log entry with correct fields
-    log_entry = Log(
-        usuario_id=current_user.id if current_user else None,
-        acao=action,
-        descricao=descricao,
-        ip_address=client_host,
-        user_agent=user_agent,
-        dados_extras=dados_extras if dados_extras else None
-    )
+    log_data = {
+        "usuario_id": current_user.id if current_user else None,
+        "acao": action,
+        "descricao": descricao,
+        "ip_address": client_host,
+        "user_agent": user_agent,
+        "dados_extras": dados_extras if dados_extras else None,
+        "created_at": datetime.now()
+    }
+    
+    # Hand off to the background writer; fall back to an inline commit when
+    # it is disabled or not running (scripts, Celery tasks)
+    if settings.AUDIT_LOG_ASYNC and audit_writer.running:
+        await audit_writer.enqueue(log_data)
+        return
+    
+    # Sessions from get_read_db may be bound to the read replica
+    if db is None or db.info.get("read_only"):
+        async with AsyncSessionLocal() as log_db:
+            log_db.add(Log(**log_data))
+            await log_db.commit()
+        return
     
-    db.add(log_entry)
+    db.add(Log(**log_data))
     await db.commit()
 
 
@@ -0,0 +1,177 @@
+"""
+Geofence index for check-in location validation
+Holds every active estabelecimento in memory, bucketed on a lat/lon grid,
+with coordinates pre-converted to radians for vectorized haversine
+"""
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.models import Estabelecimento
+
+
+EARTH_RADIUS_METERS = 6371000
+METERS_PER_DEGREE = 111320
+
+
+@dataclass
+class GeofenceMatch:
+    """Closest establishment to a GPS fix"""
+    estabelecimento_id: int
+    nome: str
+    distance: float
+    raio: float
+
+    @property
+    def inside(self) -> bool:
+        return self.distance <= self.raio
+
+
+class GeofenceIndex:
+    """
+    Immutable snapshot of establishment geofences
+
+    Sites are bucketed on a square grid whose cell is at least as large as
+    the biggest check-in radius, so every site that can contain a fix lies
+    in the fix's cell or its neighbours.
+    """
+
+    def __init__(self, estabelecimentos: List[Tuple[int, str, float, float, float]]):
+        self.ids = np.array([e[0] for e in estabelecimentos], dtype=np.int64)
+        self.nomes = [e[1] for e in estabelecimentos]
+        self.lat = np.radians(np.array([e[2] for e in estabelecimentos], dtype=np.float64))
+        self.lon = np.radians(np.array([e[3] for e in estabelecimentos], dtype=np.float64))
+        self.cos_lat = np.cos(self.lat)
+        self.raio = np.array([e[4] for e in estabelecimentos], dtype=np.float64)
+        self.positions = {int(id_): i for i, id_ in enumerate(self.ids)}
+
+        max_raio = float(self.raio.max()) if len(self.raio) else settings.GPS_TOLERANCE_METERS
+        self.cell_degrees = max(max_raio, 500) / METERS_PER_DEGREE
+
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        for i, e in enumerate(estabelecimentos):
+            buckets.setdefault(self._cell(e[2], e[3]), []).append(i)
+        self.buckets = {cell: np.array(idx, dtype=np.int64) for cell, idx in buckets.items()}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees))
+
+    def _candidates(self, lat: float, lon: float) -> np.ndarray:
+        """Indexes of sites in the cells that can contain (lat, lon)"""
+        row, col = self._cell(lat, lon)
+        # Longitude degrees shrink with latitude, so widen the column span
+        cos_lat = max(math.cos(math.radians(lat)), 0.01)
+        col_span = math.ceil(1 / cos_lat)
+
+        found = [
+            self.buckets[cell]
+            for cell in (
+                (r, c)
+                for r in range(row - 1, row + 2)
+                for c in range(col - col_span, col + col_span + 1)
+            )
+            if cell in self.buckets
+        ]
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(found)
+
+    def _distances(self, lat: float, lon: float, idx: Optional[np.ndarray] = None) -> np.ndarray:
+        """Haversine distance in meters from (lat, lon) to the selected sites"""
+        lat1 = math.radians(lat)
+        lon1 = math.radians(lon)
+        lat2 = self.lat if idx is None else self.lat[idx]
+        lon2 = self.lon if idx is None else self.lon[idx]
+        cos_lat2 = self.cos_lat if idx is None else self.cos_lat[idx]
+
+        a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * cos_lat2 * np.sin((lon2 - lon1) / 2) ** 2
+        return 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    def _match(self, position: int, distance: float) -> GeofenceMatch:
+        return GeofenceMatch(
+            estabelecimento_id=int(self.ids[position]),
+            nome=self.nomes[position],
+            distance=float(distance),
+            raio=float(self.raio[position])
+        )
+
+    def nearest(self, lat: float, lon: float) -> Optional[GeofenceMatch]:
+        """
+        Closest site to the fix, preferring one whose radius contains it
+        Falls back to a full scan only when no site is nearby
+        """
+        if not len(self):
+            return None
+
+        idx = self._candidates(lat, lon)
+        if len(idx):
+            distances = self._distances(lat, lon, idx)
+            inside = distances <= self.raio[idx]
+            if inside.any():
+                best = int(np.argmin(np.where(inside, distances, np.inf)))
+                return self._match(int(idx[best]), distances[best])
+
+        distances = self._distances(lat, lon)
+        best = int(np.argmin(distances))
+        return self._match(best, distances[best])
+
+    def check(self, estabelecimento_id: int, lat: float, lon: float) -> Optional[GeofenceMatch]:
+        """Distance from the fix to one specific site, or None if it is not indexed"""
+        position = self.positions.get(estabelecimento_id)
+        if position is None:
+            return None
+        distance = self._distances(lat, lon, np.array([position]))[0]
+        return self._match(position, distance)
+
+
+class GeofenceRegistry:
+    """
+    Process-wide holder of the current GeofenceIndex
+    Rebuilt on estabelecimento writes in this worker and at most every
+    GEOFENCE_REFRESH_SECONDS so other workers pick up changes
+    """
+
+    def __init__(self, max_age: int = settings.GEOFENCE_REFRESH_SECONDS):
+        self.max_age = max_age
+        self._index: Optional[GeofenceIndex] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self, db: AsyncSession) -> GeofenceIndex:
+        """Current index, loading it if missing or stale"""
+        if self._index is None or time.monotonic() - self._loaded_at > self.max_age:
+            async with self._lock:
+                if self._index is None or time.monotonic() - self._loaded_at > self.max_age:
+                    await self.refresh(db)
+        return self._index
+
+    async def refresh(self, db: AsyncSession):
+        """Rebuild the index from active establishments"""
+        result = await db.execute(
+            select(
+                Estabelecimento.id,
+                Estabelecimento.nome,
+                Estabelecimento.latitude,
+                Estabelecimento.longitude,
+                Estabelecimento.raio_checkin
+            ).where(Estabelecimento.ativo == True)
+        )
+        self._index = GeofenceIndex([
+            (row.id, row.nome, float(row.latitude), float(row.longitude),
+             float(row.raio_checkin or settings.GPS_TOLERANCE_METERS))
+            for row in result
+        ])
+        self._loaded_at = time.monotonic()
+
+
+geofences = GeofenceRegistry()
@@ -9,7 +9,7 @@ import json
 
 from sqlalchemy import (
     Column, Integer, String, DateTime, Date, Time, Text, 
-    ForeignKey, JSON, Enum, Boolean, Table
+    ForeignKey, JSON, Enum, Boolean, Table, Index, UniqueConstraint
 )
 from sqlalchemy.types import DECIMAL
 from sqlalchemy.orm import relationship, Mapped, mapped_column
@@ -40,17 +40,30 @@ escala_supervisores = Table(
     Column('created_at', DateTime, default=func.now())
 )
 
+# Tabela de membros dos modelos de escala
+# posicao é o deslocamento, em dias, do membro dentro do ciclo do modelo
+modelo_escala_usuarios = Table(
+    'modelo_escala_usuarios',
+    Base.metadata,
+    Column('modelo_id', Integer, ForeignKey('modelos_escala.id', ondelete='CASCADE'), primary_key=True),
+    Column('usuario_id', Integer, ForeignKey('usuarios.id', ondelete='CASCADE'), primary_key=True),
+    Column('posicao', Integer, default=0, nullable=False),
+    Column('created_at', DateTime, default=func.now())
+)
+
 # Tabela de relacionamento entre escalas e usuários (REFATORADA)
 escala_usuarios = Table(
     'escala_usuarios',
     Base.metadata,
     Column('id', Integer, primary_key=True, autoincrement=True),
     Column('escala_id', Integer, ForeignKey('escalas.id', ondelete='CASCADE'), nullable=False, index=True),
-    Column('usuario_id', Integer, ForeignKey('usuarios.id', ondelete='CASCADE'), nullable=False, index=True),
+    Column('usuario_id', Integer, ForeignKey('usuarios.id', ondelete='CASCADE'), nullable=False),
     Column('setor_id', Integer, ForeignKey('setores.id', ondelete='CASCADE'), nullable=False, index=True),  # Setor específico do usuário nesta escala
     Column('status', String(50), default='Pendente', nullable=False),  # Status individual do usuário
     Column('created_at', DateTime, default=func.now()),
-    Column('updated_at', DateTime, onupdate=func.now(), nullable=True)
+    Column('updated_at', DateTime, onupdate=func.now(), nullable=True),
+    # Um vínculo por usuário e escala; também atende às buscas por usuário
+    UniqueConstraint('usuario_id', 'escala_id', name='uq_escala_usuarios_usuario_escala')
 )
 
 
@@ -77,6 +90,13 @@ class StatusCheckinEnum(PyEnum):
     FORA_DE_LOCAL = "Fora de Local"
 
 
+class PadraoEscalaEnum(PyEnum):
+    DOZE_POR_TRINTA_E_SEIS = "12x36"
+    SEIS_POR_UM = "6x1"
+    NOTURNO_ROTATIVO = "Noturno Rotativo"
+    PERSONALIZADO = "Personalizado"
+
+
 class Usuario(Base):
     """
     Tabela de usuários do sistema
@@ -178,17 +198,20 @@ class Escala(Base):
     Define os plantões atribuídos aos usuários
     """
     __tablename__ = "escalas"
+    __table_args__ = (
+        Index('ix_escalas_estabelecimento_data', 'estabelecimento_id', 'data_inicio'),
+        Index('ix_escalas_data_status', 'data_inicio', 'status'),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    data_inicio: Mapped[datetime] = mapped_column(Date, nullable=False, index=True)
+    data_inicio: Mapped[datetime] = mapped_column(Date, nullable=False)
     data_fim: Mapped[datetime] = mapped_column(Date, nullable=False, index=True)
     hora_inicio: Mapped[datetime] = mapped_column(Time, nullable=False)
     hora_fim: Mapped[datetime] = mapped_column(Time, nullable=False)
     estabelecimento_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("estabelecimentos.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
     status: Mapped[StatusEscalaEnum] = mapped_column(
         Enum(StatusEscalaEnum),
@@ -232,19 +255,22 @@ class Checkin(Base):
     Registra check-ins com localização GPS
     """
     __tablename__ = "checkins"
+    __table_args__ = (
+        Index('ix_checkins_usuario_data', 'usuario_id', 'data_hora'),
+        # Um check-in por usuário em cada escala
+        UniqueConstraint('escala_id', 'usuario_id', name='uq_checkins_escala_usuario'),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     usuario_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("usuarios.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
     escala_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("escalas.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
     data_hora: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
     gps_lat: Mapped[float] = mapped_column(DECIMAL(10, 8), nullable=False)
@@ -256,6 +282,7 @@ class Checkin(Base):
     )
     endereco: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     observacoes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    client_uuid: Mapped[Optional[str]] = mapped_column(String(36), nullable=True, unique=True, index=True)  # Idempotência da sincronização offline
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
     
     # Relationships
@@ -285,6 +312,7 @@ class Documento(Base):
     arquivo_path: Mapped[str] = mapped_column(String(500), nullable=False)
     tamanho_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
     mimetype: Mapped[str] = mapped_column(String(100), nullable=False)
+    conteudo_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)  # SHA-256 do arquivo
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
     
     # Relationships
@@ -294,19 +322,41 @@ class Documento(Base):
         return f"<Documento(id={self.id}, nome_arquivo='{self.nome_arquivo}', usuario_id={self.usuario_id})>"
 
 
+class DocumentoCache(Base):
+    """
+    Resultado do OCR/NLP por conteúdo do arquivo
+    Um reenvio do mesmo arquivo com o mesmo tipo reaproveita a extração
+    em vez de processar o documento de novo
+    """
+    __tablename__ = "documento_cache"
+    
+    conteudo_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    tipo_documento: Mapped[str] = mapped_column(String(100), primary_key=True)
+    dados_extraidos: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    texto_ocr: Mapped[Optional[str]] = mapped_column(Text(16777215), nullable=True)  # MEDIUMTEXT no MySQL
+    hits: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    last_hit_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<DocumentoCache(conteudo_hash='{self.conteudo_hash[:12]}', tipo_documento='{self.tipo_documento}', hits={self.hits})>"
+
+
 class Log(Base):
     """
     Tabela de logs do sistema  
     Rastreia todas as ações importantes
     """
     __tablename__ = "logs"
+    __table_args__ = (
+        Index('ix_logs_usuario_created', 'usuario_id', 'created_at'),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     usuario_id: Mapped[Optional[int]] = mapped_column(
         Integer,
         ForeignKey("usuarios.id", ondelete="SET NULL"),
-        nullable=True,
-        index=True
+        nullable=True
     )
     acao: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
     descricao: Mapped[str] = mapped_column(Text, nullable=False)
@@ -402,4 +452,169 @@ class TransferenciaPlantao(Base):
     aprovado_por = relationship("Usuario", foreign_keys=[aprovado_por_id])
     
     def __repr__(self):
-        return f"<TransferenciaPlantao(id={self.id}, escala_id={self.escala_original_id}, status='{self.status}')>" 
\ No newline at end of file
+        return f"<TransferenciaPlantao(id={self.id}, escala_id={self.escala_original_id}, status='{self.status}')>" 
+
+class ModeloEscala(Base):
+    """
+    Tabela de modelos de escala recorrentes
+    Um ciclo de dias_trabalho seguidos de dias_folga, contado a partir de
+    data_referencia, expandido em escalas pelo servidor
+    """
+    __tablename__ = "modelos_escala"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    nome: Mapped[str] = mapped_column(String(100), nullable=False)
+    estabelecimento_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("estabelecimentos.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    setor_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("setores.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    padrao: Mapped[PadraoEscalaEnum] = mapped_column(Enum(PadraoEscalaEnum), nullable=False)
+    dias_trabalho: Mapped[int] = mapped_column(Integer, nullable=False)
+    dias_folga: Mapped[int] = mapped_column(Integer, nullable=False)
+    hora_inicio: Mapped[datetime] = mapped_column(Time, nullable=False)
+    hora_fim: Mapped[datetime] = mapped_column(Time, nullable=False)
+    data_referencia: Mapped[datetime] = mapped_column(Date, nullable=False)
+    observacoes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    ativo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime,
+        onupdate=func.now(),
+        nullable=True
+    )
+    
+    # Relationships
+    estabelecimento = relationship("Estabelecimento")
+    setor = relationship("Setor")
+    
+    def __repr__(self):
+        return f"<ModeloEscala(id={self.id}, nome='{self.nome}', padrao='{self.padrao}')>"
+
+
+# ========================================
+# TABELAS DE AGREGAÇÃO (ROLLUPS)
+# ========================================
+
+class RollupEscalaDiaria(Base):
+    """
+    Contagem diária de escalas por estabelecimento e status
+    Mantida incrementalmente por app.core.rollups e reconciliada todas as noites
+    """
+    __tablename__ = "rollup_escalas_diarias"
+    
+    dia: Mapped[datetime] = mapped_column(Date, primary_key=True)
+    estabelecimento_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("estabelecimentos.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    status: Mapped[StatusEscalaEnum] = mapped_column(Enum(StatusEscalaEnum), primary_key=True)
+    total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime,
+        default=func.now(),
+        onupdate=func.now(),
+        nullable=True
+    )
+    
+    def __repr__(self):
+        return f"<RollupEscalaDiaria(dia='{self.dia}', estabelecimento_id={self.estabelecimento_id}, status='{self.status}', total={self.total})>"
+
+
+class RollupCheckinDiario(Base):
+    """
+    Contagem diária de check-ins por estabelecimento e status
+    Mantida incrementalmente por app.core.rollups e reconciliada todas as noites
+    """
+    __tablename__ = "rollup_checkins_diarios"
+    
+    dia: Mapped[datetime] = mapped_column(Date, primary_key=True)
+    estabelecimento_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("estabelecimentos.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    status: Mapped[StatusCheckinEnum] = mapped_column(Enum(StatusCheckinEnum), primary_key=True)
+    total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime,
+        default=func.now(),
+        onupdate=func.now(),
+        nullable=True
+    )
+    
+    def __repr__(self):
+        return f"<RollupCheckinDiario(dia='{self.dia}', estabelecimento_id={self.estabelecimento_id}, status='{self.status}', total={self.total})>"
+
+
+class RollupDesempenhoDiario(Base):
+    """
+    Fatos diários de desempenho por usuário e estabelecimento
+    Escalas atribuídas, faltas e check-ins por (usuario, dia); a chave primária
+    começa por usuario_id para servir consultas por usuário e período.
+    Reconstruída por app.core.rollups na reconciliação noturna
+    """
+    __tablename__ = "rollup_desempenho_diario"
+    __table_args__ = (
+        Index('ix_rollup_desempenho_dia', 'dia'),
+    )
+    
+    usuario_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("usuarios.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    dia: Mapped[datetime] = mapped_column(Date, primary_key=True)
+    estabelecimento_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("estabelecimentos.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    escalas: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    faltas: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    checkins: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    checkins_realizados: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    checkins_fora_local: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime,
+        default=func.now(),
+        onupdate=func.now(),
+        nullable=True
+    )
+    
+    def __repr__(self):
+        return f"<RollupDesempenhoDiario(usuario_id={self.usuario_id}, dia='{self.dia}', estabelecimento_id={self.estabelecimento_id})>"
+
+
+
+class RollupDesempenhoPendente(Base):
+    """
+    Fatias (dia, estabelecimento) de rollup_desempenho_diario desatualizadas
+    Marcadas a cada gravação de escala, vínculo ou check-in; enquanto marcadas
+    o relatório de desempenho as agrega a partir das tabelas de fatos. A
+    reconciliação noturna reconstrói as fatias e remove as marcas.
+    """
+    __tablename__ = "rollup_desempenho_pendente"
+    
+    dia: Mapped[datetime] = mapped_column(Date, primary_key=True)
+    estabelecimento_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("estabelecimentos.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    marked_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<RollupDesempenhoPendente(dia='{self.dia}', estabelecimento_id={self.estabelecimento_id})>"
+
+# Listeners de manutenção incremental dos rollups; registrados aqui para
+# valer em todo processo que grava escalas e check-ins (API, Celery, scripts)
+from app.core import rollups  # noqa: E402,F401
@@ -187,4 +187,193 @@ HEALTH_CHECK = Gauge(
 
 def update_health_status(component: str, healthy: bool):
     """Update health status for a component"""
-    HEALTH_CHECK.labels(component=component).set(1 if healthy else 0) 
\ No newline at end of file
+    HEALTH_CHECK.labels(component=component).set(1 if healthy else 0) 
+
+# Audit log pipeline metrics
+AUDIT_QUEUE_DEPTH = Gauge(
+    'wecare_audit_queue_depth',
+    'Number of audit log entries waiting to be flushed'
+)
+
+AUDIT_EVENTS = Counter(
+    'wecare_audit_events_total',
+    'Audit log entries by outcome',
+    ['status']
+)
+
+AUDIT_FLUSH_DURATION = Histogram(
+    'wecare_audit_flush_duration_seconds',
+    'Duration of audit log batch inserts in seconds'
+)
+
+AUDIT_FLUSH_BATCH_SIZE = Histogram(
+    'wecare_audit_flush_batch_size',
+    'Number of audit log entries written per batch',
+    buckets=(1, 5, 10, 25, 50, 100, 200, 500, 1000)
+)
+
+
+def update_audit_queue_depth(depth: int):
+    """Update audit queue depth gauge"""
+    AUDIT_QUEUE_DEPTH.set(depth)
+
+
+def record_audit_event(status: str, count: int = 1):
+    """Record audit log entries by outcome (enqueued, dropped, written, failed)"""
+    AUDIT_EVENTS.labels(status=status).inc(count)
+
+
+def record_audit_flush(duration: float, batch_size: int):
+    """Record audit log batch flush"""
+    AUDIT_FLUSH_DURATION.observe(duration)
+    AUDIT_FLUSH_BATCH_SIZE.observe(batch_size)
+
+
+# Cache metrics
+CACHE_OPERATIONS = Counter(
+    'wecare_cache_operations_total',
+    'Cache lookups by cache and result',
+    ['cache', 'result']
+)
+
+
+def record_cache_access(cache: str, hit: bool):
+    """Record cache hit or miss"""
+    CACHE_OPERATIONS.labels(
+        cache=cache,
+        result="hit" if hit else "miss"
+    ).inc()
+
+
+# Rollup metrics
+ROLLUP_RECONCILE_DURATION = Histogram(
+    'wecare_rollup_reconcile_duration_seconds',
+    'Duration of rollup reconciliation in seconds',
+    ['table']
+)
+
+ROLLUP_DRIFT = Counter(
+    'wecare_rollup_drift_total',
+    'Rollup rows corrected by reconciliation',
+    ['table']
+)
+
+
+def record_rollup_reconcile(table: str, duration: float, drift: int):
+    """Record rollup reconciliation run"""
+    ROLLUP_RECONCILE_DURATION.labels(table=table).observe(duration)
+    ROLLUP_DRIFT.labels(table=table).inc(drift)
+
+
+# Worker startup metrics
+STARTUP_PHASE_DURATION = Gauge(
+    'wecare_startup_phase_duration_seconds',
+    'Duration of each worker startup phase in seconds',
+    ['phase']
+)
+
+WORKER_BOOT_DURATION = Gauge(
+    'wecare_worker_boot_duration_seconds',
+    'Time from process import to accepting requests in seconds'
+)
+
+TIME_TO_FIRST_REQUEST = Gauge(
+    'wecare_time_to_first_request_seconds',
+    'Time from process import to the first completed request in seconds'
+)
+
+
+def record_startup_phase(phase: str, duration: float):
+    """Record duration of a startup phase (schema_check, create_all, warm_up)"""
+    STARTUP_PHASE_DURATION.labels(phase=phase).set(duration)
+
+
+def record_worker_boot(duration: float):
+    """Record worker boot duration"""
+    WORKER_BOOT_DURATION.set(duration)
+
+
+def record_first_request(duration: float):
+    """Record time until the worker served its first request"""
+    TIME_TO_FIRST_REQUEST.set(duration)
+
+
+# Database connection pool metrics
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    'wecare_db_pool_checkout_wait_seconds',
+    'Time spent waiting for a pooled database connection in seconds',
+    ['pool'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20)
+)
+
+DB_POOL_IN_USE = Gauge(
+    'wecare_db_pool_connections_in_use',
+    'Database connections currently checked out in this worker',
+    ['pool']
+)
+
+DB_POOL_OVERFLOW = Gauge(
+    'wecare_db_pool_overflow_connections',
+    'Overflow connections currently open beyond the pool size in this worker',
+    ['pool']
+)
+
+DB_POOL_EVENTS = Counter(
+    'wecare_db_pool_events_total',
+    'Database pool overflow connections opened and checkout timeouts',
+    ['pool', 'event']
+)
+
+
+def track_pool_usage(pool: str, get_pool: Callable[[], Any]):
+    """Read in-use and overflow counts from the current pool on every scrape"""
+    DB_POOL_IN_USE.labels(pool=pool).set_function(lambda: get_pool().checkedout())
+    DB_POOL_OVERFLOW.labels(pool=pool).set_function(lambda: max(get_pool().overflow(), 0))
+
+
+def record_pool_checkout(pool: str, wait: float, overflowed: bool = False):
+    """Record a pool checkout and whether it opened an overflow connection"""
+    DB_POOL_CHECKOUT_WAIT.labels(pool=pool).observe(wait)
+    if overflowed:
+        DB_POOL_EVENTS.labels(pool=pool, event="overflow").inc()
+
+
+def record_pool_timeout(pool: str):
+    """Record a checkout that gave up after DB_POOL_TIMEOUT"""
+    DB_POOL_EVENTS.labels(pool=pool, event="timeout").inc()
+
+
+# Read replica metrics
+DB_REPLICA_LAG = Gauge(
+    'wecare_db_replica_lag_seconds',
+    'Replication lag reported by the read replica at the last check'
+)
+
+DB_READ_ROUTING = Counter(
+    'wecare_db_read_sessions_total',
+    'Read-only sessions by the database they were routed to',
+    ['target']
+)
+
+
+def update_replica_lag(lag: float):
+    """Update replica lag gauge; -1 when the replica is unreachable or not replicating"""
+    DB_REPLICA_LAG.set(lag)
+
+
+def record_read_routing(target: str):
+    """Record where a read-only session was routed (replica or primary)"""
+    DB_READ_ROUTING.labels(target=target).inc()
+
+
+# OCR metrics
+OCR_STAGE_DURATION = Histogram(
+    'wecare_ocr_stage_duration_seconds',
+    'Time spent in each OCR stage per image',
+    ['stage']
+)
+
+
+def record_ocr_stage(stage: str, duration: float):
+    """Record the duration of an OCR stage (decode, render, preprocess, ocr_first_pass, ocr_variants, pdf_ocr)"""
+    OCR_STAGE_DURATION.labels(stage=stage).observe(duration)
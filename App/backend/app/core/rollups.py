@@ -0,0 +1,557 @@
+"""
+Daily reporting rollups
+Keeps rollup_escalas_diarias and rollup_checkins_diarios in step with
+escala/checkin writes, flags the per-user performance facts in
+rollup_desempenho_diario that those writes make stale, and rebuilds all
+of them from the fact tables on demand
+"""
+import logging
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Optional, Dict, Any, Iterable, Tuple
+
+from sqlalchemy import event, select, delete, insert, func, and_, case, exists, inspect, union_all
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.util import identity_key
+
+from app.core.models import (
+    Escala, Checkin, RollupEscalaDiaria, RollupCheckinDiario, RollupDesempenhoDiario,
+    RollupDesempenhoPendente, StatusEscalaEnum, StatusCheckinEnum, escala_usuarios
+)
+from app.core.monitoring import record_rollup_reconcile
+
+
+logger = logging.getLogger(__name__)
+
+
+# ========================================
+# INCREMENTAL MAINTENANCE
+# ========================================
+# Mapper events run inside the flush, on the same connection and transaction
+# as the write itself. Bulk UPDATE/DELETE statements and FK cascades bypass
+# them; reconcile_rollups() corrects any drift they leave behind.
+# app.core.models imports this module, so every process that writes escalas
+# or check-ins (API, Celery workers, scripts) has the listeners registered.
+
+def _bump_statement(model, dia, estabelecimento_id, status, delta: int):
+    """Upsert adding delta to one rollup counter, creating the row if needed"""
+    table = model.__table__
+    stmt = mysql_insert(table).values(
+        dia=dia,
+        estabelecimento_id=estabelecimento_id,
+        status=status,
+        total=max(delta, 0),
+        updated_at=func.now()
+    )
+    return stmt.on_duplicate_key_update(
+        total=func.greatest(table.c.total + delta, 0),
+        updated_at=func.now()
+    )
+
+
+def _bump(connection, model, dia, estabelecimento_id, status, delta: int):
+    """Add delta to one rollup counter"""
+    if not delta or dia is None or estabelecimento_id is None or status is None:
+        return
+    connection.execute(_bump_statement(model, dia, estabelecimento_id, status, delta))
+
+
+def _previous(target, attr: str):
+    """Value of attr before the pending flush"""
+    history = inspect(target).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(target, attr)
+
+
+def _as_date(value) -> Optional[date]:
+    return value.date() if isinstance(value, datetime) else value
+
+
+ESCALA_LOOKUP = "rollup_escala_lookup"
+
+
+def _escalas_needed(session) -> set:
+    """Escala ids referenced by the check-ins about to be flushed"""
+    ids = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Checkin):
+            ids.add(obj.escala_id)
+            ids.update(inspect(obj).attrs.escala_id.history.deleted)
+    ids.discard(None)
+    return ids
+
+
+@event.listens_for(Session, "before_flush")
+def _load_checkin_escalas(session, flush_context, instances):
+    """
+    One query per flush for the establishments of the check-ins' escalas
+    instead of one per check-in; escalas already in the session are read
+    from the identity map instead
+    """
+    missing = {
+        escala_id for escala_id in _escalas_needed(session)
+        if session.identity_map.get(identity_key(Escala, escala_id)) is None
+    }
+    if not missing:
+        return
+    with session.no_autoflush:
+        result = session.execute(
+            select(Escala.id, Escala.data_inicio, Escala.estabelecimento_id).where(Escala.id.in_(missing))
+        )
+        session.info[ESCALA_LOOKUP] = {
+            row.id: (row.data_inicio, row.estabelecimento_id) for row in result
+        }
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _clear_checkin_escalas(session, flush_context):
+    session.info.pop(ESCALA_LOOKUP, None)
+
+
+def _escala_slice(connection, target, escala_id: int) -> Tuple:
+    """(data_inicio, estabelecimento_id) of a check-in's escala"""
+    if escala_id is None:
+        return None, None
+    session = object_session(target)
+    if session is not None:
+        escala = session.identity_map.get(identity_key(Escala, escala_id))
+        if escala is not None:
+            return escala.data_inicio, escala.estabelecimento_id
+        lookup = session.info.get(ESCALA_LOOKUP)
+        if lookup and escala_id in lookup:
+            return lookup[escala_id]
+    row = connection.execute(
+        select(Escala.data_inicio, Escala.estabelecimento_id).where(Escala.id == escala_id)
+    ).first()
+    return tuple(row) if row else (None, None)
+
+
+def _escala_key(target, previous: bool = False) -> Tuple:
+    value = _previous if previous else getattr
+    return (
+        value(target, "data_inicio"),
+        value(target, "estabelecimento_id"),
+        value(target, "status") or StatusEscalaEnum.PENDENTE
+    )
+
+
+def _checkin_key(connection, target, previous: bool = False) -> Tuple:
+    value = _previous if previous else getattr
+    return (
+        _as_date(value(target, "data_hora")),
+        _escala_slice(connection, target, value(target, "escala_id"))[1],
+        value(target, "status") or StatusCheckinEnum.REALIZADO
+    )
+
+
+def _move_checkins(connection, escala_id: int, old_estabelecimento_id: int, new_estabelecimento_id: int):
+    """Re-attribute an escala's check-ins after it changed establishment"""
+    dia = func.date(Checkin.data_hora)
+    rows = connection.execute(
+        select(dia.label("dia"), Checkin.status, func.count(Checkin.id).label("total"))
+        .where(Checkin.escala_id == escala_id)
+        .group_by(dia, Checkin.status)
+    )
+    for row in rows:
+        _bump(connection, RollupCheckinDiario, row.dia, old_estabelecimento_id, row.status, -row.total)
+        _bump(connection, RollupCheckinDiario, row.dia, new_estabelecimento_id, row.status, row.total)
+
+
+def _mark_stale_statement(dia, estabelecimento_id):
+    table = RollupDesempenhoPendente.__table__
+    stmt = mysql_insert(table).values(
+        dia=dia,
+        estabelecimento_id=estabelecimento_id,
+        marked_at=func.now()
+    )
+    return stmt.on_duplicate_key_update(marked_at=func.now())
+
+
+def _mark_stale(connection, dia, estabelecimento_id):
+    """
+    Flag a (dia, estabelecimento) slice of rollup_desempenho_diario as stale
+    Performance facts depend on every link and check-in of the slice's
+    escalas, so they are not patched here; desempenho_query aggregates
+    flagged slices live until reconcile_rollups() rebuilds them.
+    """
+    if dia is None or estabelecimento_id is None:
+        return
+    connection.execute(_mark_stale_statement(dia, estabelecimento_id))
+
+
+def _mark_checkin_stale(connection, target, previous: bool = False):
+    value = _previous if previous else getattr
+    _mark_stale(connection, *_escala_slice(connection, target, value(target, "escala_id")))
+
+
+@event.listens_for(Escala, "after_insert")
+def _escala_inserted(mapper, connection, target):
+    key = _escala_key(target)
+    _bump(connection, RollupEscalaDiaria, *key, 1)
+    _mark_stale(connection, key[0], key[1])
+
+
+@event.listens_for(Escala, "after_update")
+def _escala_updated(mapper, connection, target):
+    old_key = _escala_key(target, previous=True)
+    new_key = _escala_key(target)
+    if old_key != new_key:
+        _bump(connection, RollupEscalaDiaria, *old_key, -1)
+        _bump(connection, RollupEscalaDiaria, *new_key, 1)
+        _mark_stale(connection, old_key[0], old_key[1])
+        _mark_stale(connection, new_key[0], new_key[1])
+
+    if old_key[1] != new_key[1]:
+        _move_checkins(connection, target.id, old_key[1], new_key[1])
+
+
+@event.listens_for(Escala, "after_delete")
+def _escala_deleted(mapper, connection, target):
+    key = _escala_key(target, previous=True)
+    _bump(connection, RollupEscalaDiaria, *key, -1)
+    _mark_stale(connection, key[0], key[1])
+
+
+@event.listens_for(Checkin, "after_insert")
+def _checkin_inserted(mapper, connection, target):
+    _bump(connection, RollupCheckinDiario, *_checkin_key(connection, target), 1)
+    _mark_checkin_stale(connection, target)
+
+
+@event.listens_for(Checkin, "after_update")
+def _checkin_updated(mapper, connection, target):
+    old_key = _checkin_key(connection, target, previous=True)
+    new_key = _checkin_key(connection, target)
+    if old_key != new_key:
+        _bump(connection, RollupCheckinDiario, *old_key, -1)
+        _bump(connection, RollupCheckinDiario, *new_key, 1)
+
+    if any(
+        _previous(target, column) != getattr(target, column)
+        for column in ("escala_id", "usuario_id", "status", "data_hora")
+    ):
+        _mark_checkin_stale(connection, target, previous=True)
+        _mark_checkin_stale(connection, target)
+
+
+@event.listens_for(Checkin, "after_delete")
+def _checkin_deleted(mapper, connection, target):
+    _bump(connection, RollupCheckinDiario, *_checkin_key(connection, target, previous=True), -1)
+    _mark_checkin_stale(connection, target, previous=True)
+
+
+async def add_escala_totals(db: AsyncSession, escalas: Iterable[Dict[str, Any]]):
+    """
+    Count escalas inserted with a Core INSERT, which skips the mapper events
+    One upsert per (dia, estabelecimento, status) instead of one per escala
+    """
+    totals = Counter(
+        (escala["data_inicio"], escala["estabelecimento_id"], escala.get("status") or StatusEscalaEnum.PENDENTE)
+        for escala in escalas
+    )
+    for (dia, estabelecimento_id, status), total in totals.items():
+        await db.execute(_bump_statement(RollupEscalaDiaria, dia, estabelecimento_id, status, total))
+
+
+async def mark_escalas_stale(db: AsyncSession, escala_ids: Iterable[int]):
+    """
+    Flag the performance slices of escalas whose links (escala_usuarios)
+    or rows were written with Core statements, which skip the mapper events
+    One INSERT ... SELECT for all of them
+    """
+    escala_ids = set(escala_ids)
+    if not escala_ids:
+        return
+    table = RollupDesempenhoPendente.__table__
+    stmt = mysql_insert(table).from_select(
+        ["dia", "estabelecimento_id", "marked_at"],
+        select(Escala.data_inicio, Escala.estabelecimento_id, func.now())
+        .where(Escala.id.in_(escala_ids))
+        .distinct()
+    )
+    await db.execute(stmt.on_duplicate_key_update(marked_at=func.now()))
+
+
+# ========================================
+# RECONCILIATION
+# ========================================
+
+def _escala_source(start: Optional[date], end: Optional[date]):
+    query = select(
+        Escala.data_inicio.label("dia"),
+        Escala.estabelecimento_id,
+        Escala.status,
+        func.count(Escala.id).label("total")
+    ).group_by(Escala.data_inicio, Escala.estabelecimento_id, Escala.status)
+
+    if start:
+        query = query.where(Escala.data_inicio >= start)
+    if end:
+        query = query.where(Escala.data_inicio <= end)
+    return query
+
+
+def _checkin_source(start: Optional[date], end: Optional[date]):
+    dia = func.date(Checkin.data_hora)
+    query = select(
+        dia.label("dia"),
+        Escala.estabelecimento_id,
+        Checkin.status,
+        func.count(Checkin.id).label("total")
+    ).join(
+        Escala, Escala.id == Checkin.escala_id
+    ).group_by(dia, Escala.estabelecimento_id, Checkin.status)
+
+    if start:
+        query = query.where(Checkin.data_hora >= datetime.combine(start, datetime.min.time()))
+    if end:
+        query = query.where(Checkin.data_hora < datetime.combine(end + timedelta(days=1), datetime.min.time()))
+    return query
+
+
+def _desempenho_source(start: Optional[date], end: Optional[date], escala_ids=None):
+    """
+    Per user, day and establishment performance facts in a single scan
+    Check-ins are pre-grouped per (escala, usuario) so nothing is counted twice.
+    escala_ids, a select of escala ids, restricts both scans to those escalas.
+    """
+    checkin_conditions = []
+    if start:
+        checkin_conditions.append(Checkin.data_hora >= datetime.combine(start - timedelta(days=1), datetime.min.time()))
+    if end:
+        checkin_conditions.append(Checkin.data_hora < datetime.combine(end + timedelta(days=2), datetime.min.time()))
+
+    por_vinculo = select(
+        Checkin.escala_id,
+        Checkin.usuario_id,
+        func.count(Checkin.id).label("checkins"),
+        func.sum(case((Checkin.status == StatusCheckinEnum.REALIZADO, 1), else_=0)).label("realizados"),
+        func.sum(case((Checkin.status == StatusCheckinEnum.FORA_DE_LOCAL, 1), else_=0)).label("fora_local")
+    ).group_by(Checkin.escala_id, Checkin.usuario_id)
+    if escala_ids is not None:
+        checkin_conditions.append(Checkin.escala_id.in_(escala_ids))
+    if checkin_conditions:
+        por_vinculo = por_vinculo.where(and_(*checkin_conditions))
+    por_vinculo = por_vinculo.subquery()
+
+    query = select(
+        escala_usuarios.c.usuario_id,
+        Escala.data_inicio.label("dia"),
+        Escala.estabelecimento_id,
+        func.count(escala_usuarios.c.id).label("escalas"),
+        func.sum(case((Escala.status == StatusEscalaEnum.AUSENTE, 1), else_=0)).label("faltas"),
+        func.coalesce(func.sum(por_vinculo.c.checkins), 0).label("checkins"),
+        func.coalesce(func.sum(por_vinculo.c.realizados), 0).label("checkins_realizados"),
+        func.coalesce(func.sum(por_vinculo.c.fora_local), 0).label("checkins_fora_local")
+    ).select_from(escala_usuarios).join(
+        Escala, Escala.id == escala_usuarios.c.escala_id
+    ).outerjoin(
+        por_vinculo,
+        and_(
+            por_vinculo.c.escala_id == Escala.id,
+            por_vinculo.c.usuario_id == escala_usuarios.c.usuario_id
+        )
+    ).group_by(escala_usuarios.c.usuario_id, Escala.data_inicio, Escala.estabelecimento_id)
+
+    if start:
+        query = query.where(Escala.data_inicio >= start)
+    if end:
+        query = query.where(Escala.data_inicio <= end)
+    if escala_ids is not None:
+        query = query.where(Escala.id.in_(escala_ids))
+    return query
+
+
+COUNT_KEYS = ("dia", "estabelecimento_id", "status")
+COUNT_VALUES = ("total",)
+DESEMPENHO_KEYS = ("usuario_id", "dia", "estabelecimento_id")
+DESEMPENHO_VALUES = ("escalas", "faltas", "checkins", "checkins_realizados", "checkins_fora_local")
+STALE_GRACE = timedelta(minutes=10)
+
+
+async def _reconcile_table(
+    db: AsyncSession,
+    model,
+    source,
+    start: Optional[date],
+    end: Optional[date],
+    keys: Tuple[str, ...] = COUNT_KEYS,
+    values: Tuple[str, ...] = COUNT_VALUES
+) -> int:
+    """Replace model's rows in [start, end] with source; return rows that differed"""
+    conditions = []
+    if start:
+        conditions.append(model.dia >= start)
+    if end:
+        conditions.append(model.dia <= end)
+
+    def _key(row):
+        return tuple(_as_date(row._mapping[k]) if k == "dia" else row._mapping[k] for k in keys)
+
+    def _values(row):
+        return tuple(int(row._mapping[v] or 0) for v in values)
+
+    current_query = select(*(getattr(model, c) for c in keys + values))
+    if conditions:
+        current_query = current_query.where(and_(*conditions))
+
+    current = {
+        _key(row): _values(row)
+        for row in await db.execute(current_query)
+        if any(_values(row))
+    }
+    fresh = {_key(row): _values(row) for row in await db.execute(source)}
+    drift = sum(1 for key in current.keys() | fresh.keys() if current.get(key) != fresh.get(key))
+
+    delete_query = delete(model)
+    if conditions:
+        delete_query = delete_query.where(and_(*conditions))
+    await db.execute(delete_query)
+
+    if fresh:
+        now = datetime.now()
+        await db.execute(insert(model.__table__), [
+            {**dict(zip(keys, key)), **dict(zip(values, totals)), "updated_at": now}
+            for key, totals in fresh.items()
+        ])
+
+    return drift
+
+
+async def reconcile_rollups(
+    db: AsyncSession,
+    start: Optional[date] = None,
+    end: Optional[date] = None
+) -> Dict[str, Any]:
+    """
+    Rebuild rollups from escalas/checkins for [start, end] (everything when
+    both are None) and commit. Returns the number of corrected rows per table.
+    """
+    # Stale flags older than the rebuild are cleared with it; the grace period
+    # keeps flags from transactions still open when the rebuild read the facts
+    rebuilt_at = (await db.execute(select(func.now()))).scalar()
+
+    result = {}
+    for name, model, source, keys, values in (
+        ("rollup_escalas_diarias", RollupEscalaDiaria, _escala_source(start, end), COUNT_KEYS, COUNT_VALUES),
+        ("rollup_checkins_diarios", RollupCheckinDiario, _checkin_source(start, end), COUNT_KEYS, COUNT_VALUES),
+        ("rollup_desempenho_diario", RollupDesempenhoDiario, _desempenho_source(start, end), DESEMPENHO_KEYS, DESEMPENHO_VALUES),
+    ):
+        start_time = time.time()
+        drift = await _reconcile_table(db, model, source, start, end, keys, values)
+        record_rollup_reconcile(name, time.time() - start_time, drift)
+        result[name] = drift
+
+        if drift:
+            logger.warning(f"Rollup reconciliation corrected {drift} rows in {name}")
+
+    pendentes = [RollupDesempenhoPendente.marked_at < rebuilt_at - STALE_GRACE]
+    if start:
+        pendentes.append(RollupDesempenhoPendente.dia >= start)
+    if end:
+        pendentes.append(RollupDesempenhoPendente.dia <= end)
+    await db.execute(delete(RollupDesempenhoPendente).where(and_(*pendentes)))
+
+    await db.commit()
+    return result
+
+
+# ========================================
+# READS
+# ========================================
+
+async def _totals(db: AsyncSession, model, group_by, start: date, end: date, status=None) -> Dict[Any, int]:
+    conditions = [model.dia >= start, model.dia <= end]
+    if status is not None:
+        conditions.append(model.status == status)
+
+    result = await db.execute(
+        select(group_by, func.sum(model.total).label("total"))
+        .where(and_(*conditions))
+        .group_by(group_by)
+    )
+    return {row[0]: int(row.total or 0) for row in result}
+
+
+async def escalas_por_status(db: AsyncSession, start: date, end: date) -> Dict[StatusEscalaEnum, int]:
+    """Escala count per status for schedules starting in [start, end]"""
+    return await _totals(db, RollupEscalaDiaria, RollupEscalaDiaria.status, start, end)
+
+
+async def escalas_por_dia(
+    db: AsyncSession,
+    start: date,
+    end: date,
+    status: Optional[StatusEscalaEnum] = None
+) -> Dict[date, int]:
+    """Escala count per start day in [start, end]"""
+    return await _totals(db, RollupEscalaDiaria, RollupEscalaDiaria.dia, start, end, status)
+
+
+async def checkins_por_status(db: AsyncSession, start: date, end: date) -> Dict[StatusCheckinEnum, int]:
+    """Check-in count per status for check-ins made in [start, end]"""
+    return await _totals(db, RollupCheckinDiario, RollupCheckinDiario.status, start, end)
+
+
+async def checkins_por_dia(
+    db: AsyncSession,
+    start: date,
+    end: date,
+    status: Optional[StatusCheckinEnum] = None
+) -> Dict[date, int]:
+    """Check-in count per day in [start, end]"""
+    return await _totals(db, RollupCheckinDiario, RollupCheckinDiario.dia, start, end, status)
+
+
+def desempenho_query(start: date, end: date):
+    """
+    Performance totals per (usuario, estabelecimento) for [start, end]
+    Closed days come from rollup_desempenho_diario, except the slices flagged
+    in rollup_desempenho_pendente since the last reconciliation (late
+    check-ins, absences, edited escalas), which are aggregated live from
+    the fact tables together with today onwards.
+    """
+    today = date.today()
+    columns = ("usuario_id", "estabelecimento_id") + DESEMPENHO_VALUES
+    pendente = RollupDesempenhoPendente
+    parts = []
+
+    if start < today:
+        closed_end = min(end, today - timedelta(days=1))
+        model = RollupDesempenhoDiario
+        parts.append(
+            select(*(getattr(model, c) for c in columns))
+            .where(
+                model.dia >= start,
+                model.dia <= closed_end,
+                ~exists().where(
+                    pendente.dia == model.dia,
+                    pendente.estabelecimento_id == model.estabelecimento_id
+                )
+            )
+        )
+
+        stale_escalas = select(Escala.id).join(
+            pendente,
+            and_(
+                pendente.dia == Escala.data_inicio,
+                pendente.estabelecimento_id == Escala.estabelecimento_id
+            )
+        ).where(pendente.dia >= start, pendente.dia <= closed_end)
+        stale = _desempenho_source(start, closed_end, stale_escalas).subquery()
+        parts.append(select(*(stale.c[c] for c in columns)))
+
+    if end >= today:
+        live = _desempenho_source(max(start, today), end).subquery()
+        parts.append(select(*(live.c[c] for c in columns)))
+
+    facts = (union_all(*parts) if len(parts) > 1 else parts[0]).subquery()
+    return select(
+        facts.c.usuario_id,
+        facts.c.estabelecimento_id,
+        *(func.sum(facts.c[c]).label(c) for c in DESEMPENHO_VALUES)
+    ).group_by(facts.c.usuario_id, facts.c.estabelecimento_id)
@@ -0,0 +1,158 @@
+"""
+Worker boot: schema check and connection pool warm-up
+Replaces create_all on every start with a single read of the Alembic stamp
+"""
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Set
+
+from sqlalchemy import select, text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+from app.core.database import engine, AsyncSessionLocal, Base
+from app.core.models import Usuario
+from app.core.geofence import geofences
+from app.core.monitoring import record_startup_phase, record_first_request
+from app.services.escala_loader import load_escala_row
+
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
+
+class SchemaOutOfDateError(RuntimeError):
+    """Database revision does not match the migrations shipped with the code"""
+
+
+def migration_heads() -> Set[str]:
+    """Head revisions of the bundled migrations, read from the scripts only"""
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory(str(ALEMBIC_DIR)).get_heads())
+
+
+async def check_schema():
+    """
+    Compare the alembic_version stamp with the bundled heads in one query
+    Raises SchemaOutOfDateError on mismatch when DB_STARTUP_STRICT is set,
+    otherwise only logs it
+    """
+    heads = migration_heads()
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            current = set(result.scalars())
+    except DBAPIError:
+        current = set()
+
+    if current == heads:
+        return
+
+    message = (
+        f"Database at revision {sorted(current) or 'none'}, code expects {sorted(heads)}; "
+        f"run 'alembic upgrade head'"
+    )
+    if settings.DB_STARTUP_STRICT:
+        raise SchemaOutOfDateError(message)
+    logger.warning(message)
+
+
+async def create_schema():
+    """Create missing tables from the models (local development only)"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def _open_connection(hold: asyncio.Event):
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        await hold.wait()
+
+
+async def warm_up_pool():
+    """
+    Open DB_WARMUP_CONNECTIONS connections at once so the first requests
+    don't pay for the TCP and auth handshakes; they go back to the pool open
+    """
+    size = min(settings.DB_WARMUP_CONNECTIONS, engine.pool.size())
+    if size <= 0:
+        return
+
+    hold = asyncio.Event()
+    tasks = [asyncio.create_task(_open_connection(hold)) for _ in range(size)]
+    # Keep every connection checked out until all are open, otherwise the
+    # pool would hand the same one back each time
+    while engine.pool.checkedout() < size and not any(task.done() for task in tasks):
+        await asyncio.sleep(0.01)
+    hold.set()
+    await asyncio.gather(*tasks)
+
+
+async def warm_up_statements():
+    """
+    Run the statements behind authentication, schedule loading and check-in
+    geofencing once so their SQL is compiled and cached before real traffic
+    """
+    async with AsyncSessionLocal() as db:
+        await db.execute(select(Usuario).where(Usuario.id == 0))
+        await load_escala_row(db, 0)
+        await geofences.refresh(db)
+
+
+async def boot():
+    """Run the startup phases selected by DB_STARTUP_MODE and time each one"""
+    mode = settings.DB_STARTUP_MODE
+
+    if mode == "check":
+        start = time.perf_counter()
+        await check_schema()
+        record_startup_phase("schema_check", time.perf_counter() - start)
+    elif mode == "create_all":
+        start = time.perf_counter()
+        await create_schema()
+        record_startup_phase("create_all", time.perf_counter() - start)
+    elif mode != "skip":
+        raise ValueError(f"Invalid DB_STARTUP_MODE: {mode}")
+
+    if settings.DB_WARMUP_ENABLED:
+        start = time.perf_counter()
+        try:
+            await warm_up_pool()
+            await warm_up_statements()
+        except Exception as e:
+            # A cold worker is still a working worker
+            logger.warning(f"Database warm-up failed: {e}")
+        record_startup_phase("warm_up", time.perf_counter() - start)
+
+
+class FirstRequestMiddleware:
+    """
+    ASGI middleware recording the time from `started` until the worker
+    finished its first HTTP response; a flag check afterwards
+    """
+
+    def __init__(self, app, started: float):
+        self.app = app
+        self.started = started
+        self.served = False
+
+    async def __call__(self, scope, receive, send):
+        if self.served or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            await send(message)
+            if (
+                not self.served
+                and message["type"] == "http.response.body"
+                and not message.get("more_body", False)
+            ):
+                self.served = True
+                record_first_request(time.perf_counter() - self.started)
+
+        await self.app(scope, receive, send_wrapper)
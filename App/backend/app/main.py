@@ -2,17 +2,22 @@
 Sistema de Gestão Operacional - We Care
 Main FastAPI Application
 """
+import time
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 # from fastapi.middleware.trustedhosts import TrustedHostMiddleware  # Removido no FastAPI recente
 from contextlib import asynccontextmanager
 import sentry_sdk
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
 
+from app import BOOT_STARTED
 from app.core.config import settings
-from app.core.database import engine
-from app.core.models import Base
+from app.core.database import engine, replica_engine
+from app.core.audit import audit_writer
+from app.core.startup import boot, FirstRequestMiddleware
+from app.core.monitoring import record_worker_boot
 from app.api.v1.api import api_router
 
 
@@ -33,15 +38,25 @@ async def lifespan(app: FastAPI):
             traces_sample_rate=1.0,
         )
     
-    # Create database tables
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Check the migration stamp and warm the connection pool
+    await boot()
+    
+    # Start background audit log writer
+    if settings.AUDIT_LOG_ASYNC:
+        audit_writer.start()
+    
+    record_worker_boot(time.perf_counter() - BOOT_STARTED)
     
     yield
     
     # Shutdown
     print("🔒 Shutting down We Care System...")
+    
+    # Flush pending audit logs before closing the pool
+    await audit_writer.stop()
     await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
 
 
 app = FastAPI(
@@ -50,6 +65,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -69,6 +85,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Time-to-first-request metric
+app.add_middleware(FirstRequestMiddleware, started=BOOT_STARTED)
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
@@ -4,6 +4,7 @@ Pydantic schemas for Check-in operations
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional, List
+from uuid import UUID
 from pydantic import BaseModel, Field, validator
 
 from app.core.models import StatusCheckinEnum
@@ -28,6 +29,34 @@ class CheckinCreate(CheckinBase):
         return v
 
 
+class CheckinBatchItem(CheckinCreate):
+    """Check-in recorded offline by a mobile client"""
+    client_uuid: UUID
+    data_hora: datetime  # Client-side timestamp of the check-in
+
+
+class CheckinBatchRequest(BaseModel):
+    """Queue of offline check-ins to sync"""
+    checkins: List[CheckinBatchItem] = Field(..., min_length=1)
+
+
+class CheckinBatchResult(BaseModel):
+    """Outcome of one item in a batch sync"""
+    client_uuid: UUID
+    status: str  # created, duplicate or rejected
+    checkin_id: Optional[int] = None
+    checkin_status: Optional[StatusCheckinEnum] = None
+    detail: Optional[str] = None
+
+
+class CheckinBatchResponse(BaseModel):
+    """Per-item results of a batch sync"""
+    results: List[CheckinBatchResult]
+    created: int
+    duplicates: int
+    rejected: int
+
+
 class CheckinUpdate(BaseModel):
     """Schema for updating check-in (admin only)"""
     gps_lat: Optional[Decimal] = Field(None, ge=-90, le=90, decimal_places=8)
@@ -100,6 +129,7 @@ class LocationValidation(BaseModel):
     latitude: Decimal = Field(..., ge=-90, le=90)
     longitude: Decimal = Field(..., ge=-180, le=180)
     address: Optional[str] = None
+    estabelecimento_id: Optional[int] = None  # Validate against this site only
 
 
 # Simplified schemas for nested responses
@@ -117,6 +117,7 @@ class EscalaListResponse(BaseModel):
     page: int
     per_page: int
     total_pages: int
+    next_cursor: Optional[str] = None  # Keyset cursor for the following page
 
 
 class EscalaFilter(BaseModel):
@@ -129,6 +130,7 @@ class EscalaFilter(BaseModel):
     setor: Optional[str] = None  # Para filtrar por setor
     page: int = 1
     per_page: int = 20
+    cursor: Optional[str] = None  # Keyset pagination; takes precedence over page
 
 
 class EscalaStats(BaseModel):
@@ -146,12 +148,50 @@ class EscalaCalendarView(BaseModel):
     escalas: List[EscalaResponse]
 
 
+class EscalaBulkItem(EscalaCreate):
+    """Schedule in a bulk creation, optionally with its assigned users"""
+    usuarios: Optional[List[EscalaUsuarioCreate]] = None
+
+
 class EscalaBulkCreate(BaseModel):
     """Schema for bulk creating schedules"""
-    escalas: List[EscalaCreate]
+    escalas: List[EscalaBulkItem] = Field(..., min_length=1)
 
 
 class EscalaBulkUpdate(BaseModel):
     """Schema for bulk updating schedules"""
     escala_ids: List[int]
-    updates: EscalaUpdate 
\ No newline at end of file
+    updates: EscalaUpdate
+
+
+# ========================================
+# SCHEMAS PARA VALIDAÇÃO DE CONFLITOS
+# ========================================
+
+class AtribuicaoProposta(BaseModel):
+    """Proposed user assignment to a shift"""
+    usuario_id: int
+    data_inicio: date
+    data_fim: date
+    hora_inicio: time
+    hora_fim: time
+    escala_id: Optional[int] = None  # Existing schedule, excluded from its own conflicts
+
+
+class EscalaConflictCheck(BaseModel):
+    """Schema for validating assignments before saving"""
+    atribuicoes: List[AtribuicaoProposta] = Field(..., min_length=1)
+
+
+class EscalaConflito(BaseModel):
+    """A conflicting assignment"""
+    indice: int  # Position in atribuicoes
+    usuario_id: int
+    escala_id: Optional[int] = None  # Existing schedule it overlaps
+    indice_conflitante: Optional[int] = None  # Other proposal it overlaps
+
+
+class EscalaConflictResult(BaseModel):
+    """Schema for conflict validation response"""
+    valido: bool
+    conflitos: List[EscalaConflito]
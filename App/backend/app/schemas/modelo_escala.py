@@ -0,0 +1,83 @@
+"""
+Pydantic schemas for roster template (ModeloEscala) operations
+"""
+from datetime import datetime, date, time
+from typing import Optional, List
+from pydantic import BaseModel, Field, validator
+
+from app.core.models import PadraoEscalaEnum
+
+
+class ModeloEscalaMembro(BaseModel):
+    """User in a roster template"""
+    usuario_id: int
+    posicao: Optional[int] = Field(None, ge=0)  # Offset in days within the cycle; spread evenly when omitted
+
+
+class ModeloEscalaBase(BaseModel):
+    """Base schema for roster template data"""
+    nome: str = Field(..., max_length=100)
+    estabelecimento_id: int
+    setor_id: int
+    padrao: PadraoEscalaEnum
+    dias_trabalho: Optional[int] = Field(None, ge=1)  # Required for PERSONALIZADO, preset otherwise
+    dias_folga: Optional[int] = Field(None, ge=0)
+    hora_inicio: time
+    hora_fim: time
+    data_referencia: date  # First day of the cycle
+    observacoes: Optional[str] = None
+
+
+class ModeloEscalaCreate(ModeloEscalaBase):
+    """Schema for creating a roster template"""
+    membros: List[ModeloEscalaMembro] = Field(..., min_length=1)
+
+
+class ModeloEscalaUpdate(BaseModel):
+    """Schema for updating a roster template"""
+    nome: Optional[str] = Field(None, max_length=100)
+    setor_id: Optional[int] = None
+    padrao: Optional[PadraoEscalaEnum] = None
+    dias_trabalho: Optional[int] = Field(None, ge=1)
+    dias_folga: Optional[int] = Field(None, ge=0)
+    hora_inicio: Optional[time] = None
+    hora_fim: Optional[time] = None
+    data_referencia: Optional[date] = None
+    observacoes: Optional[str] = None
+    ativo: Optional[bool] = None
+    membros: Optional[List[ModeloEscalaMembro]] = Field(None, min_length=1)
+
+
+class ModeloEscalaResponse(ModeloEscalaBase):
+    """Schema for roster template response"""
+    id: int
+    dias_trabalho: int
+    dias_folga: int
+    ativo: bool
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    membros: List[ModeloEscalaMembro] = []
+
+    class Config:
+        from_attributes = True
+
+
+class ModeloEscalaGerar(BaseModel):
+    """Schema for expanding a roster template into schedules"""
+    data_inicio: date
+    data_fim: date
+
+    @validator('data_fim')
+    def validate_date_range(cls, v, values):
+        if 'data_inicio' in values and v < values['data_inicio']:
+            raise ValueError('Data fim deve ser posterior ou igual à data início')
+        return v
+
+
+class ModeloEscalaGerarResponse(BaseModel):
+    """Schema for roster expansion result"""
+    modelo_id: int
+    data_inicio: date
+    data_fim: date
+    escalas_criadas: int
+    atribuicoes_criadas: int
@@ -68,7 +68,14 @@ class RelatorioHorasResponse(BaseModel):
     total_horas: float
     total_plantoes: int
     media_horas_por_plantao: float
-    detalhes_plantoes: List[PlantaoDetalhe]
+    detalhes_plantoes: List[PlantaoDetalhe] = []  # Filled only when detalhes=true
+
+
+class RelatorioPlantaoHoras(PlantaoDetalhe):
+    """Schema for one worked shift in the hours detail listing"""
+    escala_id: int
+    usuario_id: int
+    usuario_nome: str
 
 
 class RelatorioAuditoria(BaseModel):
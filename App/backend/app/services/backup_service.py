@@ -174,6 +174,7 @@ def cleanup_old_documents_task():
     """
     from app.core.database import AsyncSessionLocal
     from app.core.models import Documento
+    from app.services.document_store import object_in_use
     from sqlalchemy import select
     import asyncio
     
@@ -199,8 +200,9 @@ def cleanup_old_documents_task():
                         for file in files:
                             file_path = os.path.join(root, file)
                             
-                            # Check if file is referenced in database
-                            if file_path not in existing_paths:
+                            # Check if file is referenced in database; stored blobs
+                            # count as referenced while a document links to them
+                            if file_path not in existing_paths and not object_in_use(file_path):
                                 # Check if file is older than 30 days
                                 file_modified = datetime.fromtimestamp(os.path.getmtime(file_path))
                                 if file_modified < datetime.now() - timedelta(days=30):
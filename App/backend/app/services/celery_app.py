@@ -2,8 +2,11 @@
 Celery configuration for background tasks
 """
 from celery import Celery
+from celery.schedules import crontab
 from app.core.config import settings
 
+DOCUMENTS_QUEUE = 'documents'
+
 # Create Celery instance
 celery_app = Celery(
     "wecare",
@@ -13,6 +16,8 @@ celery_app = Celery(
         "app.services.document_processor",
         "app.services.notification_service",
         "app.services.backup_service",
+        "app.services.rollup_service",
+        "app.services.report_service",
     ]
 )
 
@@ -31,9 +36,12 @@ celery_app.conf.update(
     
     # Task routing
     task_routes={
-        'app.services.document_processor.*': {'queue': 'documents'},
+        'app.services.document_processor.*': {'queue': DOCUMENTS_QUEUE},
         'app.services.notification_service.*': {'queue': 'notifications'},
         'app.services.backup_service.*': {'queue': 'maintenance'},
+        'app.services.rollup_service.*': {'queue': 'maintenance'},
+        'app.services.report_service.render_report_pdf_task': {'queue': 'reports'},
+        'app.services.report_service.cleanup_report_artifacts_task': {'queue': 'maintenance'},
     },
     
     # Periodic tasks (Celery Beat)
@@ -46,6 +54,14 @@ celery_app.conf.update(
             'task': 'app.services.backup_service.cleanup_old_logs_task',
             'schedule': 7 * 24 * 60 * 60.0,  # Weekly
         },
+        'reconcile-rollups': {
+            'task': 'app.services.rollup_service.reconcile_rollups_task',
+            'schedule': crontab(hour=3, minute=0),  # Nightly
+        },
+        'cleanup-report-artifacts': {
+            'task': 'app.services.report_service.cleanup_report_artifacts_task',
+            'schedule': 60 * 60.0,  # Hourly
+        },
         'check-missing-checkins': {
             'task': 'app.services.notification_service.check_missing_checkins_task',
             'schedule': 60 * 60.0,  # Hourly
@@ -2,189 +2,175 @@
 Document processing service with advanced OCR and NLP
 """
 import os
-import time
 import re
 import json
-from typing import Dict, Any, Optional, List
+from concurrent.futures import wait, FIRST_COMPLETED
+import gc
+import time
+from typing import Dict, Any, Optional, List, Callable, TYPE_CHECKING
 from datetime import datetime
 from PIL import Image, ImageEnhance, ImageFilter
-import pytesseract
-import cv2
-import numpy as np
 from celery import current_task
-import spacy
-from spacy.matcher import Matcher
+from celery.signals import worker_init, worker_process_init
 
-from app.services.celery_app import celery_app
+from app.services.celery_app import celery_app, DOCUMENTS_QUEUE
 from app.core.config import settings
 
-# Load Portuguese language model for NLP
-try:
-    nlp = spacy.load("pt_core_news_sm")
-except OSError:
-    # Fallback to English if Portuguese not available
-    nlp = spacy.load("en_core_web_sm")
+if TYPE_CHECKING:
+    from app.services.ocr_engine import OcrResult
 
-def enhance_image_quality(image_path: str) -> np.ndarray:
-    """Enhance image quality for better OCR results"""
-    # Read image
-    image = cv2.imread(image_path)
-    
-    # Convert to grayscale
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    
-    # Apply CLAHE (Contrast Limited Adaptive Histogram Equalization)
-    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-    enhanced = clahe.apply(gray)
-    
-    # Apply Gaussian blur to reduce noise
-    blurred = cv2.GaussianBlur(enhanced, (3, 3), 0)
-    
-    # Apply adaptive threshold
-    thresh = cv2.adaptiveThreshold(
-        blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
-    )
-    
-    # Morphological operations to clean up
-    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
-    cleaned = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
-    
-    return cleaned
+# spaCy, OpenCV and Tesseract are only imported by the first document task,
+# or by preload_models() in workers that consume the documents queue, so the
+# API and the other workers never pay for them
+_nlp = None
+_name_matcher = None
 
-def preprocess_image_for_ocr(image_path: str) -> np.ndarray:
-    """Advanced preprocessing for OCR"""
-    # Read image
-    image = cv2.imread(image_path)
-    
-    # Resize if too small
-    height, width = image.shape[:2]
-    if width < 800:
-        scale = 800 / width
-        image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
-    
-    # Convert to grayscale
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    
-    # Apply noise reduction
-    denoised = cv2.fastNlMeansDenoising(gray)
-    
-    # Enhance contrast
-    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
-    enhanced = clahe.apply(denoised)
-    
-    # Apply bilateral filter to preserve edges
-    filtered = cv2.bilateralFilter(enhanced, 9, 75, 75)
-    
-    # Apply Otsu's thresholding
-    _, thresh = cv2.threshold(filtered, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    
-    return thresh
+def get_nlp():
+    """Load the spaCy model on first use"""
+    global _nlp
+    if _nlp is None:
+        import spacy
+        try:
+            _nlp = spacy.load(settings.SPACY_MODEL)
+        except OSError:
+            # Fallback to English if Portuguese not available
+            _nlp = spacy.load("en_core_web_sm")
+    return _nlp
 
-def extract_text_with_multiple_methods(image_path: str) -> Dict[str, str]:
-    """Extract text using multiple OCR methods for better accuracy"""
-    results = {}
-    
-    try:
-        # Method 1: Standard preprocessing
-        processed1 = preprocess_image_for_ocr(image_path)
-        config1 = '--oem 3 --psm 6 -l por'
-        if settings.TESSERACT_PATH:
-            pytesseract.pytesseract.tesseract_cmd = settings.TESSERACT_PATH
-        
-        text1 = pytesseract.image_to_string(processed1, config=config1)
-        results['standard'] = text1.strip()
-        
-        # Method 2: Enhanced preprocessing
-        processed2 = enhance_image_quality(image_path)
-        text2 = pytesseract.image_to_string(processed2, config=config1)
-        results['enhanced'] = text2.strip()
-        
-        # Method 3: Different PSM modes
-        config3 = '--oem 3 --psm 3 -l por'  # Fully automatic page segmentation
-        text3 = pytesseract.image_to_string(processed1, config=config3)
-        results['auto_segmentation'] = text3.strip()
-        
-        # Method 4: With confidence scores
-        data = pytesseract.image_to_data(processed1, config=config1, output_type=pytesseract.Output.DICT)
-        high_confidence_text = []
-        for i, conf in enumerate(data['conf']):
-            if conf > 60:  # Only text with confidence > 60%
-                high_confidence_text.append(data['text'][i])
-        results['high_confidence'] = ' '.join(high_confidence_text)
+def get_name_matcher():
+    """Matcher for the name patterns, built once per process"""
+    global _name_matcher
+    if _name_matcher is None:
+        from spacy.matcher import Matcher
         
-    except Exception as e:
-        print(f"Error in OCR processing: {e}")
-        results['error'] = str(e)
+        name_patterns = [
+            [{"POS": "PROPN"}, {"POS": "PROPN"}],  # Two proper nouns
+            [{"LOWER": "nome"}, {"IS_TITLE": True}, {"IS_TITLE": True}],
+            [{"LOWER": "nome"}, {"POS": "PROPN"}, {"POS": "PROPN"}],
+        ]
+        _name_matcher = Matcher(get_nlp().vocab)
+        for pattern in name_patterns:
+            _name_matcher.add("NAME", [pattern])
+    return _name_matcher
+
+def preload_models():
+    """Import the OCR libraries and load the NLP model ahead of the first task"""
+    import app.services.ocr_engine  # noqa: F401 - cv2, numpy, pytesseract
+    get_name_matcher()
+
+@worker_init.connect
+def preload_in_parent(sender=None, **kwargs):
+    """
+    Runs in the worker parent before the pool forks: children then share the
+    model pages copy-on-write instead of each loading its own copy. Workers
+    started without the documents queue (-Q) skip it.
+    """
+    if not settings.DOCUMENT_PRELOAD_MODELS or sender is None:
+        return
+    if DOCUMENTS_QUEUE not in sender.app.amqp.queues.consume_from:
+        return
+    
+    start = time.perf_counter()
+    preload_models()
+    # Keep the collector from touching (and so copying) the preloaded objects
+    gc.freeze()
+    print(f"Document models preloaded in {time.perf_counter() - start:.1f}s")
+
+@worker_process_init.connect
+def reset_after_fork(**kwargs):
+    """Thread pools don't survive fork; each child creates its own"""
+    from app.services import ocr_engine
     
-    return results
+    ocr_engine.reset_executors()
+
+def _merge_timings(timings: Optional[Dict[str, float]], result: "OcrResult"):
+    if timings is not None:
+        for name, elapsed in result.timings.items():
+            timings[name] = timings.get(name, 0.0) + elapsed
 
-def extract_text_from_image(image_path: str) -> str:
+def extract_text_from_image(image_path: str, timings: Optional[Dict[str, float]] = None) -> str:
     """Extract text from image using best OCR method"""
-    try:
-        # Try multiple methods
-        results = extract_text_with_multiple_methods(image_path)
-        
-        # Choose the best result based on length and content
-        best_text = ""
-        best_score = 0
-        
-        for method, text in results.items():
-            if method == 'error':
-                continue
-            
-            # Score based on text length and presence of common words
-            score = len(text)
-            common_words = ['nome', 'cpf', 'rg', 'data', 'nascimento', 'endereço', 'telefone']
-            for word in common_words:
-                if word.lower() in text.lower():
-                    score += 10
-            
-            if score > best_score:
-                best_score = score
-                best_text = text
-        
-        return best_text if best_text else results.get('standard', '')
-        
-    except Exception as e:
-        print(f"Error extracting text from image: {e}")
-        return ""
+    from app.services.ocr_engine import ocr_image
+    
+    result = ocr_image(image_path)
+    _merge_timings(timings, result)
+    return result.text
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    """Extract text from PDF using advanced methods"""
+def extract_text_from_pdf(
+    pdf_path: str,
+    timings: Optional[Dict[str, float]] = None,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> str:
+    """
+    Extract text from PDF using advanced methods
+    Scanned pages are rendered straight to grayscale arrays and OCR'd in
+    parallel, at most OCR_MAX_PAGES of them; progress(done, total) is
+    called as each page finishes
+    """
     try:
         import fitz  # PyMuPDF
+        from app.services.ocr_engine import ocr_image, pixmap_to_array, get_page_executor, stage
         
         doc = fitz.open(pdf_path)
-        all_text = []
-        
-        for page_num in range(len(doc)):
-            page = doc[page_num]
+        try:
+            page_texts = [""] * len(doc)
+            scanned = []
             
             # Method 1: Direct text extraction
-            page_text = page.get_text()
+            for page_num in range(len(doc)):
+                page_text = doc[page_num].get_text()
+                if page_text.strip():
+                    page_texts[page_num] = page_text
+                else:
+                    scanned.append(page_num)
             
-            if page_text.strip():
-                all_text.append(page_text)
-            else:
-                # Method 2: OCR for scanned pages
-                pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # Higher resolution
-                img_data = pix.tobytes("png")
-                
-                # Save temporary image
-                temp_img_path = f"/tmp/temp_page_{page_num}_{int(time.time())}.png"
-                with open(temp_img_path, "wb") as f:
-                    f.write(img_data)
-                
-                # Extract text from image
-                ocr_text = extract_text_from_image(temp_img_path)
-                all_text.append(ocr_text)
+            if len(scanned) > settings.OCR_MAX_PAGES:
+                print(f"OCR limited to {settings.OCR_MAX_PAGES} of {len(scanned)} scanned pages in {pdf_path}")
+                scanned = scanned[:settings.OCR_MAX_PAGES]
+            
+            # Method 2: OCR for scanned pages, each rendered once a worker slot is free
+            if scanned:
+                executor = get_page_executor()
+                pending = {}
+                done = 0
+            
+                def collect(futures):
+                    nonlocal done
+                    for future in futures:
+                        page_num, _pix = pending.pop(future)
+                        result = future.result()
+                        _merge_timings(timings, result)
+                        page_texts[page_num] = result.text
+                        done += 1
+                        if progress:
+                            progress(done, len(scanned))
+            
+                page_timings: Dict[str, float] = {}
+                with stage(page_timings, "pdf_ocr"):
+                    for page_num in scanned:
+                        if len(pending) >= settings.OCR_PAGE_WORKERS:
+                            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                            collect(finished)
+                    
+                        with stage(page_timings, "render"):
+                            pix = doc[page_num].get_pixmap(
+                                matrix=fitz.Matrix(2, 2),  # Higher resolution
+                                colorspace=fitz.csGRAY
+                            )
+                        # The pixmap stays referenced until its page is collected
+                        pending[executor.submit(ocr_image, pixmap_to_array(pix))] = (page_num, pix)
                 
-                # Clean up temp file
-                if os.path.exists(temp_img_path):
-                    os.unlink(temp_img_path)
+                    while pending:
+                        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        collect(finished)
+            
+                if timings is not None:
+                    for name, elapsed in page_timings.items():
+                        timings[name] = timings.get(name, 0.0) + elapsed
+        finally:
+            doc.close()
         
-        doc.close()
-        return "\n".join(all_text).strip()
+        return "\n".join(text for text in page_texts if text).strip()
         
     except Exception as e:
         print(f"Error extracting text from PDF: {e}")
@@ -313,20 +299,10 @@ def extract_data_nascimento(text: str) -> Optional[str]:
 def extract_nome(text: str) -> Optional[str]:
     """Extract name from text using NLP"""
     try:
-        doc = nlp(text)
+        doc = get_nlp()(text)
         
         # Look for name patterns
-        name_patterns = [
-            [{"POS": "PROPN"}, {"POS": "PROPN"}],  # Two proper nouns
-            [{"LOWER": "nome"}, {"IS_TITLE": True}, {"IS_TITLE": True}],
-            [{"LOWER": "nome"}, {"POS": "PROPN"}, {"POS": "PROPN"}],
-        ]
-        
-        matcher = Matcher(nlp.vocab)
-        for pattern in name_patterns:
-            matcher.add("NAME", [pattern])
-        
-        matches = matcher(doc)
+        matches = get_name_matcher()(doc)
         for match_id, start, end in matches:
             name = doc[start:end].text
             if len(name.split()) >= 2:  # At least first and last name
@@ -468,9 +444,12 @@ def process_document_data(text: str, document_type: str) -> Dict[str, Any]:
 def process_document_task(self, document_id: int):
     """Celery task to process document asynchronously"""
     from app.core.database import get_db
-    from app.core.models import Documento
+    from app.core.models import Documento, DocumentoCache
+    from app.core.monitoring import record_cache_access
+    from app.services.document_store import file_sha256
     from sqlalchemy.ext.asyncio import AsyncSession
-    from sqlalchemy import select
+    from sqlalchemy import select, update, func
+    from sqlalchemy.dialects.mysql import insert as mysql_insert
     
     async def _process():
         async for db in get_db():
@@ -494,18 +473,59 @@ def process_document_task(self, document_id: int):
                 if not os.path.exists(file_path):
                     raise Exception(f"File not found: {file_path}")
                 
-                if file_path.lower().endswith('.pdf'):
-                    text = extract_text_from_pdf(file_path)
-                else:
-                    text = extract_text_from_image(file_path)
+                timings: Dict[str, float] = {}
                 
-                self.update_state(
-                    state='PROGRESS',
-                    meta={'current': 50, 'total': 100, 'status': 'Processing extracted text...'}
-                )
+                # Same content and type processed before: reuse the extraction
+                if not document.conteudo_hash:
+                    document.conteudo_hash = file_sha256(file_path)
+                cache_key = (document.conteudo_hash, document.tipo_documento)
+                cached = None
+                if settings.DOCUMENT_RESULT_CACHE_ENABLED:
+                    cached = await db.get(DocumentoCache, cache_key)
+                    record_cache_access("documento_resultados", hit=cached is not None)
                 
-                # Process extracted data
-                extracted_data = process_document_data(text, document.tipo_documento)
+                if cached is not None:
+                    extracted_data = cached.dados_extraidos
+                    await db.execute(
+                        update(DocumentoCache)
+                        .where(
+                            DocumentoCache.conteudo_hash == cache_key[0],
+                            DocumentoCache.tipo_documento == cache_key[1]
+                        )
+                        .values(hits=DocumentoCache.hits + 1, last_hit_at=func.now())
+                    )
+                else:
+                    def report_pages(done: int, total: int):
+                        self.update_state(
+                            state='PROGRESS',
+                            meta={'current': 10 + 40 * done // total, 'total': 100, 'status': f'OCR: page {done}/{total}...'}
+                        )
+                    
+                    if file_path.lower().endswith('.pdf'):
+                        text = extract_text_from_pdf(file_path, timings, report_pages)
+                    else:
+                        text = extract_text_from_image(file_path, timings)
+                    
+                    self.update_state(
+                        state='PROGRESS',
+                        meta={'current': 50, 'total': 100, 'status': 'Processing extracted text...'}
+                    )
+                    
+                    # Process extracted data
+                    extracted_data = process_document_data(text, document.tipo_documento)
+                    
+                    if settings.DOCUMENT_RESULT_CACHE_ENABLED:
+                        stmt = mysql_insert(DocumentoCache).values(
+                            conteudo_hash=cache_key[0],
+                            tipo_documento=cache_key[1],
+                            dados_extraidos=extracted_data,
+                            texto_ocr=text,
+                            hits=0
+                        )
+                        await db.execute(stmt.on_duplicate_key_update(
+                            dados_extraidos=stmt.inserted.dados_extraidos,
+                            texto_ocr=stmt.inserted.texto_ocr
+                        ))
                 
                 self.update_state(
                     state='PROGRESS',
@@ -528,7 +548,9 @@ def process_document_task(self, document_id: int):
                         'result': {
                             'document_id': document_id,
                             'extracted_fields': len([k for k, v in extracted_data.items() if v and k not in ['document_type', 'extraction_timestamp', 'quality_analysis']]),
-                            'confidence_score': extracted_data['quality_analysis']['confidence_score']
+                            'confidence_score': extracted_data['quality_analysis']['confidence_score'],
+                            'cached': cached is not None,
+                            'timings': {stage: round(elapsed, 3) for stage, elapsed in timings.items()}
                         }
                     }
                 )
@@ -0,0 +1,103 @@
+"""
+Content-addressed storage for uploaded documents
+Each distinct file is kept once under UPLOAD_PATH/objects, named by its
+SHA-256, and hardlinked into the owner's directory. The filesystem link
+count is the reference count: a blob whose count drops to 1 is only
+referenced by the store itself and can be removed.
+"""
+import hashlib
+import os
+from typing import Optional
+
+from app.core.config import settings
+
+
+OBJECTS_DIR = "objects"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def objects_root() -> str:
+    return os.path.join(settings.UPLOAD_PATH, OBJECTS_DIR)
+
+
+def object_path(digest: str) -> str:
+    """Path of the stored blob for a SHA-256 hex digest"""
+    return os.path.join(objects_root(), digest[:2], digest)
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file on disk, read in chunks"""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _fsync_dir(path: str) -> None:
+    """Persist the directory entry created by a link or rename (POSIX only)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def commit_file(temp_path: str, digest: str, dest_path: str) -> bool:
+    """
+    Move a fully written upload from temp_path to dest_path, sharing the
+    blob with earlier identical uploads
+
+    Returns True when the content was already stored. On filesystems
+    without hardlinks the upload is simply renamed into place.
+    """
+    blob = object_path(digest)
+    os.makedirs(os.path.dirname(blob), exist_ok=True)
+
+    duplicate = os.path.exists(blob)
+    try:
+        if not duplicate:
+            try:
+                os.link(temp_path, blob)
+            except FileExistsError:
+                # An identical upload finished first
+                duplicate = True
+        os.link(blob, dest_path)
+    except OSError:
+        os.replace(temp_path, dest_path)
+        _fsync_dir(os.path.dirname(dest_path))
+        return False
+
+    os.unlink(temp_path)
+    if not duplicate:
+        _fsync_dir(os.path.dirname(blob))
+    _fsync_dir(os.path.dirname(dest_path))
+    return duplicate
+
+
+def release_file(path: str, digest: Optional[str]) -> None:
+    """Remove a document's file and its blob once nothing else links to it"""
+    if path and os.path.exists(path):
+        os.remove(path)
+
+    if not digest:
+        return
+    blob = object_path(digest)
+    try:
+        if os.stat(blob).st_nlink <= 1:
+            os.remove(blob)
+    except FileNotFoundError:
+        pass
+
+
+def object_in_use(path: str) -> bool:
+    """True for a blob under objects/ that a user file still links to"""
+    root = os.path.abspath(objects_root())
+    if not os.path.abspath(path).startswith(root + os.sep):
+        return False
+    return os.stat(path).st_nlink > 1
@@ -0,0 +1,241 @@
+"""
+Bulk schedule creation
+Validates every referenced establishment, supervisor, user and setor with
+one IN query each and writes escalas and their links with multi-row INSERTs
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import select, text, Table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ValidationError
+from app.core.models import (
+    Escala, Estabelecimento, Usuario, Setor, PerfilEnum, StatusEscalaEnum,
+    escala_usuarios, escala_supervisores
+)
+from app.core.rollups import add_escala_totals, mark_escalas_stale
+from app.schemas.escala import EscalaBulkItem
+from app.services.escala_conflicts import ProposedAssignment, find_conflicts
+from app.services.escala_loader import EscalaRow
+
+
+INSERT_CHUNK_SIZE = 1000
+
+
+async def _insert_returning_ids(
+    db: AsyncSession,
+    table: Table,
+    rows: List[Dict[str, Any]],
+    key_columns: Tuple[str, ...]
+) -> List[int]:
+    """
+    Insert rows with multi-row INSERT statements and return their ids in order
+
+    MySQL reports the first id of a multi-row INSERT as lastrowid, and InnoDB
+    allocates the ids of a simple multi-row INSERT as one run spaced by
+    auto_increment_increment (greater than 1 on multi-primary setups). The
+    computed ids are read back with key_columns and compared with what was
+    written, so a different allocation fails the transaction instead of
+    linking rows to the wrong parents.
+    """
+    step = (await db.execute(text("SELECT @@auto_increment_increment"))).scalar() or 1
+    columns = [table.c[name] for name in key_columns]
+
+    ids = []
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        chunk = rows[start:start + INSERT_CHUNK_SIZE]
+        result = await db.execute(table.insert().values(chunk))
+        chunk_ids = list(range(result.lastrowid, result.lastrowid + step * len(chunk), step))
+
+        written = await db.execute(select(table.c.id, *columns).where(table.c.id.in_(chunk_ids)))
+        found = {row[0]: tuple(row[1:]) for row in written}
+        for row_id, values in zip(chunk_ids, chunk):
+            if found.get(row_id) != tuple(values[name] for name in key_columns):
+                raise RuntimeError(
+                    f"Ids allocated for {table.name} are not a single run from {result.lastrowid} "
+                    f"with step {step}; bulk insert aborted"
+                )
+        ids.extend(chunk_ids)
+    return ids
+
+
+async def insert_escalas(
+    db: AsyncSession,
+    escala_values: List[Dict[str, Any]],
+    atribuicoes: List[List[Dict[str, Any]]]
+) -> Tuple[List[int], List[int]]:
+    """
+    Insert already validated escalas and their escala_usuarios rows
+    atribuicoes[i] holds the usuario_id/setor_id/status dicts of escala_values[i].
+    Returns the escala ids and the escala_usuarios ids, both in input order.
+    """
+    escala_ids = await _insert_returning_ids(
+        db, Escala.__table__, escala_values,
+        ("estabelecimento_id", "data_inicio", "hora_inicio")
+    )
+
+    vinculo_values = [
+        {
+            "escala_id": escala_id,
+            "usuario_id": atribuicao["usuario_id"],
+            "setor_id": atribuicao["setor_id"],
+            "status": atribuicao.get("status") or "Pendente",
+            "created_at": values["created_at"]
+        }
+        for escala_id, values, escala_atribuicoes in zip(escala_ids, escala_values, atribuicoes)
+        for atribuicao in escala_atribuicoes
+    ]
+    vinculo_ids = await _insert_returning_ids(
+        db, escala_usuarios, vinculo_values, ("escala_id", "usuario_id")
+    ) if vinculo_values else []
+
+    # Core INSERTs bypass the rollup mapper events
+    await add_escala_totals(db, escala_values)
+    await mark_escalas_stale(db, escala_ids)
+
+    return escala_ids, vinculo_ids
+
+
+def _pessoa(usuario) -> Dict[str, Any]:
+    return {
+        "id": usuario.id,
+        "nome": usuario.nome,
+        "email": usuario.email,
+        "perfil": usuario.perfil.value
+    }
+
+
+async def create_escalas_bulk(db: AsyncSession, items: List[EscalaBulkItem]) -> List[EscalaRow]:
+    """
+    Validate and insert items with their assigned users and supervisors
+
+    Raises ValidationError with details["errors"] listing every problem found;
+    nothing is written in that case. The caller commits.
+    """
+    estabelecimento_ids = {item.estabelecimento_id for item in items}
+    supervisor_ids = {sid for item in items for sid in item.supervisores_ids or []}
+    usuario_ids = {u.usuario_id for item in items for u in item.usuarios or []}
+    setor_ids = {u.setor_id for item in items for u in item.usuarios or []}
+
+    result = await db.execute(
+        select(Estabelecimento.id, Estabelecimento.nome, Estabelecimento.endereco)
+        .where(Estabelecimento.id.in_(estabelecimento_ids))
+    )
+    estabelecimentos = {row.id: row for row in result}
+
+    supervisores = {}
+    if supervisor_ids:
+        result = await db.execute(
+            select(Usuario.id, Usuario.nome, Usuario.email, Usuario.perfil).where(
+                Usuario.id.in_(supervisor_ids),
+                Usuario.perfil.in_([PerfilEnum.SUPERVISOR, PerfilEnum.ADMINISTRADOR])
+            )
+        )
+        supervisores = {row.id: row for row in result}
+
+    usuarios = {}
+    if usuario_ids:
+        result = await db.execute(
+            select(Usuario.id, Usuario.nome, Usuario.email, Usuario.perfil)
+            .where(Usuario.id.in_(usuario_ids))
+        )
+        usuarios = {row.id: row for row in result}
+
+    setores = {}
+    if setor_ids:
+        result = await db.execute(
+            select(Setor.id, Setor.nome).where(Setor.id.in_(setor_ids), Setor.ativo == True)
+        )
+        setores = {row.id: row for row in result}
+
+    errors = []
+    proposals = []
+    owners = []
+    for i, item in enumerate(items, 1):
+        if item.estabelecimento_id not in estabelecimentos:
+            errors.append(f"Schedule {i}: Establishment not found")
+        for supervisor_id in item.supervisores_ids or []:
+            if supervisor_id not in supervisores:
+                errors.append(f"Schedule {i}: Usuário {supervisor_id} não é um supervisor válido")
+        for atribuicao in item.usuarios or []:
+            if atribuicao.usuario_id not in usuarios:
+                errors.append(f"Schedule {i}: Usuário {atribuicao.usuario_id} não encontrado")
+            if atribuicao.setor_id not in setores:
+                errors.append(f"Schedule {i}: Setor com ID {atribuicao.setor_id} não encontrado ou inativo")
+            proposals.append(ProposedAssignment(
+                usuario_id=atribuicao.usuario_id,
+                data_inicio=item.data_inicio,
+                data_fim=item.data_fim,
+                hora_inicio=item.hora_inicio,
+                hora_fim=item.hora_fim
+            ))
+            owners.append(i)
+
+    for conflict in await find_conflicts(db, proposals):
+        errors.append(
+            f"Schedule {owners[conflict.indice]}: Usuário {conflict.usuario_id} já possui escala conflitante neste horário"
+        )
+
+    if errors:
+        raise ValidationError("Some schedules could not be created", {"errors": errors})
+
+    now = datetime.now()
+    escala_values = [
+        {
+            "data_inicio": item.data_inicio,
+            "data_fim": item.data_fim,
+            "hora_inicio": item.hora_inicio,
+            "hora_fim": item.hora_fim,
+            "estabelecimento_id": item.estabelecimento_id,
+            "observacoes": item.observacoes,
+            "status": StatusEscalaEnum.PENDENTE,
+            "created_at": now
+        }
+        for item in items
+    ]
+    escala_ids, vinculo_ids = await insert_escalas(db, escala_values, [
+        [atribuicao.dict() for atribuicao in item.usuarios or []]
+        for item in items
+    ])
+
+    supervisor_values = [
+        {"escala_id": escala_id, "usuario_id": supervisor_id, "created_at": now}
+        for escala_id, item in zip(escala_ids, items)
+        for supervisor_id in dict.fromkeys(item.supervisores_ids or [])
+    ]
+    if supervisor_values:
+        await db.execute(escala_supervisores.insert(), supervisor_values)
+
+    # Hydrate the response from the validated data
+    rows = []
+    vinculos = iter(vinculo_ids)
+    for escala_id, item, values in zip(escala_ids, items, escala_values):
+        estabelecimento = estabelecimentos[item.estabelecimento_id]
+        row = EscalaRow(
+            id=escala_id,
+            updated_at=None,
+            estabelecimento={
+                "id": estabelecimento.id,
+                "nome": estabelecimento.nome,
+                "endereco": estabelecimento.endereco
+            },
+            **values
+        )
+        for atribuicao in item.usuarios or []:
+            setor = setores[atribuicao.setor_id]
+            row.usuarios_atribuidos.append({
+                "id": next(vinculos),
+                "usuario_id": atribuicao.usuario_id,
+                "setor_id": atribuicao.setor_id,
+                "setor": {"id": setor.id, "nome": setor.nome},
+                "status": atribuicao.status,
+                "usuario": _pessoa(usuarios[atribuicao.usuario_id])
+            })
+        row.supervisores = [
+            _pessoa(supervisores[supervisor_id])
+            for supervisor_id in dict.fromkeys(item.supervisores_ids or [])
+        ]
+        rows.append(row)
+
+    return rows
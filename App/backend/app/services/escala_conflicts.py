@@ -0,0 +1,145 @@
+"""
+Shift conflict detection
+Checks proposed user assignments against each other and against existing
+escalas with a per-user sorted sweep over [start, end) datetime intervals
+"""
+import heapq
+from dataclasses import dataclass
+from datetime import date, time, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.models import Escala, escala_usuarios
+
+
+@dataclass
+class ProposedAssignment:
+    """A user that would work a shift"""
+    usuario_id: int
+    data_inicio: date
+    data_fim: date
+    hora_inicio: time
+    hora_fim: time
+    escala_id: Optional[int] = None  # Set when the shift already exists (updates, new assignments)
+
+
+@dataclass
+class Conflict:
+    """A proposal that overlaps an existing escala or another proposal"""
+    indice: int
+    usuario_id: int
+    escala_id: Optional[int] = None  # Conflicting existing escala
+    indice_conflitante: Optional[int] = None  # Conflicting proposal in the same request
+
+
+def shift_interval(data_inicio: date, data_fim: date, hora_inicio: time, hora_fim: time) -> Tuple[datetime, datetime]:
+    """
+    Half-open [start, end) interval covered by a shift
+    A shift ending at or before its start time on the same day runs overnight
+    """
+    start = datetime.combine(data_inicio, hora_inicio)
+    end = datetime.combine(data_fim, hora_fim)
+    if end <= start:
+        end += timedelta(days=1)
+    return start, end
+
+
+def existing_shifts_query(usuario_ids: Iterable[int], window_start: date, window_end: date):
+    """
+    Existing shifts of these users that may overlap [window_start, window_end]
+    The extra day catches overnight shifts that started the day before
+    """
+    return select(
+        escala_usuarios.c.usuario_id,
+        Escala.id,
+        Escala.data_inicio,
+        Escala.data_fim,
+        Escala.hora_inicio,
+        Escala.hora_fim
+    ).join(
+        Escala, Escala.id == escala_usuarios.c.escala_id
+    ).where(
+        and_(
+            escala_usuarios.c.usuario_id.in_(usuario_ids),
+            Escala.data_inicio <= window_end,
+            Escala.data_fim >= window_start - timedelta(days=1)
+        )
+    )
+
+
+async def find_conflicts(
+    db: AsyncSession,
+    proposals: List[ProposedAssignment],
+    ignore_escala_ids: Iterable[int] = ()
+) -> List[Conflict]:
+    """
+    Return every proposal that collides with another shift of the same user
+
+    Existing shifts for all users involved are loaded with a single query
+    over the window spanned by the proposals; ignore_escala_ids excludes
+    shifts that are being replaced.
+    """
+    if not proposals:
+        return []
+
+    intervals = [
+        shift_interval(p.data_inicio, p.data_fim, p.hora_inicio, p.hora_fim)
+        for p in proposals
+    ]
+    window_start = min(start for start, _ in intervals)
+    window_end = max(end for _, end in intervals)
+    usuario_ids = {p.usuario_id for p in proposals}
+    ignored = set(ignore_escala_ids)
+
+    result = await db.execute(
+        existing_shifts_query(usuario_ids, window_start.date(), window_end.date())
+    )
+
+    # Per-user events: (start, end, is_proposal, ref, escala_id)
+    events: Dict[int, List[Tuple[datetime, datetime, bool, Any, Optional[int]]]] = {}
+    for row in result:
+        if row.id in ignored:
+            continue
+        start, end = shift_interval(row.data_inicio, row.data_fim, row.hora_inicio, row.hora_fim)
+        events.setdefault(row.usuario_id, []).append((start, end, False, row.id, row.id))
+
+    for i, (proposal, (start, end)) in enumerate(zip(proposals, intervals)):
+        events.setdefault(proposal.usuario_id, []).append((start, end, True, i, proposal.escala_id))
+
+    conflicts = []
+    for usuario_id, user_events in events.items():
+        user_events.sort(key=lambda e: (e[0], e[1]))
+        active: List[Tuple[datetime, int]] = []  # heap of (end, position)
+
+        for position, (start, end, is_proposal, ref, escala_id) in enumerate(user_events):
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+
+            for _, other_position in active:
+                _, _, other_is_proposal, other_ref, other_escala_id = user_events[other_position]
+                if not (is_proposal or other_is_proposal):
+                    continue
+                if escala_id is not None and escala_id == other_escala_id:
+                    continue
+
+                if is_proposal and other_is_proposal:
+                    conflicts.append(Conflict(indice=ref, usuario_id=usuario_id, indice_conflitante=other_ref))
+                elif is_proposal:
+                    conflicts.append(Conflict(indice=ref, usuario_id=usuario_id, escala_id=other_ref))
+                else:
+                    conflicts.append(Conflict(indice=other_ref, usuario_id=usuario_id, escala_id=ref))
+
+            heapq.heappush(active, (end, position))
+
+    conflicts.sort(key=lambda c: c.indice)
+    return conflicts
+
+
+async def escala_user_ids(db: AsyncSession, escala_id: int) -> List[int]:
+    """Users currently assigned to an escala"""
+    result = await db.execute(
+        select(escala_usuarios.c.usuario_id).where(escala_usuarios.c.escala_id == escala_id)
+    )
+    return list(result.scalars())
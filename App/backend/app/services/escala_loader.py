@@ -0,0 +1,153 @@
+"""
+Escala read-model loader
+Fetches schedules with establishment, assigned users and supervisors
+in a bounded number of queries
+"""
+from dataclasses import dataclass, field
+from datetime import date, time, datetime
+from typing import List, Optional, Dict, Any
+
+from sqlalchemy import select, literal, null, union_all, Integer, String
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy.sql import Select
+
+from app.core.models import (
+    Escala, Usuario, Setor, StatusEscalaEnum,
+    escala_usuarios, escala_supervisores
+)
+
+
+@dataclass
+class EscalaRow:
+    """Compact schedule row, shaped like EscalaResponse"""
+    id: int
+    data_inicio: date
+    data_fim: date
+    hora_inicio: time
+    hora_fim: time
+    estabelecimento_id: int
+    status: StatusEscalaEnum
+    observacoes: Optional[str]
+    created_at: datetime
+    updated_at: Optional[datetime]
+    estabelecimento: Optional[Dict[str, Any]]
+    usuarios_atribuidos: List[Dict[str, Any]] = field(default_factory=list)
+    supervisores: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def build_escala_row(escala: Escala) -> EscalaRow:
+    """Build a row from an Escala whose estabelecimento is already loaded"""
+    estabelecimento = escala.estabelecimento
+    return EscalaRow(
+        id=escala.id,
+        data_inicio=escala.data_inicio,
+        data_fim=escala.data_fim,
+        hora_inicio=escala.hora_inicio,
+        hora_fim=escala.hora_fim,
+        estabelecimento_id=escala.estabelecimento_id,
+        status=escala.status,
+        observacoes=escala.observacoes,
+        created_at=escala.created_at,
+        updated_at=escala.updated_at,
+        estabelecimento={
+            "id": estabelecimento.id,
+            "nome": estabelecimento.nome,
+            "endereco": estabelecimento.endereco
+        } if estabelecimento else None
+    )
+
+
+def _people_query(escala_ids: List[int]):
+    """
+    Assigned users (with setor) and supervisors for escala_ids as one UNION ALL
+    The `papel` column tells which relationship each row comes from
+    """
+    atribuidos = select(
+        escala_usuarios.c.escala_id,
+        literal("usuario").label("papel"),
+        escala_usuarios.c.id.label("vinculo_id"),
+        escala_usuarios.c.status.label("vinculo_status"),
+        escala_usuarios.c.setor_id,
+        Setor.nome.label("setor_nome"),
+        Usuario.id.label("usuario_id"),
+        Usuario.nome,
+        Usuario.email,
+        Usuario.perfil
+    ).join(
+        Usuario, Usuario.id == escala_usuarios.c.usuario_id
+    ).outerjoin(
+        Setor, Setor.id == escala_usuarios.c.setor_id
+    ).where(escala_usuarios.c.escala_id.in_(escala_ids))
+
+    supervisores = select(
+        escala_supervisores.c.escala_id,
+        literal("supervisor"),
+        null().cast(Integer),
+        null().cast(String),
+        null().cast(Integer),
+        null().cast(String),
+        Usuario.id,
+        Usuario.nome,
+        Usuario.email,
+        Usuario.perfil
+    ).join(
+        Usuario, Usuario.id == escala_supervisores.c.usuario_id
+    ).where(escala_supervisores.c.escala_id.in_(escala_ids))
+
+    return union_all(atribuidos, supervisores)
+
+
+async def load_escala_rows(
+    db: AsyncSession,
+    query: Select,
+    include_supervisores: bool = True
+) -> List[EscalaRow]:
+    """
+    Execute a select(Escala) query (filters, ordering and pagination already
+    applied) and return hydrated rows
+
+    Issues exactly two queries: the escalas joined to their establishment,
+    then every assigned user and supervisor of the page at once.
+    """
+    result = await db.execute(query.options(joinedload(Escala.estabelecimento)))
+    rows = [build_escala_row(escala) for escala in result.scalars().unique().all()]
+    if not rows:
+        return rows
+
+    by_id = {row.id: row for row in rows}
+    people = await db.execute(_people_query(list(by_id)))
+
+    for person in people:
+        row = by_id[person.escala_id]
+        usuario = {
+            "id": person.usuario_id,
+            "nome": person.nome,
+            "email": person.email,
+            "perfil": person.perfil.value
+        }
+
+        if person.papel == "supervisor":
+            if include_supervisores:
+                row.supervisores.append(usuario)
+            continue
+
+        row.usuarios_atribuidos.append({
+            "id": person.vinculo_id,
+            "usuario_id": person.usuario_id,
+            "setor_id": person.setor_id,
+            "setor": {
+                "id": person.setor_id,
+                "nome": person.setor_nome
+            } if person.setor_nome else None,
+            "status": person.vinculo_status,
+            "usuario": usuario
+        })
+
+    return rows
+
+
+async def load_escala_row(db: AsyncSession, escala_id: int) -> Optional[EscalaRow]:
+    """Load a single schedule by ID"""
+    rows = await load_escala_rows(db, select(Escala).where(Escala.id == escala_id))
+    return rows[0] if rows else None
@@ -0,0 +1,177 @@
+"""
+Roster template expansion
+Turns a ModeloEscala cycle into escalas and escala_usuarios rows for a date
+range, validating and inserting chunk by chunk in the caller's transaction
+"""
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+from app.core.models import (
+    ModeloEscala, PadraoEscalaEnum, StatusEscalaEnum, modelo_escala_usuarios
+)
+from app.services.escala_bulk import insert_escalas
+from app.services.escala_conflicts import ProposedAssignment, find_conflicts
+
+
+# (dias_trabalho, dias_folga) of each preset; 12x36 alternates day on, day off
+PADROES = {
+    PadraoEscalaEnum.DOZE_POR_TRINTA_E_SEIS: (1, 1),
+    PadraoEscalaEnum.SEIS_POR_UM: (6, 1),
+    PadraoEscalaEnum.NOTURNO_ROTATIVO: (1, 2),
+}
+
+
+def resolve_ciclo(
+    padrao: PadraoEscalaEnum,
+    dias_trabalho: Optional[int],
+    dias_folga: Optional[int]
+) -> Tuple[int, int]:
+    """Work/off days for a template; explicit values override the preset"""
+    preset = PADROES.get(padrao)
+    if preset:
+        return (
+            dias_trabalho if dias_trabalho is not None else preset[0],
+            dias_folga if dias_folga is not None else preset[1]
+        )
+
+    if dias_trabalho is None or dias_folga is None:
+        raise ValidationError("dias_trabalho e dias_folga são obrigatórios para modelos personalizados")
+    return dias_trabalho, dias_folga
+
+
+def assign_posicoes(membros: List[Any], ciclo: int) -> List[Dict[str, int]]:
+    """Cycle offset per member; members without one are spread over the cycle"""
+    return [
+        {
+            "usuario_id": membro.usuario_id,
+            "posicao": membro.posicao if membro.posicao is not None else i % ciclo
+        }
+        for i, membro in enumerate(membros)
+    ]
+
+
+async def load_membros(db: AsyncSession, modelo_ids: List[int]) -> Dict[int, List[Dict[str, int]]]:
+    """Members of each template, in cycle order"""
+    result = await db.execute(
+        select(
+            modelo_escala_usuarios.c.modelo_id,
+            modelo_escala_usuarios.c.usuario_id,
+            modelo_escala_usuarios.c.posicao
+        ).where(
+            modelo_escala_usuarios.c.modelo_id.in_(modelo_ids)
+        ).order_by(modelo_escala_usuarios.c.posicao, modelo_escala_usuarios.c.usuario_id)
+    )
+
+    membros = {modelo_id: [] for modelo_id in modelo_ids}
+    for row in result:
+        membros[row.modelo_id].append({"usuario_id": row.usuario_id, "posicao": row.posicao})
+    return membros
+
+
+def expand_modelo(
+    modelo: ModeloEscala,
+    membros: List[Dict[str, int]],
+    inicio: date,
+    fim: date
+) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    """
+    Yield (escala values, assignments) for each day in [inicio, fim] on which
+    at least one member works. Overnight shifts end on the following day.
+    """
+    ciclo = modelo.dias_trabalho + modelo.dias_folga
+    dias_shift = 1 if modelo.hora_fim <= modelo.hora_inicio else 0
+    now = datetime.now()
+
+    dia = inicio
+    while dia <= fim:
+        indice = (dia - modelo.data_referencia).days
+        trabalhando = [
+            membro for membro in membros
+            if (indice - membro["posicao"]) % ciclo < modelo.dias_trabalho
+        ]
+
+        if trabalhando:
+            yield (
+                {
+                    "data_inicio": dia,
+                    "data_fim": dia + timedelta(days=dias_shift),
+                    "hora_inicio": modelo.hora_inicio,
+                    "hora_fim": modelo.hora_fim,
+                    "estabelecimento_id": modelo.estabelecimento_id,
+                    "observacoes": modelo.observacoes,
+                    "status": StatusEscalaEnum.PENDENTE,
+                    "created_at": now
+                },
+                [
+                    {"usuario_id": membro["usuario_id"], "setor_id": modelo.setor_id}
+                    for membro in trabalhando
+                ]
+            )
+
+        dia += timedelta(days=1)
+
+
+async def gerar_escalas(
+    db: AsyncSession,
+    modelo: ModeloEscala,
+    membros: List[Dict[str, int]],
+    inicio: date,
+    fim: date
+) -> Tuple[int, int]:
+    """
+    Expand modelo over [inicio, fim] in chunks of ROSTER_CHUNK_SIZE escalas
+
+    Each chunk is conflict-checked against existing shifts, including the
+    chunks already inserted, before it is written. After the first conflict
+    the remaining chunks are only checked so every conflict is reported.
+    Raises ValidationError listing the conflicts; the caller commits or rolls back.
+    Returns (escalas created, assignments created).
+    """
+    drafts = expand_modelo(modelo, membros, inicio, fim)
+    errors = []
+    escalas_criadas = 0
+    atribuicoes_criadas = 0
+
+    while True:
+        chunk = list(islice(drafts, settings.ROSTER_CHUNK_SIZE))
+        if not chunk:
+            break
+
+        proposals = [
+            ProposedAssignment(
+                usuario_id=atribuicao["usuario_id"],
+                data_inicio=values["data_inicio"],
+                data_fim=values["data_fim"],
+                hora_inicio=values["hora_inicio"],
+                hora_fim=values["hora_fim"]
+            )
+            for values, atribuicoes in chunk
+            for atribuicao in atribuicoes
+        ]
+        for conflict in await find_conflicts(db, proposals):
+            proposal = proposals[conflict.indice]
+            errors.append(
+                f"{proposal.data_inicio.isoformat()}: Usuário {conflict.usuario_id} já possui escala conflitante neste horário"
+            )
+
+        if errors:
+            continue
+
+        escala_ids, vinculo_ids = await insert_escalas(
+            db,
+            [values for values, _ in chunk],
+            [atribuicoes for _, atribuicoes in chunk]
+        )
+        escalas_criadas += len(escala_ids)
+        atribuicoes_criadas += len(vinculo_ids)
+
+    if errors:
+        raise ValidationError("Roster could not be generated", {"errors": errors})
+
+    return escalas_criadas, atribuicoes_criadas
@@ -0,0 +1,232 @@
+"""
+OCR engine
+Decodes each image once, shares preprocessing between the Tesseract variants
+and runs them concurrently, stopping early when the first pass is confident
+"""
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Union
+
+import cv2
+import numpy as np
+import pytesseract
+
+from app.core.config import settings
+from app.core.monitoring import record_ocr_stage
+
+
+CONFIG_PSM6 = '--oem 3 --psm 6 -l por'  # Single uniform block of text
+CONFIG_PSM3 = '--oem 3 --psm 3 -l por'  # Fully automatic page segmentation
+HIGH_CONFIDENCE = 60  # Words above this confidence make up the high_confidence text
+COMMON_WORDS = ['nome', 'cpf', 'rg', 'data', 'nascimento', 'endereço', 'telefone']
+
+_executor: Optional[ThreadPoolExecutor] = None
+_page_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    Per-process pool for Tesseract calls; Tesseract runs as a subprocess so
+    threads overlap fully. Created lazily so forked workers don't inherit it.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.OCR_MAX_WORKERS,
+            thread_name_prefix="ocr"
+        )
+    return _executor
+
+
+def reset_executors():
+    """Forget pools inherited through fork; their threads exist only in the parent"""
+    global _executor, _page_executor
+    _executor = None
+    _page_executor = None
+
+
+def get_page_executor() -> ThreadPoolExecutor:
+    """
+    Per-process pool running ocr_image on PDF pages; kept apart from the
+    variant pool so a page never waits on a slot held by another page
+    """
+    global _page_executor
+    if _page_executor is None:
+        _page_executor = ThreadPoolExecutor(
+            max_workers=settings.OCR_PAGE_WORKERS,
+            thread_name_prefix="ocr-page"
+        )
+    return _page_executor
+
+
+@dataclass
+class OcrResult:
+    """Text found by each OCR method plus the chosen text and stage timings"""
+    texts: Dict[str, str] = field(default_factory=dict)
+    text: str = ""
+    confidence: float = 0.0
+    short_circuited: bool = False
+    timings: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+@contextmanager
+def stage(timings: Dict[str, float], name: str):
+    """Add the wall time of the block to timings[name], in seconds"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        timings[name] = timings.get(name, 0.0) + elapsed
+        record_ocr_stage(name, elapsed)
+
+
+def decode_image(image_path: str) -> np.ndarray:
+    """Read an image file once as a BGR array"""
+    image = cv2.imread(image_path)
+    if image is None:
+        raise ValueError(f"Could not decode image: {image_path}")
+    return image
+
+
+def pixmap_to_array(pix) -> np.ndarray:
+    """
+    View a PyMuPDF pixmap's samples as a (height, width[, n]) uint8 array
+    without copying; the pixmap must outlive the array
+    """
+    array = np.frombuffer(pix.samples_mv, dtype=np.uint8)
+    if pix.n == 1:
+        return array.reshape(pix.height, pix.width)
+    return array.reshape(pix.height, pix.width, pix.n)
+
+
+def to_grayscale(image: np.ndarray) -> np.ndarray:
+    """Grayscale view of a BGR, BGRA or already gray array"""
+    if image.ndim == 2:
+        return image
+    if image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+def preprocess_standard(gray: np.ndarray) -> np.ndarray:
+    """Upscale small scans, denoise, equalize and binarize with Otsu"""
+    width = gray.shape[1]
+    if width < 800:
+        scale = 800 / width
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+
+    denoised = cv2.fastNlMeansDenoising(gray)
+    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
+    enhanced = clahe.apply(denoised)
+    # Bilateral filter preserves character edges
+    filtered = cv2.bilateralFilter(enhanced, 9, 75, 75)
+    _, thresh = cv2.threshold(filtered, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return thresh
+
+
+def preprocess_enhanced(gray: np.ndarray) -> np.ndarray:
+    """Equalize, blur lightly and binarize with an adaptive threshold"""
+    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+    enhanced = clahe.apply(gray)
+    blurred = cv2.GaussianBlur(enhanced, (3, 3), 0)
+    thresh = cv2.adaptiveThreshold(
+        blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+    )
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
+    return cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
+
+
+def _image_to_string(image: np.ndarray, config: str) -> str:
+    return pytesseract.image_to_string(image, config=config).strip()
+
+
+def _first_pass(image: np.ndarray):
+    """
+    One image_to_data call yields the plain text, the high-confidence words
+    and the mean word confidence
+    """
+    data = pytesseract.image_to_data(
+        image, config=CONFIG_PSM6, output_type=pytesseract.Output.DICT
+    )
+
+    lines: Dict[tuple, list] = {}
+    high_confidence = []
+    confidences = []
+    for i, word in enumerate(data['text']):
+        if not word.strip():
+            continue
+        key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+        lines.setdefault(key, []).append(word)
+
+        conf = float(data['conf'][i])
+        if conf >= 0:
+            confidences.append(conf)
+        if conf > HIGH_CONFIDENCE:
+            high_confidence.append(word)
+
+    text = "\n".join(" ".join(words) for words in lines.values())
+    confidence = sum(confidences) / len(confidences) if confidences else 0.0
+    return text, " ".join(high_confidence), confidence
+
+
+def score_text(text: str) -> int:
+    """Rank OCR output by length and presence of common document words"""
+    lowered = text.lower()
+    return len(text) + sum(10 for word in COMMON_WORDS if word in lowered)
+
+
+def ocr_image(image: Union[str, np.ndarray]) -> OcrResult:
+    """
+    Run the OCR variants on a path or a decoded array
+
+    The first pass (standard preprocessing, psm 6) is kept alone when its
+    mean word confidence reaches OCR_CONFIDENCE_THRESHOLD; otherwise the
+    enhanced psm 6 and the automatic-segmentation variants run in parallel.
+    """
+    result = OcrResult()
+    started = time.perf_counter()
+
+    if settings.TESSERACT_PATH:
+        pytesseract.pytesseract.tesseract_cmd = settings.TESSERACT_PATH
+
+    try:
+        if isinstance(image, str):
+            with stage(result.timings, "decode"):
+                image = decode_image(image)
+
+        with stage(result.timings, "preprocess"):
+            gray = to_grayscale(image)
+            standard = preprocess_standard(gray)
+
+        with stage(result.timings, "ocr_first_pass"):
+            text, high_confidence, confidence = _first_pass(standard)
+        result.texts['standard'] = text
+        result.texts['high_confidence'] = high_confidence
+        result.confidence = confidence
+
+        if confidence >= settings.OCR_CONFIDENCE_THRESHOLD:
+            result.short_circuited = True
+        else:
+            with stage(result.timings, "preprocess"):
+                enhanced = preprocess_enhanced(gray)
+
+            with stage(result.timings, "ocr_variants"):
+                executor = _get_executor()
+                futures = {
+                    'enhanced': executor.submit(_image_to_string, enhanced, CONFIG_PSM6),
+                    'auto_segmentation': executor.submit(_image_to_string, standard, CONFIG_PSM3),
+                }
+                for method, future in futures.items():
+                    result.texts[method] = future.result()
+
+    except Exception as e:
+        print(f"Error in OCR processing: {e}")
+        result.error = str(e)
+
+    result.text = max(result.texts.values(), key=score_text, default="")
+    result.timings['total'] = time.perf_counter() - started
+    return result
@@ -0,0 +1,260 @@
+"""
+Report read-model loader
+Builds the check-in, schedule and worked hours reports from their filters.
+Shared by the report endpoints and the PDF worker, which receives only the
+filters and loads the rows itself.
+"""
+from datetime import date, datetime
+from typing import List, Optional
+
+from sqlalchemy import select, and_, func, case, exists, literal_column
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.models import (
+    Usuario, Escala, Checkin, StatusEscalaEnum, StatusCheckinEnum, escala_usuarios
+)
+from app.schemas.relatorio import (
+    RelatorioCheckinResponse, RelatorioEscalaResponse, RelatorioHorasResponse
+)
+
+
+def checkin_conditions(
+    data_inicio: date,
+    data_fim: date,
+    usuario_id: Optional[int] = None,
+    status: Optional[StatusCheckinEnum] = None
+) -> list:
+    """Check-ins in the period, optionally for one user and status"""
+    conditions = [
+        Checkin.data_hora >= datetime.combine(data_inicio, datetime.min.time()),
+        Checkin.data_hora <= datetime.combine(data_fim, datetime.max.time())
+    ]
+    if usuario_id:
+        conditions.append(Checkin.usuario_id == usuario_id)
+    if status:
+        conditions.append(Checkin.status == status)
+    return conditions
+
+
+def checkin_export_query(conditions: list):
+    """Flat check-in report rows, shaped like RelatorioCheckinResponse"""
+    return select(
+        Checkin.id,
+        Usuario.nome.label("usuario_nome"),
+        Usuario.cpf.label("usuario_cpf"),
+        Escala.data_inicio.label("data_plantao"),
+        Escala.hora_inicio.label("hora_inicio_plantao"),
+        Escala.hora_fim.label("hora_fim_plantao"),
+        Checkin.data_hora.label("data_hora_checkin"),
+        Checkin.gps_lat.label("gps_latitude"),
+        Checkin.gps_long.label("gps_longitude"),
+        Checkin.endereco,
+        Checkin.status,
+        Checkin.observacoes
+    ).join(
+        Usuario, Usuario.id == Checkin.usuario_id
+    ).join(
+        Escala, Escala.id == Checkin.escala_id
+    ).where(and_(*conditions)).order_by(Checkin.data_hora.desc())
+
+
+async def load_checkin_report(
+    db: AsyncSession,
+    data_inicio: date,
+    data_fim: date,
+    usuario_id: Optional[int] = None,
+    status: Optional[StatusCheckinEnum] = None
+) -> List[RelatorioCheckinResponse]:
+    query = select(Checkin).options(
+        selectinload(Checkin.usuario),
+        selectinload(Checkin.escala)
+    ).where(
+        and_(*checkin_conditions(data_inicio, data_fim, usuario_id, status))
+    ).order_by(Checkin.data_hora.desc())
+
+    result = await db.execute(query)
+    return [
+        RelatorioCheckinResponse(
+            id=checkin.id,
+            usuario_nome=checkin.usuario.nome,
+            usuario_cpf=checkin.usuario.cpf,
+            data_plantao=checkin.escala.data_inicio,
+            hora_inicio_plantao=checkin.escala.hora_inicio,
+            hora_fim_plantao=checkin.escala.hora_fim,
+            data_hora_checkin=checkin.data_hora,
+            gps_latitude=checkin.gps_lat,
+            gps_longitude=checkin.gps_long,
+            endereco=checkin.endereco,
+            status=checkin.status,
+            observacoes=checkin.observacoes
+        )
+        for checkin in result.scalars().all()
+    ]
+
+
+async def load_escala_report(
+    db: AsyncSession,
+    data_inicio: date,
+    data_fim: date,
+    usuario_id: Optional[int] = None,
+    status: Optional[StatusEscalaEnum] = None
+) -> List[RelatorioEscalaResponse]:
+    conditions = [
+        Escala.data_inicio >= data_inicio,
+        Escala.data_inicio <= data_fim
+    ]
+    if usuario_id:
+        conditions.append(escala_usuarios.c.usuario_id == usuario_id)
+    if status:
+        conditions.append(Escala.status == status)
+
+    # One row per user assigned to each schedule
+    query = select(Escala, Usuario).join(
+        escala_usuarios, escala_usuarios.c.escala_id == Escala.id
+    ).join(
+        Usuario, Usuario.id == escala_usuarios.c.usuario_id
+    ).options(
+        selectinload(Escala.checkins)
+    ).where(and_(*conditions)).order_by(Escala.data_inicio.desc(), Escala.hora_inicio.asc())
+
+    result = await db.execute(query)
+
+    report_data = []
+    for escala, usuario in result.all():
+        checkin = next((c for c in escala.checkins if c.usuario_id == usuario.id), None)
+
+        report_data.append(RelatorioEscalaResponse(
+            id=escala.id,
+            usuario_nome=usuario.nome,
+            usuario_cpf=usuario.cpf,
+            data=escala.data_inicio,
+            hora_inicio=escala.hora_inicio,
+            hora_fim=escala.hora_fim,
+            status=escala.status,
+            observacoes_escala=escala.observacoes,
+            tem_checkin=checkin is not None,
+            data_hora_checkin=checkin.data_hora if checkin else None,
+            status_checkin=checkin.status if checkin else None,
+            observacoes_checkin=checkin.observacoes if checkin else None
+        ))
+    return report_data
+
+
+def horas_plantao():
+    """
+    Hours of a shift, computed in SQL
+    A shift whose end is not after its start runs overnight into the next day
+    """
+    segundos = func.timestampdiff(
+        literal_column("SECOND"),
+        func.timestamp(Escala.data_inicio, Escala.hora_inicio),
+        func.timestamp(Escala.data_fim, Escala.hora_fim)
+    )
+    return case((segundos <= 0, segundos + 86400), else_=segundos) / 3600.0
+
+
+def horas_conditions(data_inicio: date, data_fim: date, usuario_id: Optional[int]) -> list:
+    """Confirmed shifts in the period where the assigned user checked in"""
+    conditions = [
+        Escala.data_inicio >= data_inicio,
+        Escala.data_inicio <= data_fim,
+        Escala.status == StatusEscalaEnum.CONFIRMADO,
+        exists().where(
+            Checkin.escala_id == Escala.id,
+            Checkin.usuario_id == escala_usuarios.c.usuario_id
+        )
+    ]
+    if usuario_id:
+        conditions.append(escala_usuarios.c.usuario_id == usuario_id)
+    return conditions
+
+
+def plantoes_query(conditions: list):
+    """One row per worked shift and user"""
+    return select(
+        Escala.id.label("escala_id"),
+        Usuario.id.label("usuario_id"),
+        Usuario.nome.label("usuario_nome"),
+        Escala.data_inicio.label("data"),
+        Escala.hora_inicio,
+        Escala.hora_fim,
+        horas_plantao().label("horas")
+    ).select_from(escala_usuarios).join(
+        Escala, Escala.id == escala_usuarios.c.escala_id
+    ).join(
+        Usuario, Usuario.id == escala_usuarios.c.usuario_id
+    ).where(and_(*conditions)).order_by(
+        Usuario.nome.asc(), Usuario.id.asc(), Escala.data_inicio.asc(), Escala.hora_inicio.asc()
+    )
+
+
+def plantao_detalhe(row) -> dict:
+    return {
+        "escala_id": row.escala_id,
+        "usuario_id": row.usuario_id,
+        "usuario_nome": row.usuario_nome,
+        "data": row.data,
+        "hora_inicio": row.hora_inicio,
+        "hora_fim": row.hora_fim,
+        "horas": round(float(row.horas), 2),
+        "checkin_realizado": True
+    }
+
+
+def horas_totais_query(conditions: list):
+    """Worked shifts and hours per user"""
+    return select(
+        Usuario.id,
+        Usuario.nome,
+        Usuario.cpf,
+        func.count(escala_usuarios.c.id).label("total_plantoes"),
+        func.sum(horas_plantao()).label("total_horas")
+    ).select_from(escala_usuarios).join(
+        Escala, Escala.id == escala_usuarios.c.escala_id
+    ).join(
+        Usuario, Usuario.id == escala_usuarios.c.usuario_id
+    ).where(and_(*conditions)).group_by(
+        Usuario.id, Usuario.nome, Usuario.cpf
+    ).order_by(Usuario.nome.asc())
+
+
+async def load_horas_report(
+    db: AsyncSession,
+    data_inicio: date,
+    data_fim: date,
+    usuario_id: Optional[int] = None,
+    detalhes: bool = False
+) -> List[RelatorioHorasResponse]:
+    """
+    Worked hours per user, aggregated in SQL
+    detalhes=True also lists every shift
+    """
+    conditions = horas_conditions(data_inicio, data_fim, usuario_id)
+
+    result = await db.execute(horas_totais_query(conditions))
+    totais = result.all()
+
+    detalhes_por_usuario = {}
+    if detalhes and totais:
+        result = await db.execute(plantoes_query(conditions))
+        for row in result:
+            detalhes_por_usuario.setdefault(row.usuario_id, []).append(plantao_detalhe(row))
+
+    report_data = []
+    for row in totais:
+        total_horas = float(row.total_horas or 0)
+        report_data.append(RelatorioHorasResponse(
+            usuario_id=row.id,
+            usuario_nome=row.nome,
+            usuario_cpf=row.cpf,
+            periodo_inicio=data_inicio,
+            periodo_fim=data_fim,
+            total_horas=round(total_horas, 2),
+            total_plantoes=row.total_plantoes,
+            media_horas_por_plantao=round(
+                total_horas / row.total_plantoes, 2
+            ) if row.total_plantoes > 0 else 0,
+            detalhes_plantoes=detalhes_por_usuario.get(row.id, [])
+        ))
+    return report_data
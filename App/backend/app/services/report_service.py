@@ -0,0 +1,182 @@
+"""
+Report PDF export jobs
+PDFs are rendered by Celery on the reports queue and stored on disk under a
+hash of the report parameters, so identical requests reuse the same artifact.
+Only the filters travel through the broker; the worker loads the rows.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from datetime import date, datetime
+from typing import Dict, Any, List
+
+from fastapi.encoders import jsonable_encoder
+
+from app.services.celery_app import celery_app
+from app.core.config import settings
+from app.core.models import StatusCheckinEnum, StatusEscalaEnum
+
+
+REPORT_TYPES = ("checkins", "escalas", "horas")
+
+# Jobs in these states are already queued or running
+IN_FLIGHT_STATES = ("QUEUED", "RECEIVED", "STARTED", "RETRY")
+
+
+def report_job_id(tipo: str, params: Dict[str, Any]) -> str:
+    """Stable job id for a report type and its filter parameters"""
+    payload = json.dumps({"tipo": tipo, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def report_artifact_path(job_id: str) -> str:
+    return os.path.join(settings.REPORTS_PATH, f"{job_id}.pdf")
+
+
+def is_valid_job_id(job_id: str) -> bool:
+    return len(job_id) == 64 and all(c in "0123456789abcdef" for c in job_id)
+
+
+def _artifact_ready(job_id: str) -> bool:
+    """Whether a rendered PDF exists and is still within REPORT_PDF_TTL_MINUTES"""
+    path = report_artifact_path(job_id)
+    if not os.path.exists(path):
+        return False
+    return time.time() - os.path.getmtime(path) < settings.REPORT_PDF_TTL_MINUTES * 60
+
+
+def submit_report_pdf(tipo: str, filters: Dict[str, Any]) -> str:
+    """
+    Queue PDF rendering for a report's filters unless a fresh artifact
+    already exists or the same job is still queued or running
+    Returns the job id
+    """
+    job_id = report_job_id(tipo, filters)
+    if _artifact_ready(job_id):
+        return job_id
+
+    # Celery reports unknown ids as PENDING, so queued jobs are marked
+    # QUEUED in the result backend before they are sent
+    result = celery_app.AsyncResult(job_id)
+    if result.state in IN_FLIGHT_STATES:
+        return job_id
+
+    result.backend.store_result(job_id, None, "QUEUED")
+    try:
+        render_report_pdf_task.apply_async(
+            args=[tipo, jsonable_encoder(filters)],
+            task_id=job_id
+        )
+    except Exception:
+        result.forget()
+        raise
+    return job_id
+
+
+def report_job_status(job_id: str) -> Dict[str, Any]:
+    """Current state of a PDF job: ready, pending, processing or failed"""
+    if _artifact_ready(job_id):
+        return {"job_id": job_id, "status": "ready"}
+
+    result = celery_app.AsyncResult(job_id)
+    if result.state == "FAILURE":
+        return {"job_id": job_id, "status": "failed", "error": str(result.result)}
+    if result.state == "STARTED":
+        return {"job_id": job_id, "status": "processing"}
+    return {"job_id": job_id, "status": "pending"}
+
+
+async def _query_rows(tipo: str, filters: Dict[str, Any]) -> List[Any]:
+    """Load a report's rows from its JSON filters, on the replica when healthy"""
+    from app.core.database import AsyncSessionLocal, ReplicaSessionLocal, use_read_replica
+    from app.services import report_loader
+
+    inicio = date.fromisoformat(filters.get("data_inicio") or filters["periodo_inicio"])
+    fim = date.fromisoformat(filters.get("data_fim") or filters["periodo_fim"])
+    usuario_id = filters.get("usuario_id")
+
+    session_factory = ReplicaSessionLocal if await use_read_replica() else AsyncSessionLocal
+    async with session_factory() as db:
+        if tipo == "checkins":
+            status = filters.get("status")
+            return await report_loader.load_checkin_report(
+                db, inicio, fim, usuario_id, StatusCheckinEnum(status) if status else None
+            )
+        if tipo == "escalas":
+            status = filters.get("status")
+            return await report_loader.load_escala_report(
+                db, inicio, fim, usuario_id, StatusEscalaEnum(status) if status else None
+            )
+        return await report_loader.load_horas_report(db, inicio, fim, usuario_id)
+
+
+def _load_rows(tipo: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Restore the values the PDF generator formats itself after JSON transport"""
+    for row in rows:
+        if tipo == "checkins":
+            if row.get("data_hora_checkin"):
+                row["data_hora_checkin"] = datetime.fromisoformat(row["data_hora_checkin"])
+            row["status"] = StatusCheckinEnum(row["status"]).name
+        elif tipo == "escalas":
+            row["status"] = StatusEscalaEnum(row["status"]).name
+    return rows
+
+
+@celery_app.task(bind=True, name="app.services.report_service.render_report_pdf_task")
+def render_report_pdf_task(self, tipo: str, filters: Dict[str, Any]):
+    """
+    Load a report's rows from its filters, render the PDF and store it
+    under the job id
+    """
+    from app.utils.pdf_generator import (
+        generate_checkin_pdf, generate_escala_pdf, generate_hours_pdf
+    )
+
+    renderers = {
+        "checkins": generate_checkin_pdf,
+        "escalas": generate_escala_pdf,
+        "horas": generate_hours_pdf,
+    }
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        rows = loop.run_until_complete(_query_rows(tipo, filters))
+    finally:
+        loop.close()
+
+    pdf_content = renderers[tipo](_load_rows(tipo, jsonable_encoder(rows)), filters)
+
+    os.makedirs(settings.REPORTS_PATH, exist_ok=True)
+    path = report_artifact_path(self.request.id)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(pdf_content)
+    os.replace(tmp_path, path)
+
+    return {
+        "success": True,
+        "job_id": self.request.id,
+        "size_bytes": len(pdf_content)
+    }
+
+
+@celery_app.task(name="app.services.report_service.cleanup_report_artifacts_task")
+def cleanup_report_artifacts_task():
+    """
+    Remove report PDFs older than REPORT_PDF_TTL_MINUTES
+    """
+    if not os.path.isdir(settings.REPORTS_PATH):
+        return {"success": True, "files_deleted": 0}
+
+    cutoff = time.time() - settings.REPORT_PDF_TTL_MINUTES * 60
+    deleted = 0
+    for filename in os.listdir(settings.REPORTS_PATH):
+        path = os.path.join(settings.REPORTS_PATH, filename)
+        if os.path.isfile(path) and os.path.getmtime(path) < cutoff:
+            os.remove(path)
+            deleted += 1
+
+    return {"success": True, "files_deleted": deleted}
@@ -0,0 +1,51 @@
+"""
+Reporting rollup maintenance tasks
+"""
+from datetime import date, timedelta
+from typing import Optional
+import asyncio
+
+from app.services.celery_app import celery_app
+from app.core.config import settings
+
+
+@celery_app.task(name="app.services.rollup_service.reconcile_rollups_task")
+def reconcile_rollups_task(days: Optional[int] = None):
+    """
+    Rebuild daily rollups from the fact tables
+    Covers ROLLUP_RECONCILE_DAYS before and after today; days=0 rebuilds everything
+    """
+    from app.core.database import AsyncSessionLocal
+    from app.core.rollups import reconcile_rollups
+    
+    window = settings.ROLLUP_RECONCILE_DAYS if days is None else days
+    start = end = None
+    if window:
+        today = date.today()
+        start = today - timedelta(days=window)
+        end = today + timedelta(days=window)
+    
+    async def _reconcile():
+        async with AsyncSessionLocal() as db:
+            try:
+                corrected = await reconcile_rollups(db, start, end)
+                return {
+                    "success": True,
+                    "start": start.isoformat() if start else None,
+                    "end": end.isoformat() if end else None,
+                    "corrected": corrected
+                }
+            except Exception as e:
+                await db.rollback()
+                return {
+                    "success": False,
+                    "error": str(e)
+                }
+    
+    # Run async function
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(_reconcile())
+    finally:
+        loop.close()
@@ -0,0 +1,115 @@
+"""
+Streaming report export
+Serializes query rows as CSV or NDJSON straight from a server-side cursor
+"""
+import csv
+import io
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Dict, List
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.core.database import (
+    AsyncSessionLocal, ReplicaSessionLocal, use_read_replica, replica_failed
+)
+
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _plain(value: Any) -> Any:
+    """Convert a column value to a JSON/CSV friendly value"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+async def _stream_rows(query: Select) -> AsyncIterator[Any]:
+    """
+    Yield rows through a server-side cursor on a dedicated session
+    The request session may already be closed while the body is streamed.
+    Routed like get_read_db: the replica while it is healthy, the primary
+    otherwise, or when the replica drops before the first row was sent.
+    """
+    if await use_read_replica():
+        session_factories = (ReplicaSessionLocal, AsyncSessionLocal)
+    else:
+        session_factories = (AsyncSessionLocal,)
+
+    sent = False
+    for session_factory in session_factories:
+        try:
+            async with session_factory() as db:
+                result = await db.stream(
+                    query.execution_options(yield_per=settings.EXPORT_YIELD_PER)
+                )
+                async for row in result:
+                    sent = True
+                    yield row
+            return
+        except Exception as e:
+            if session_factory is AsyncSessionLocal or not replica_failed(e) or sent:
+                raise
+
+
+async def _csv_lines(rows: AsyncIterator[Any], columns: List[str], serialize: Callable) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    count = 0
+    async for row in rows:
+        record = serialize(row)
+        writer.writerow([
+            json.dumps(value) if isinstance(value, (dict, list)) else _plain(value)
+            for value in (record.get(column) for column in columns)
+        ])
+        count += 1
+        if count % settings.EXPORT_YIELD_PER == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+async def _ndjson_lines(rows: AsyncIterator[Any], serialize: Callable) -> AsyncIterator[str]:
+    async for row in rows:
+        record = {key: _plain(value) for key, value in serialize(row).items()}
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def stream_export(
+    query: Select,
+    columns: List[str],
+    serialize: Callable[[Any], Dict[str, Any]],
+    export_format: str,
+    filename: str
+) -> StreamingResponse:
+    """
+    Build a StreamingResponse for query in csv or ndjson
+    serialize maps a result row to a dict keyed by columns
+    """
+    rows = _stream_rows(query)
+    if export_format == "csv":
+        body = _csv_lines(rows, columns, serialize)
+    else:
+        body = _ndjson_lines(rows, serialize)
+
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'}
+    )
@@ -194,6 +194,99 @@ class WeCarePDFGenerator:
         
         return pdf_content
     
+    def generate_escala_report(self, escalas: List[Dict[str, Any]], filters: Dict[str, Any]) -> bytes:
+        """Generate schedule report PDF"""
+        buffer = io.BytesIO()
+        
+        doc = SimpleDocTemplate(
+            buffer,
+            pagesize=A4,
+            rightMargin=50,
+            leftMargin=50,
+            topMargin=100,
+            bottomMargin=50
+        )
+        
+        story = []
+        
+        # Title
+        title = Paragraph("Relatório de Escalas", self.custom_styles['title'])
+        story.append(title)
+        story.append(Spacer(1, 20))
+        
+        # Period info
+        if filters.get('data_inicio') and filters.get('data_fim'):
+            period_text = f"Período: {filters['data_inicio']} a {filters['data_fim']}"
+            subtitle = Paragraph(period_text, self.custom_styles['subtitle'])
+            story.append(subtitle)
+            story.append(Spacer(1, 20))
+        
+        # Summary
+        total_escalas = len(escalas)
+        com_checkin = len([e for e in escalas if e.get('tem_checkin')])
+        
+        summary_data = [
+            ['Total de Escalas', str(total_escalas)],
+            ['Com Check-in', str(com_checkin)],
+            ['Sem Check-in', str(total_escalas - com_checkin)]
+        ]
+        
+        summary_table = Table(summary_data, colWidths=[4*cm, 3*cm])
+        summary_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#edf2f7')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#2d3748')),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0'))
+        ]))
+        
+        story.append(Paragraph("Resumo", self.custom_styles['header']))
+        story.append(summary_table)
+        story.append(Spacer(1, 20))
+        
+        # Detailed data
+        if escalas:
+            story.append(Paragraph("Detalhamento", self.custom_styles['header']))
+            
+            table_data = [
+                ['Data', 'Horário', 'Usuário', 'Status', 'Check-in']
+            ]
+            
+            for escala in escalas:
+                table_data.append([
+                    str(escala.get('data', '')),
+                    f"{str(escala.get('hora_inicio', ''))[:5]} - {str(escala.get('hora_fim', ''))[:5]}",
+                    escala.get('usuario_nome', ''),
+                    escala.get('status', ''),
+                    'Sim' if escala.get('tem_checkin') else 'Não'
+                ])
+            
+            detail_table = Table(table_data, colWidths=[2.5*cm, 3*cm, 4.5*cm, 2.5*cm, 2*cm])
+            detail_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5282')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 10),
+                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+                ('FONTSIZE', (0, 1), (-1, -1), 8),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f7fafc')])
+            ]))
+            
+            story.append(detail_table)
+        else:
+            story.append(Paragraph("Nenhuma escala encontrada para os filtros selecionados.", self.custom_styles['body']))
+        
+        # Build PDF
+        doc.build(story, onFirstPage=self._add_header_footer, onLaterPages=self._add_header_footer)
+        
+        pdf_content = buffer.getvalue()
+        buffer.close()
+        
+        return pdf_content
+    
     def generate_hours_report(self, hours_data: List[Dict[str, Any]], filters: Dict[str, Any]) -> bytes:
         """Generate worked hours report PDF"""
         buffer = io.BytesIO()
@@ -382,6 +475,12 @@ def generate_checkin_pdf(checkins_data: List[Dict], filters: Dict) -> bytes:
     return generator.generate_checkin_report(checkins_data, filters)
 
 
+def generate_escala_pdf(escalas_data: List[Dict], filters: Dict) -> bytes:
+    """Generate schedule report PDF"""
+    generator = WeCarePDFGenerator()
+    return generator.generate_escala_report(escalas_data, filters)
+
+
 def generate_hours_pdf(hours_data: List[Dict], filters: Dict) -> bytes:
     """Generate hours report PDF"""
     generator = WeCarePDFGenerator()
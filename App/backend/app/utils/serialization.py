@@ -0,0 +1,36 @@
+"""
+JSON serialization helpers
+Serialize validated Pydantic models straight to bytes with pydantic-core
+"""
+from functools import lru_cache
+from typing import Any, Optional, Dict
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _adapter(type_: Any) -> TypeAdapter:
+    return TypeAdapter(type_)
+
+
+def json_response(
+    type_: Any,
+    value: Any,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Serialize value, already an instance of type_ (e.g. a model or a list of
+    models), to a JSON response in one pass
+
+    Returning a Response skips FastAPI's response_model handling, which would
+    dump the models to dicts, validate them again and encode the result.
+    The endpoint's response_model still documents the schema.
+    """
+    return Response(
+        content=_adapter(type_).dump_json(value),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers
+    )
@@ -23,7 +23,7 @@ def main():
     worker_config = {
         'loglevel': 'info',
         'concurrency': 4,
-        'queues': ['documents', 'notifications', 'maintenance', 'celery'],
+        'queues': ['documents', 'notifications', 'maintenance', 'reports', 'celery'],
         'beat': False,  # Set to True if you want to run beat scheduler
     }
     
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark do pool de conexões - rajada de troca de plantão
+
+Reproduz o pico das 07:00/19:00: muitas requisições chegando em poucos
+segundos, cada uma segurando uma sessão durante todo o processamento
+(autenticação, consulta da escala, trabalho da requisição e commit final).
+Usa o engine da aplicação, então os limites vêm de DB_POOL_* no .env ou
+dos argumentos abaixo. Somente leituras - seguro em um banco local.
+
+Uso:
+    python tests/test_pool_burst.py --requests 400 --window 2 --hold-ms 80
+    python tests/test_pool_burst.py --pool-size 5 --max-overflow 0   # configuração antiga
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_root = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(backend_root))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Rajada de requisições contra o pool de conexões")
+    parser.add_argument("--requests", type=int, default=400, help="requisições na rajada")
+    parser.add_argument("--window", type=float, default=2.0, help="segundos em que a rajada chega")
+    parser.add_argument("--hold-ms", type=float, default=80.0, help="trabalho por requisição com a sessão aberta")
+    parser.add_argument("--pool-size", type=int, help="sobrescreve DB_POOL_SIZE")
+    parser.add_argument("--max-overflow", type=int, help="sobrescreve DB_MAX_OVERFLOW")
+    parser.add_argument("--pool-timeout", type=int, help="sobrescreve DB_POOL_TIMEOUT")
+    return parser.parse_args()
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def simulated_request(session_factory, delay, hold, results):
+    """Uma requisição típica de check-in no horário de troca"""
+    from sqlalchemy import text
+
+    await asyncio.sleep(delay)
+    start = time.perf_counter()
+    try:
+        async with session_factory() as db:
+            # get_current_user: primeiro uso da sessão faz o checkout
+            await db.execute(text("SELECT id FROM usuarios ORDER BY id LIMIT 1"))
+            acquired = time.perf_counter()
+
+            await db.execute(text(
+                "SELECT COUNT(*) FROM escalas WHERE data_inicio = CURRENT_DATE"
+            ))
+            await asyncio.sleep(hold)
+            # log_action: commit no fim da requisição
+            await db.commit()
+
+        results["wait"].append(acquired - start)
+        results["latency"].append(time.perf_counter() - start)
+    except Exception as e:
+        results["errors"][type(e).__name__] = results["errors"].get(type(e).__name__, 0) + 1
+
+
+async def main():
+    """Função principal"""
+    args = parse_args()
+    for name, value in (
+        ("DB_POOL_SIZE", args.pool_size),
+        ("DB_MAX_OVERFLOW", args.max_overflow),
+        ("DB_POOL_TIMEOUT", args.pool_timeout),
+    ):
+        if value is not None:
+            os.environ[name] = str(value)
+
+    from app.core.config import settings
+    from app.core.database import engine, AsyncSessionLocal
+    from app.core.monitoring import DB_POOL_EVENTS
+
+    print("🚀 We Care - Benchmark do Pool (troca de plantão)")
+    print("=" * 50)
+    print(
+        f"⚙️ pool_size={settings.DB_POOL_SIZE} max_overflow={settings.DB_MAX_OVERFLOW} "
+        f"timeout={settings.DB_POOL_TIMEOUT}s recycle={settings.DB_POOL_RECYCLE}s "
+        f"pre_ping={settings.DB_POOL_PRE_PING}"
+    )
+    print(f"📈 {args.requests} requisições em {args.window}s, {args.hold_ms}ms de trabalho cada")
+
+    rng = random.Random(7)
+    results = {"wait": [], "latency": [], "errors": {}}
+    peak = 0
+
+    async def sample_pool():
+        nonlocal peak
+        while True:
+            peak = max(peak, engine.pool.checkedout())
+            await asyncio.sleep(0.005)
+
+    sampler = asyncio.create_task(sample_pool())
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*[
+            simulated_request(
+                AsyncSessionLocal,
+                # Chegadas concentradas no início da janela, como no relógio de ponto
+                rng.betavariate(1, 3) * args.window,
+                args.hold_ms / 1000,
+                results
+            )
+            for _ in range(args.requests)
+        ])
+    finally:
+        elapsed = time.perf_counter() - started
+        sampler.cancel()
+        await engine.dispose()
+
+    ok = len(results["latency"])
+    overflow_events = DB_POOL_EVENTS.labels(pool="primary", event="overflow")._value.get()
+    timeouts = DB_POOL_EVENTS.labels(pool="primary", event="timeout")._value.get()
+
+    print("-" * 50)
+    print(f"✅ Sucesso: {ok}/{args.requests} em {elapsed:.2f}s ({ok / elapsed:.0f} req/s)")
+    if results["wait"]:
+        print(
+            f"⏳ Espera pelo pool: p50={percentile(results['wait'], 50) * 1000:.1f}ms "
+            f"p95={percentile(results['wait'], 95) * 1000:.1f}ms "
+            f"p99={percentile(results['wait'], 99) * 1000:.1f}ms "
+            f"max={max(results['wait']) * 1000:.1f}ms"
+        )
+        print(
+            f"⏱️ Latência: média={statistics.mean(results['latency']) * 1000:.1f}ms "
+            f"p95={percentile(results['latency'], 95) * 1000:.1f}ms"
+        )
+    print(f"🔌 Pico de conexões em uso: {peak} | overflow abertos: {overflow_events:.0f} | timeouts: {timeouts:.0f}")
+
+    if results["errors"]:
+        for name, count in results["errors"].items():
+            print(f"❌ {name}: {count}")
+        sys.exit(1)
+    print("🎉 Nenhuma requisição falhou")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de serialização - payload do calendário de escalas
+
+Compara, por escala, o caminho antigo (modelos devolvidos ao FastAPI, que faz
+model_dump, valida de novo pelo response_model e serializa com json da
+stdlib) com o caminho atual (model_validate a partir dos atributos e
+dump_json direto pelo pydantic-core). Não usa banco de dados.
+
+Uso:
+    python tests/test_serialization_bench.py
+    python tests/test_serialization_bench.py --dias 31 --escalas-por-dia 40 --repeticoes 20
+"""
+import argparse
+import json
+import sys
+import time as clock
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import List
+
+# Add backend to path
+backend_root = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(backend_root))
+
+import orjson
+from pydantic import TypeAdapter
+
+from app.core.models import StatusEscalaEnum
+from app.schemas.escala import EscalaResponse, EscalaCalendarView
+from app.services.escala_loader import EscalaRow
+from app.utils.serialization import json_response
+
+
+def build_rows(dias: int, por_dia: int) -> List[EscalaRow]:
+    """Escalas como o loader devolve: estabelecimento, 3 sócios e 1 supervisor"""
+    inicio = date.today()
+    rows = []
+    for offset in range(dias):
+        dia = inicio + timedelta(days=offset)
+        for i in range(por_dia):
+            escala_id = offset * por_dia + i + 1
+            row = EscalaRow(
+                id=escala_id,
+                data_inicio=dia,
+                data_fim=dia,
+                hora_inicio=time(7 if i % 2 else 19),
+                hora_fim=time(19 if i % 2 else 7),
+                estabelecimento_id=i % 10 + 1,
+                status=StatusEscalaEnum.PENDENTE,
+                observacoes="Plantão padrão",
+                created_at=datetime.now(),
+                updated_at=None,
+                estabelecimento={"id": i % 10 + 1, "nome": f"Hospital {i % 10 + 1}", "endereco": "Rua A, 100"}
+            )
+            for u in range(3):
+                usuario_id = 100 + (escala_id * 3 + u) % 500
+                row.usuarios_atribuidos.append({
+                    "id": escala_id * 3 + u,
+                    "usuario_id": usuario_id,
+                    "setor_id": 1,
+                    "setor": {"id": 1, "nome": "UTI"},
+                    "status": "Pendente",
+                    "usuario": {"id": usuario_id, "nome": f"Sócio {usuario_id}", "email": f"s{usuario_id}@wecare.local", "perfil": "Sócio"}
+                })
+            row.supervisores.append({"id": 2, "nome": "Supervisor", "email": "sup@wecare.local", "perfil": "Supervisor"})
+            rows.append(row)
+    return rows
+
+
+def group(rows, start, dias, item):
+    por_dia = {}
+    for row in rows:
+        por_dia.setdefault(row.data_inicio, []).append(item(row))
+    return [
+        EscalaCalendarView(data=start + timedelta(days=d), escalas=por_dia.get(start + timedelta(days=d), []))
+        for d in range(dias)
+    ]
+
+
+def legacy(rows, start, dias):
+    """Como era: views a partir das linhas, depois o pipeline do response_model do FastAPI"""
+    views = group(rows, start, dias, lambda row: row)
+    adapter = TypeAdapter(List[EscalaCalendarView])
+    content = [view.model_dump(by_alias=True) for view in views]
+    value = adapter.validate_python(content)
+    encoded = adapter.dump_python(value, mode="json")
+    return json.dumps(encoded, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def legacy_orjson(rows, start, dias):
+    """Pipeline do response_model com ORJSONResponse como classe padrão"""
+    views = group(rows, start, dias, lambda row: row)
+    adapter = TypeAdapter(List[EscalaCalendarView])
+    content = [view.model_dump(by_alias=True) for view in views]
+    value = adapter.validate_python(content)
+    return orjson.dumps(adapter.dump_python(value, mode="json"))
+
+
+def current(rows, start, dias):
+    """Caminho atual do endpoint /escalas/calendar"""
+    views = group(rows, start, dias, EscalaResponse.model_validate)
+    return json_response(List[EscalaCalendarView], views).body
+
+
+def measure(fn, rows, start, dias, repeticoes):
+    fn(rows, start, dias)  # aquecimento
+    best = float("inf")
+    for _ in range(repeticoes):
+        t0 = clock.perf_counter()
+        body = fn(rows, start, dias)
+        best = min(best, clock.perf_counter() - t0)
+    return best, body
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Custo de serialização do calendário de escalas")
+    parser.add_argument("--dias", type=int, default=31)
+    parser.add_argument("--escalas-por-dia", type=int, default=40)
+    parser.add_argument("--repeticoes", type=int, default=10)
+    args = parser.parse_args()
+
+    rows = build_rows(args.dias, args.escalas_por_dia)
+    start = date.today()
+    total = len(rows)
+
+    print("🚀 We Care - Benchmark de Serialização (calendário)")
+    print("=" * 50)
+    print(f"📅 {args.dias} dias x {args.escalas_por_dia} escalas = {total} escalas, melhor de {args.repeticoes}")
+
+    results = {}
+    for name, fn in (
+        ("antigo (json stdlib)", legacy),
+        ("antigo + orjson", legacy_orjson),
+        ("atual (dump_json)", current),
+    ):
+        elapsed, body = measure(fn, rows, start, args.dias, args.repeticoes)
+        results[name] = (elapsed, body)
+        print(f"⏱️ {name:22} {elapsed * 1000:8.1f}ms total  {elapsed / total * 1e6:7.1f}µs/escala  {len(body) / 1024:7.0f}KiB")
+
+    baseline = orjson.loads(results["antigo (json stdlib)"][1])
+    if orjson.loads(results["atual (dump_json)"][1]) != baseline:
+        print("❌ Payload atual difere do antigo")
+        sys.exit(1)
+
+    speedup = results["antigo (json stdlib)"][0] / results["atual (dump_json)"][0]
+    print("-" * 50)
+    print(f"🎉 Payloads idênticos; caminho atual {speedup:.1f}x mais rápido")
+
+
+if __name__ == "__main__":
+    main()